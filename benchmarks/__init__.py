@@ -0,0 +1 @@
+# Performance benchmarks for Hour Tower
\ No newline at end of file
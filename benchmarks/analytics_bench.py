@@ -0,0 +1,73 @@
+"""
+Measure streaming analytics over a large synthetic event log
+
+Writes a log of simulated play (sessions of games with some misses), then
+times PlayAnalytics over it and reports the peak memory it allocated. Run
+from the project root:
+    python -m benchmarks.analytics_bench [events]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from components.analytics import PlayAnalytics
+from components.event_log import BLOCK, COMPLETE, CORRECT, INCORRECT, NEW_GAME, SESSION, encode_record
+
+def write_log(path: str, events: int, seed: int = 1):
+    """Write simulated sessions until the log holds about this many events"""
+    rng = random.Random(seed)
+    written = 0
+    session = 0
+    now = 1_700_000_000.0
+    with open(path, "wb") as f:
+        while written < events:
+            session += 1
+            records = [encode_record(SESSION, session, now, f"player{session % 500}")]
+            blocks = 0
+            for _ in range(rng.randint(1, 4)):
+                records.append(encode_record(NEW_GAME, session, now))
+                start = now
+                for score, number in enumerate(rng.sample(range(1, 13), 12), 1):
+                    while rng.random() < 0.15 + number / 100:
+                        now += rng.expovariate(1 / 3)
+                        records.append(encode_record(INCORRECT, session, now, number, 100.0, 100.0))
+                    now += rng.expovariate(1 / 4)
+                    records.append(encode_record(CORRECT, session, now, number, score * 10))
+                blocks += 1
+                records.append(encode_record(BLOCK, session, now, blocks))
+                records.append(encode_record(COMPLETE, session, now, 120, now - start))
+            f.write(b"".join(records))
+            written += len(records)
+    return written
+
+def main():
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.log")
+        written = write_log(path, events)
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        analytics = PlayAnalytics()
+        analytics.add_log(path)
+        elapsed = time.perf_counter() - start
+
+        # Tracing slows everything down, so memory is measured on a second pass
+        tracemalloc.start()
+        PlayAnalytics().add_log(path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    report = analytics.report()
+    print(f"{written} events, {size / 1e6:.1f} MB log, {report['sessions']} sessions")
+    print(f"aggregated in {elapsed:.2f} s ({written / elapsed:,.0f} events/s), "
+          f"peak traced memory {peak / 1e6:.1f} MB")
+    print(f"time to place: {report['time_to_place']}")
+    print(f"error rate, 1 vs 12: {report['error_rates'][1]:.3f} vs {report['error_rates'][12]:.3f}")
+
+if __name__ == "__main__":
+    main()
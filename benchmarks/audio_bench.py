@@ -0,0 +1,75 @@
+"""
+Measure sound effect latency and check the mixer output
+
+Plays effects through a real-time WAV sink the way the game triggers them,
+reports how long play() blocks the caller and how long each effect waits
+before its first block is written, then checks that overlapping effects
+mix to the clipped sum of their parts. Run from the project root:
+    python -m benchmarks.audio_bench [effects]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import wave
+from array import array
+
+from components.audio import BLOCK_FRAMES, SAMPLE_RATE, Mixer, WavSink, render_offline
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)]
+
+def check_mixing(bank):
+    """Overlapping effects must equal the clipped sum of each effect alone"""
+    schedule = [(0.0, "success"), (0.1, "error"), (0.1, "victory")]
+    mixed = render_offline(schedule, 2.0, bank)
+    expected = [0] * len(mixed)
+    for entry in schedule:
+        alone = render_offline([entry], 2.0, bank)
+        expected = [a + b for a, b in zip(expected, alone)]
+    expected = array("h", [max(-32768, min(32767, value)) for value in expected])
+    return mixed == expected, sum(1 for value in mixed if value in (-32768, 32767))
+
+def main():
+    effects = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "effects.wav")
+        mixer = Mixer(WavSink(path))
+        mixer.ready.wait()
+
+        call_times = []
+        start = time.perf_counter()
+        for _ in range(effects):
+            name = rng.choice(["success", "success", "error", "victory"])
+            before = time.perf_counter()
+            mixer.play(name)
+            call_times.append(time.perf_counter() - before)
+            time.sleep(rng.uniform(0.02, 0.3))  # Players drop pieces in quick bursts
+        time.sleep(1.5)
+        elapsed = time.perf_counter() - start
+        mixer.close()
+
+        with wave.open(path, "rb") as f:
+            frames = f.getnframes()
+            pcm = array("h", f.readframes(frames))
+        bank = mixer.bank
+
+    latencies = list(mixer.latencies)
+    block_ms = BLOCK_FRAMES / SAMPLE_RATE * 1000
+    print(f"play() call: median {statistics.median(call_times) * 1e6:.1f} us, "
+          f"max {max(call_times) * 1e6:.1f} us")
+    print(f"first block written after: p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:.1f} ms (block = {block_ms:.1f} ms, "
+          f"lead = {Mixer.LEAD_BLOCKS} blocks)")
+    print(f"{frames / SAMPLE_RATE:.2f} s of audio written over {elapsed:.2f} s, "
+          f"peak {max(abs(value) for value in pcm)}")
+    matches, clipped = check_mixing(bank)
+    print(f"overlap mix matches clipped sum: {matches} ({clipped} clipped samples)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Soak test with synthetic players
+
+A bot grabs a number, drags it along a human-like path sampled at the
+input device's polling rate and drops it on its position, or on a wrong one
+at the configured accuracy. It plays round after round and reports input
+throughput, per-input latency percentiles and how memory, live objects and
+canvas items grow over the run. Bots drive the same targets replays use:
+the bare engine, GameLogic on the stub canvas, or HourTowerGame's own
+on_drag and on_release in a Tk window (under Xvfb when there is no
+display). Run from the project root:
+    python -m benchmarks.bots [--target engine|game_logic|window] [--rounds 200]
+                              [--polling-hz 240] [--accuracy 0.8] [--tracemalloc]
+"""
+
+import argparse
+import gc
+import math
+import random
+import sys
+import time
+import tkinter as tk
+import tracemalloc
+
+from benchmarks.replay_bench import TimedTarget
+from benchmarks.stub_canvas import RecordingCanvas
+from benchmarks.suite import Backend, make_game, rounded, summarize, virtual_display
+from components.engine import GameEngine
+from components.replay import EngineTarget, GameLogicTarget
+
+class BotPlayer:
+    """Plays rounds the way a child with a mouse or on a touch table would
+
+    Each drag follows a minimum-jerk path with a slight curve and hand
+    tremor, taking as long as Fitts' law predicts for its distance, and is
+    sampled at polling_hz. Time is virtual: the bot keeps its own clock and
+    never sleeps, so rounds run as fast as the target can take them.
+    """
+
+    GRAB_RADIUS = 15  # How far from a number's center the pointer lands
+    DROP_ERROR = 6  # Spread of a correct drop around the position's center
+    TREMOR = 0.6  # Pointer jitter per sample, in design pixels
+
+    def __init__(self, engine: GameEngine, target, pieces, polling_hz: float = 240,
+                 accuracy: float = 0.8, think_ms: float = 400, seed: int = 0):
+        self.engine = engine
+        self.target = target
+        self.pieces = pieces  # Callable returning (number, x, y) for every number that can be grabbed
+        self.polling_hz = polling_hz
+        self.accuracy = accuracy
+        self.think_ms = think_ms
+        self.rng = random.Random(seed)
+        self.now = 0.0
+
+    def trajectory(self, x0: float, y0: float, x1: float, y1: float):
+        """Pointer samples from one point to another, with their times"""
+        distance = math.hypot(x1 - x0, y1 - y0)
+        # Fitts' law for a 50 px target, with some variation between drags
+        duration = (0.2 + 0.12 * math.log2(distance / 50 + 1)) * self.rng.uniform(0.8, 1.3)
+        samples = max(int(duration * self.polling_hz), 1)
+        curve = self.rng.gauss(0, 0.08) * distance
+        normal_x, normal_y = ((y0 - y1) / distance, (x1 - x0) / distance) if distance else (0, 0)
+
+        points = []
+        for i in range(1, samples + 1):
+            tau = i / samples
+            progress = tau ** 3 * (10 - 15 * tau + 6 * tau * tau)  # Minimum-jerk profile
+            bulge = curve * math.sin(math.pi * tau)
+            points.append((
+                self.now + i / self.polling_hz,
+                x0 + (x1 - x0) * progress + normal_x * bulge + self.rng.gauss(0, self.TREMOR),
+                y0 + (y1 - y0) * progress + normal_y * bulge + self.rng.gauss(0, self.TREMOR)
+            ))
+        return points
+
+    def drag(self, number: int, x: float, y: float, to_x: float, to_y: float):
+        """Grab a number centered at (x, y) and drop it near (to_x, to_y)"""
+        angle = self.rng.uniform(0, 2 * math.pi)
+        grab = self.rng.uniform(0, self.GRAB_RADIUS)
+        offset_x, offset_y = grab * math.cos(angle), grab * math.sin(angle)
+        self.target.press(number, x + offset_x, y + offset_y, (x, y))
+
+        pointer_x, pointer_y = x + offset_x, y + offset_y
+        for self.now, pointer_x, pointer_y in self.trajectory(pointer_x, pointer_y,
+                                                               to_x + offset_x, to_y + offset_y):
+            self.target.motion(pointer_x, pointer_y)
+        self.now += self.rng.uniform(0.03, 0.12)  # Settle before letting go
+        self.target.release(pointer_x, pointer_y, number, (pointer_x - offset_x, pointer_y - offset_y))
+
+    def play_round(self):
+        """Place every number, then reset for the next game like the player would"""
+        board = self.engine.board
+        while self.pieces():
+            self.now += self.rng.expovariate(1000 / self.think_ms) if self.think_ms else 0
+            number, x, y = self.rng.choice(self.pieces())
+            if self.rng.random() < self.accuracy:
+                slot = board.get_slot(number)
+            else:
+                slot = self.rng.choice([slot for slot in board.slots if slot.number != number])
+            self.drag(number, x, y, slot.x + self.rng.gauss(0, self.DROP_ERROR),
+                      slot.y + self.rng.gauss(0, self.DROP_ERROR))
+        self.target.command("reset")
+
+def memory_sample(canvas=None) -> dict:
+    """Live objects, traced bytes when tracemalloc is on, and canvas items"""
+    gc.collect()
+    sample = {"objects": len(gc.get_objects())}
+    if tracemalloc.is_tracing():
+        sample["traced_kb"] = tracemalloc.get_traced_memory()[0] / 1024
+    if canvas is not None:
+        sample["canvas_items"] = len(canvas.find_all())
+    return sample
+
+def make_session(name: str, args):
+    """Build a target for a bot to play, returns (engine, target, pieces, canvas, after_input, close)"""
+    if name == "engine":
+        engine = GameEngine(seed=args.seed)
+        engine.start_new_game()
+        pieces = lambda: [(piece.number, piece.x, piece.y) for piece in engine.pieces]
+        return engine, EngineTarget(engine), pieces, None, None, lambda: None
+
+    if name == "game_logic":
+        backend = Backend("stub", RecordingCanvas())
+        game_logic = make_game(backend)
+
+        def frame():
+            # Draw one frame after each input: run the callbacks pending now, not the ones they schedule
+            backend.canvas.run_after(limit=len(backend.canvas.pending_after))
+            backend.flush()
+
+        pieces = lambda: [(number.number, number.x, number.y) for number in game_logic.get_numbers()]
+        return game_logic.engine, GameLogicTarget(game_logic), pieces, backend.canvas, frame, lambda: None
+
+    import main  # Only the window target needs Tk and the full game
+    game = main.HourTowerGame("bot", log_path=None, metrics_path=None, seed=args.seed)
+    game.sound_effects.enabled = False
+    game_logic = game.game_logic
+    pieces = lambda: [(number.number, number.x, number.y) for number in game_logic.get_numbers()]
+    return (game_logic.engine, main.WindowReplayTarget(game), pieces, game.canvas, game.root.update,
+            game.close)
+
+def run(args) -> dict:
+    engine, target, pieces, canvas, after_input, close = make_session(args.target, args)
+    timed = TimedTarget(target, after_input)
+    bot = BotPlayer(engine, timed, pieces, args.polling_hz, args.accuracy, args.think_ms, args.seed)
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    checkpoints = []
+    every = max(args.rounds // 10, 1)
+    started_at = time.perf_counter()
+    try:
+        bot.play_round()  # Warm up caches and pools before the baseline
+        baseline = memory_sample(canvas)
+        for round_number in range(1, args.rounds + 1):
+            bot.play_round()
+            if round_number % every == 0 or round_number == args.rounds:
+                sample = memory_sample(canvas)
+                sample["round"] = round_number
+                checkpoints.append(sample)
+                print(f"round {round_number:5}: {rounded(sample)}")
+    finally:
+        close()
+        if args.tracemalloc:
+            tracemalloc.stop()
+    elapsed = time.perf_counter() - started_at
+
+    inputs = sum(len(samples) for samples in timed.samples.values())
+    growth = {key: (checkpoints[-1][key] - baseline[key]) / args.rounds
+              for key in baseline if key in checkpoints[-1]}
+    return {
+        "target": args.target,
+        "rounds": args.rounds + 1,
+        "inputs": inputs,
+        "inputs_per_s": inputs / elapsed,
+        "placements": len(timed.samples["release"]),
+        "simulated_play_s": bot.now,
+        "latency": {kind: summarize(samples) for kind, samples in timed.samples.items()},
+        "baseline": baseline,
+        "growth_per_round": growth
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test Hour Tower with synthetic players")
+    parser.add_argument("--target", choices=["engine", "game_logic", "window"], default="game_logic")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--polling-hz", type=float, default=240, help="Pointer samples per second")
+    parser.add_argument("--accuracy", type=float, default=0.8, help="Share of drops on the right position")
+    parser.add_argument("--think-ms", type=float, default=400, help="Mean pause between drags (simulated)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Also trace allocated memory (slows every input down)")
+    args = parser.parse_args()
+
+    with virtual_display():
+        try:
+            report = run(args)
+        except tk.TclError as e:
+            sys.exit(f"{args.target}: skipped ({e})")
+    print(f"{report['inputs']} inputs in {report['rounds']} rounds, {report['inputs_per_s']:,.0f} inputs/s, "
+          f"{report['simulated_play_s'] / 60:.0f} minutes of simulated play")
+    for kind, latency in report["latency"].items():
+        print(f"  {kind:8} {rounded(latency)}")
+    print(f"growth per round: {rounded(report['growth_per_round'])}")
+
+if __name__ == "__main__":
+    main()
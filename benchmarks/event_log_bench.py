@@ -0,0 +1,56 @@
+"""
+Measure event log write throughput with many sessions writing at once
+
+Each session is a thread playing games and logging every event. The run
+is repeated with one fsync per event and with group commits. Run from
+the project root:
+    python -m benchmarks.event_log_bench [sessions] [events_per_session]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from components.event_log import CORRECT, INCORRECT, EventLog, read_records
+
+def run(sessions: int, events: int, batch_size: int, flush_interval: float):
+    """Write sessions * events records and return (seconds, fsyncs, records on disk)"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "events.log")
+        log = EventLog(path, batch_size=batch_size, flush_interval=flush_interval)
+
+        def play(index: int):
+            session = log.new_session(f"player{index}")
+            for i in range(events):
+                if i % 4 == 3:
+                    log.append(INCORRECT, session, i % 12 + 1, 100.0, 200.0)
+                else:
+                    log.append(CORRECT, session, i % 12 + 1, i * 10)
+                if batch_size == 1:
+                    log.flush()  # Commit each event before the next, like a per-event fsync
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=play, args=(i,)) for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.close()
+        elapsed = time.perf_counter() - start
+        return elapsed, log.batches_written, sum(1 for _ in read_records(path)), os.path.getsize(path)
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    total = sessions * (events + 1)
+
+    for label, batch_size, interval in (("per-event fsync", 1, 0.0),
+                                         ("group commit", EventLog.BATCH_SIZE, EventLog.FLUSH_INTERVAL)):
+        elapsed, fsyncs, on_disk, size = run(sessions, events, batch_size, interval)
+        print(f"{label:16} {total / elapsed:10.0f} records/s  {fsyncs:6} fsyncs  "
+              f"{on_disk}/{total} records read back  {size / on_disk:.1f} bytes/record")
+
+if __name__ == "__main__":
+    main()
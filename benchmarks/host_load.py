@@ -0,0 +1,108 @@
+"""
+Load test for the session host with local fake clients
+
+Starts host.py in a subprocess, connects one fake client per session and
+measures the round-trip latency of every placement. Run from the project root:
+    python -m benchmarks.host_load [--sessions 500] [--accuracy 0.8] [--think-ms 0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+async def fake_client(path: str, seed: int, accuracy: float, think_ms: float, latencies: list,
+                      ready: list, start: asyncio.Event):
+    """Play one full game, recording the latency of each placement"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_unix_connection(path, limit=1 << 20)
+
+    async def call(request):
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    state = await call({"op": "new_session", "user": f"student{seed}"})
+    if not state["ok"]:
+        raise RuntimeError(state["error"])
+    session = state["session"]
+    slots = {slot["number"]: (slot["x"], slot["y"]) for slot in state["slots"]}
+    remaining = [piece["number"] for piece in state["pieces"]]
+    ready.append(session)
+    await start.wait()
+
+    while remaining:
+        if think_ms:
+            await asyncio.sleep(rng.uniform(0, 2 * think_ms) / 1000)
+        number = rng.choice(remaining)
+        if rng.random() < accuracy:
+            x, y = slots[number]
+        else:
+            x, y = slots[rng.choice([n for n in slots if n != number])]
+        sent = time.perf_counter()
+        reply = await call({"op": "place", "session": session, "number": number, "x": x, "y": y})
+        latencies.append(time.perf_counter() - sent)
+        if reply["correct"]:
+            remaining.remove(number)
+
+    await call({"op": "close", "session": session})
+    writer.close()
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+async def run(args, path):
+    latencies = []
+    ready = []
+    start = asyncio.Event()
+    clients = [asyncio.create_task(fake_client(path, seed, args.accuracy, args.think_ms, latencies, ready, start))
+               for seed in range(args.sessions)]
+
+    # Let every client open its session before timing starts
+    while len(ready) < args.sessions:
+        failed = [task for task in clients if task.done()]
+        if failed:
+            await failed[0]
+        await asyncio.sleep(0.01)
+    began = time.perf_counter()
+    start.set()
+    await asyncio.gather(*clients)
+    elapsed = time.perf_counter() - began
+
+    print(f"{args.sessions} concurrent sessions, {len(latencies)} placements in {elapsed:.2f} s "
+          f"({len(latencies) / elapsed:.0f}/s)")
+    print(f"placement latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, "
+          f"max {max(latencies) * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=500)
+    parser.add_argument("--accuracy", type=float, default=0.8)
+    parser.add_argument("--think-ms", type=float, default=0,
+                        help="Mean pause between a client's drops (0 = as fast as possible)")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hour-tower.sock")
+        host = subprocess.Popen(
+            [sys.executable, os.path.join(root, "host.py"), "--socket", path,
+             "--max-sessions", str(args.sessions)],
+            stdout=subprocess.PIPE
+        )
+        try:
+            host.stdout.readline()  # Wait for the "listening" line
+            asyncio.run(run(args, path))
+        finally:
+            host.terminate()
+            host.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measure recorded player sessions replayed at full speed
+
+Each replay file (recorded with main.py --record) is played into a bare
+GameEngine and through GameLogic on the recording stub canvas, drawing one
+frame after each input. Reports inputs per second and the latency of
+each kind of input, so the same real trace can be compared across commits.
+Run from the project root:
+    python -m benchmarks.replay_bench REPLAY...
+"""
+
+import sys
+import time
+from collections import defaultdict
+
+from benchmarks.stub_canvas import RecordingCanvas
+from benchmarks.suite import Backend, make_game, rounded, summarize
+from components.replay import EngineTarget, GameLogicTarget, Replayer
+
+class TimedTarget:
+    """Times every call made on a replay target, by kind of input"""
+
+    def __init__(self, target, after_input=None):
+        self.target = target
+        self.after_input = after_input
+        self.samples = defaultdict(list)
+
+    def timed(self, kind, *args):
+        start = time.perf_counter()
+        getattr(self.target, kind)(*args)
+        if self.after_input is not None:
+            self.after_input()
+        self.samples[kind].append(time.perf_counter() - start)
+
+    def press(self, *args):
+        self.timed("press", *args)
+
+    def motion(self, *args):
+        self.timed("motion", *args)
+
+    def release(self, *args):
+        self.timed("release", *args)
+
+    def command(self, *args):
+        self.timed("command", *args)
+
+def replay(path: str, target_name: str) -> dict:
+    """Replay one file into a target, returns throughput and per-input latency"""
+    replayer = Replayer(path)
+    if target_name == "engine":
+        target = TimedTarget(EngineTarget(replayer.make_engine()))
+    else:
+        backend = Backend("stub", RecordingCanvas())
+        game_logic = make_game(backend)
+        game_logic.engine.spawn_layout.seed(replayer.seed)
+        replayer.watch(game_logic.engine)
+
+        def frame():
+            # Draw one frame after each input: run the callbacks pending now, not the ones they schedule
+            backend.canvas.run_after(limit=len(backend.canvas.pending_after))
+            backend.flush()
+
+        target = TimedTarget(GameLogicTarget(game_logic), frame)
+
+    summary = replayer.run(target)
+    result = {
+        "inputs": summary["inputs"],
+        "inputs_per_s": summary["inputs"] / summary["wall_s"],
+        "divergences": summary["divergences"]
+    }
+    for kind, samples in target.samples.items():
+        result[kind] = summarize(samples)
+    return result
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    for path in sys.argv[1:]:
+        for target_name in ("engine", "game_logic"):
+            print(f"{path} {target_name}: {rounded(replay(path, target_name))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measure reset_game cost after many played rounds
+
+Uses a real Tk canvas when a display is available and the recording stub
+otherwise. Run from the project root:
+    python -m benchmarks.reset_bench [rounds]
+"""
+
+import contextlib
+import io
+import sys
+import time
+import tkinter as tk
+
+from benchmarks.stub_canvas import RecordingCanvas
+from components.clock_face import ClockFace
+from components.game_logic import GameLogic
+from components.sound import SoundEffects
+from components.tower import ClockTower
+from components.ui import MessageDisplay
+from components.update_queue import UpdateQueue
+
+def make_canvas():
+    """Get a real canvas if Tk can open a display, else the stub"""
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return RecordingCanvas(), None
+    root.withdraw()
+    return tk.Canvas(root, width=800, height=600), root
+
+def play_round(game_logic: GameLogic):
+    """Drop every number on its own position"""
+    board = game_logic.clock_face.board
+    for number in game_logic.get_numbers():
+        slot = board.get_slot(number.number)
+        game_logic.handle_number_placement(number, slot.x, slot.y)
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    canvas, root = make_canvas()
+    sound = SoundEffects()
+    sound.enabled = False
+
+    clock_face = ClockFace(canvas, 325, 325, 180)
+    tower = ClockTower(canvas, 620, 80, 160, 450)
+    game_logic = GameLogic(canvas, clock_face, tower, sound, MessageDisplay(canvas, 325, 220))
+    game_logic.start_new_game()
+    updates = UpdateQueue.for_canvas(canvas)
+
+    timings = []
+    calls = []
+    call_mix = None
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(rounds):
+            play_round(game_logic)
+            updates.flush()
+            if isinstance(canvas, RecordingCanvas):
+                canvas.reset_counts()
+            start = time.perf_counter()
+            game_logic.reset_game()
+            updates.flush()
+            if root is not None:
+                root.update_idletasks()
+            timings.append(time.perf_counter() - start)
+            if isinstance(canvas, RecordingCanvas):
+                calls.append(canvas.total_calls)
+                call_mix = dict(canvas.calls)
+
+    backend = "stub" if root is None else "tk"
+    first = sum(timings[:10]) / 10 * 1000
+    last = sum(timings[-10:]) / 10 * 1000
+    newest_id = canvas.create_oval(0, 0, 0, 0)
+    print(f"{backend}: {rounds} rounds, reset {first:.3f} ms (first 10) -> {last:.3f} ms (last 10), "
+          f"newest item id {newest_id}")
+    if calls:
+        print(f"canvas calls per reset: first {calls[0]}, last {calls[-1]}")
+        print(f"call mix of the last reset: {call_mix}")
+
+if __name__ == "__main__":
+    main()
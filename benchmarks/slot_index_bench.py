@@ -0,0 +1,63 @@
+"""
+Compare the polar slot index against a linear scan of the board positions
+
+Run from the project root:
+    python -m benchmarks.slot_index_bench
+"""
+
+import math
+import random
+import timeit
+
+from components.engine import Board, CLOCK_ORDER
+
+LOOKUPS = 20000
+
+def linear_slot_at(board: Board, x: float, y: float):
+    """The original lookup: scan every position and compare sqrt distances"""
+    for slot in board.slots:
+        if math.sqrt((x - slot.x)**2 + (y - slot.y)**2) < board.snap_distance:
+            return slot
+    return None
+
+def make_board(slot_count: int) -> Board:
+    """Build a board with the given number of slots, 60 per ring past 12"""
+    if slot_count == 12:
+        return Board(325, 325, 180, rings=[CLOCK_ORDER])
+    ring_count = max(1, slot_count // 60)
+    rings = [list(range(r * 60, (r + 1) * 60)) for r in range(ring_count)]
+    return Board(500, 500, 450, snap_distance=8, rings=rings)
+
+def run(slot_count: int):
+    board = make_board(slot_count)
+    rng = random.Random(slot_count)
+
+    # Half the drops land on a slot, half land somewhere random
+    points = []
+    for i in range(LOOKUPS):
+        if i % 2:
+            slot = rng.choice(board.slots)
+            points.append((slot.x + rng.uniform(-3, 3), slot.y + rng.uniform(-3, 3)))
+        else:
+            points.append((rng.uniform(0, 1000), rng.uniform(0, 1000)))
+
+    mismatches = sum(1 for x, y in points if linear_slot_at(board, x, y) is not board.slot_at(x, y))
+    linear = min(timeit.repeat(lambda: [linear_slot_at(board, x, y) for x, y in points], number=1, repeat=5))
+    indexed = min(timeit.repeat(lambda: [board.slot_at(x, y) for x, y in points], number=1, repeat=5))
+
+    return {
+        "linear_us": linear / LOOKUPS * 1e6,
+        "index_us": indexed / LOOKUPS * 1e6,
+        "speedup": linear / indexed,
+        "mismatches": mismatches
+    }
+
+def main():
+    for slot_count in (12, 60, 240):
+        result = run(slot_count)
+        print(f"{slot_count:>4} slots: linear {result['linear_us']:7.2f} us  "
+              f"index {result['index_us']:6.2f} us  "
+              f"speedup {result['speedup']:5.1f}x  mismatches {result['mismatches']}")
+
+if __name__ == "__main__":
+    main()
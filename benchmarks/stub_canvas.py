@@ -0,0 +1,8 @@
+"""
+Recording stand-in for tk.Canvas, for running components without a display
+"""
+
+from components.offscreen import OffscreenCanvas
+
+# The offscreen canvas counts every call made on it, which is what the benchmarks report
+RecordingCanvas = OffscreenCanvas
@@ -0,0 +1,415 @@
+"""
+Benchmark suite for the interaction hot paths
+
+Measures ClockNumber.drag throughput, handle_number_placement latency for
+correct and incorrect drops, reset_game, start_new_game (and its spawn
+layout alone), ClockTower.add_progress across many blocks, Layout.resize,
+presses resolved by the hit grid with more and more pieces, and slot lookups. Every canvas benchmark runs on the recording stub canvas
+and on a real Tk canvas; without a display, Tk runs under Xvfb when it is
+installed and is skipped otherwise. Results are written as JSON so two commits can
+be compared. Run from the project root:
+    python -m benchmarks.suite [--backend stub|tk|all] [--output results.json] [--quick]
+    python -m benchmarks.suite --compare old.json new.json
+"""
+
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+from benchmarks import slot_index_bench
+from benchmarks.stub_canvas import RecordingCanvas
+from components.clock_face import ClockFace
+from components.clock_number import ClockNumber
+from components.engine import TowerState
+from components.game_logic import GameLogic
+from components.hit_grid import HitGrid
+from components.layout import Layout
+from components.sound import SoundEffects
+from components.tower import ClockTower
+from components.ui import MessageDisplay
+from components.update_queue import UpdateQueue
+
+REGRESSION_THRESHOLD = 1.10  # Slower than this ratio is flagged by --compare
+
+class Event:
+    """The parts of a Tk mouse event the game reads"""
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+class Backend:
+    """A canvas to benchmark on, and how to make it draw"""
+
+    def __init__(self, name: str, canvas, root=None):
+        self.name = name
+        self.canvas = canvas
+        self.root = root
+
+    def flush(self):
+        """Apply queued writes and let the canvas redraw, as it would before the next frame"""
+        UpdateQueue.for_canvas(self.canvas).flush()
+        if self.root is not None:
+            self.root.update_idletasks()
+
+    def calls(self) -> int:
+        """Canvas calls made so far, when the canvas records them"""
+        return self.canvas.total_calls if isinstance(self.canvas, RecordingCanvas) else 0
+
+    def close(self):
+        if self.root is not None:
+            self.root.destroy()
+
+@contextlib.contextmanager
+def virtual_display():
+    """Make sure Tk has a display, starting Xvfb when there is none and it is installed"""
+    xvfb = shutil.which("Xvfb")
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin") or xvfb is None:
+        yield
+        return
+
+    for number in range(99, 199):
+        if os.path.exists(f"/tmp/.X{number}-lock") or os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            continue
+        process = subprocess.Popen([xvfb, f":{number}", "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        deadline = time.monotonic() + 5
+        while not os.path.exists(f"/tmp/.X11-unix/X{number}") and time.monotonic() < deadline:
+            time.sleep(0.05)
+        os.environ["DISPLAY"] = f":{number}"
+        try:
+            yield
+        finally:
+            del os.environ["DISPLAY"]
+            process.terminate()
+            process.wait()
+        return
+    yield
+
+def make_backend(name: str) -> Backend:
+    """Open a backend, raising tk.TclError when Tk has no display"""
+    if name == "stub":
+        return Backend("stub", RecordingCanvas())
+    root = tk.Tk()
+    root.geometry("800x600")
+    canvas = tk.Canvas(root, width=800, height=600, bg="#000000", highlightthickness=0)
+    canvas.pack()
+    root.update()
+    return Backend("tk", canvas, root)
+
+def make_game(backend: Backend) -> GameLogic:
+    """Build the clock, tower and game logic the way main.py lays them out, without sound"""
+    sound = SoundEffects(start=False)
+    sound.enabled = False
+    canvas = backend.canvas
+    clock_face = ClockFace(canvas, 325, 325, 180)
+    tower = ClockTower(canvas, 620, 80, 160, 450)
+    game_logic = GameLogic(canvas, clock_face, tower, sound, MessageDisplay(canvas, 325, 220))
+    game_logic.start_new_game()
+    backend.flush()
+    return game_logic
+
+def summarize(samples) -> dict:
+    """Latency statistics in microseconds"""
+    ordered = sorted(samples)
+
+    def at(p):
+        return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)] * 1e6
+
+    return {
+        "count": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": at(50),
+        "p90_us": at(90),
+        "p99_us": at(99),
+        "max_us": ordered[-1] * 1e6
+    }
+
+def bench_drag(backend: Backend, moves: int) -> dict:
+    """Throughput of ClockNumber.drag along a circular path"""
+    game_logic = make_game(backend)
+    number = game_logic.get_numbers()[0]
+    number.start_drag(Event(number.x, number.y))
+    events = [Event(325 + 150 * ((i % 200) / 100 - 1), 325 + 100 * ((i % 50) / 25 - 1)) for i in range(moves)]
+
+    calls_before = backend.calls()
+    start = time.perf_counter()
+    for event in events:
+        number.drag(event)
+    backend.flush()
+    elapsed = time.perf_counter() - start
+    number.stop_drag()
+
+    result = {"moves": moves, "moves_per_s": moves / elapsed, "us_per_move": elapsed / moves * 1e6}
+    if backend.calls():
+        result["canvas_calls_per_move"] = (backend.calls() - calls_before) / moves
+    return result
+
+def bench_placement(backend: Backend, rounds: int, correct: bool) -> dict:
+    """Latency of handle_number_placement, dropping every number on or off its slot"""
+    game_logic = make_game(backend)
+    board = game_logic.engine.board
+    samples = []
+    for _ in range(rounds):
+        for number in game_logic.get_numbers():
+            if correct:
+                slot = board.get_slot(number.number)
+                x, y = slot.x, slot.y
+            else:
+                x, y = board.center_x, board.center_y  # The middle of the clock is never a slot
+            start = time.perf_counter()
+            game_logic.handle_number_placement(number, x, y)
+            backend.flush()
+            samples.append(time.perf_counter() - start)
+        game_logic.reset_game()
+        backend.flush()
+    return summarize(samples)
+
+def bench_reset(backend: Backend, rounds: int) -> dict:
+    """Cost of reset_game after a fully played round"""
+    game_logic = make_game(backend)
+    board = game_logic.engine.board
+    samples = []
+    calls = []
+    for _ in range(rounds):
+        for number in game_logic.get_numbers():
+            slot = board.get_slot(number.number)
+            game_logic.handle_number_placement(number, slot.x, slot.y)
+        backend.flush()
+        calls_before = backend.calls()
+        start = time.perf_counter()
+        game_logic.reset_game()
+        backend.flush()
+        samples.append(time.perf_counter() - start)
+        calls.append(backend.calls() - calls_before)
+    result = summarize(samples)
+    if backend.calls():
+        result["canvas_calls"] = calls[-1]
+    return result
+
+def bench_start_new_game(backend: Backend, rounds: int) -> dict:
+    """start_new_game end to end, and the spawn layout it generates on its own"""
+    game_logic = make_game(backend)
+    engine = game_logic.engine
+    count = len(engine.board.slots)
+
+    layout_samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        engine.spawn_layout.generate(count)
+        layout_samples.append(time.perf_counter() - start)
+
+    game_samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        game_logic.start_new_game()
+        backend.flush()
+        game_samples.append(time.perf_counter() - start)
+    return {"start_new_game": summarize(game_samples), "spawn_layout": summarize(layout_samples)}
+
+def bench_tower(backend: Backend, blocks: int) -> dict:
+    """ClockTower.add_progress over many blocks, split by whether the call completes a block"""
+    tower = ClockTower(backend.canvas, 620, 80, 160, 450, TowerState())
+    progress_samples = []
+    block_samples = []
+    for _ in range(blocks * tower.max_progress):
+        start = time.perf_counter()
+        block_complete = tower.state.progress + 1 >= tower.max_progress
+        tower.add_progress()
+        backend.flush()
+        (block_samples if block_complete else progress_samples).append(time.perf_counter() - start)
+
+    half = len(block_samples) // 2
+    return {
+        "blocks": blocks,
+        "progress": summarize(progress_samples),
+        "block_complete": summarize(block_samples),
+        "block_complete_first_half_mean_us": statistics.fmean(block_samples[:half]) * 1e6,
+        "block_complete_second_half_mean_us": statistics.fmean(block_samples[half:]) * 1e6
+    }
+
+def bench_resize(backend: Backend, rounds: int) -> dict:
+    """Layout.resize on a game in progress, alternating between window sizes"""
+    game_logic = make_game(backend)
+    for number in game_logic.get_numbers()[:6]:
+        slot = game_logic.engine.board.get_slot(number.number)
+        game_logic.handle_number_placement(number, slot.x, slot.y)
+    backend.flush()
+    layout = Layout.for_canvas(backend.canvas)
+    layout.watch(game_logic.clock_face, game_logic.tower, game_logic)
+
+    sizes = [(1920, 1080), (1280, 720), (1024, 768), (800, 600)]
+    samples = []
+    calls = []
+    for i in range(rounds):
+        calls_before = backend.calls()
+        start = time.perf_counter()
+        layout.resize(*sizes[i % len(sizes)])
+        backend.flush()
+        samples.append(time.perf_counter() - start)
+        calls.append(backend.calls() - calls_before)
+    result = summarize(samples)
+    if backend.calls():
+        result["canvas_calls"] = max(calls)
+    return result
+
+def bench_press(backend: Backend, presses: int) -> dict:
+    """Presses resolved by the HitGrid with 12 to 1200 pieces, spread out as thinly as in a real game
+
+    lookup is HitGrid.target_at alone and should not grow with the pieces;
+    press adds checking no other item covers the number and grabbing it,
+    which include the canvas's find_overlapping and tag_raise.
+    """
+    hits = HitGrid.for_canvas(backend.canvas)
+    rng = random.Random(1)
+    result = {}
+    for count in (12, 120, 1200):
+        side = (count / 12) ** 0.5  # The spawn area grows with the pieces
+        width, height = 540 * side, 400 * side
+        numbers = [ClockNumber(backend.canvas, i % 12 + 1, rng.uniform(30, 30 + width),
+                               rng.uniform(80, 80 + height), "#FF00FF") for i in range(count)]
+        backend.flush()
+        points = [(rng.uniform(30, 30 + width), rng.uniform(80, 80 + height)) for _ in range(presses)]
+        lookup_samples = []
+        press_samples = []
+        for x, y in points:
+            start = time.perf_counter()
+            hits.target_at(x, y)
+            lookup_samples.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            hits.on_press(Event(x, y))
+            press_samples.append(time.perf_counter() - start)
+        for number in numbers:
+            number.remove()
+        backend.flush()
+        result[f"pieces_{count}"] = {"lookup": summarize(lookup_samples), "press": summarize(press_samples)}
+    return result
+
+def run_backend(name: str, scale: float) -> dict:
+    """Run every canvas benchmark on one backend, each on a fresh canvas"""
+    def runs(count):
+        return max(int(count * scale), 2)
+
+    benchmarks = {
+        "drag": lambda backend: bench_drag(backend, runs(20000)),
+        "placement_correct": lambda backend: bench_placement(backend, runs(20), True),
+        "placement_incorrect": lambda backend: bench_placement(backend, runs(20), False),
+        "reset_game": lambda backend: bench_reset(backend, runs(50)),
+        "start_new_game": lambda backend: bench_start_new_game(backend, runs(50)),
+        "tower_add_progress": lambda backend: bench_tower(backend, runs(50)),
+        "resize": lambda backend: bench_resize(backend, runs(40)),
+        "press": lambda backend: bench_press(backend, runs(2000)),
+    }
+    results = {}
+    for bench, run in benchmarks.items():
+        backend = make_backend(name)
+        try:
+            results[bench] = run(backend)
+        finally:
+            backend.close()
+    return results
+
+def rounded(metrics):
+    """Round every float in a results tree for printing"""
+    if isinstance(metrics, dict):
+        return {key: rounded(value) for key, value in metrics.items()}
+    return round(metrics, 2) if isinstance(metrics, float) else metrics
+
+def git_commit() -> str:
+    """The checked out commit, if this is a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def flatten(results: dict, prefix: str = ""):
+    """Yield (dotted name, value) for every timing metric in a results tree"""
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif key.endswith("_us") or key.endswith("_per_s"):
+            yield name, value
+
+def compare(old_path: str, new_path: str) -> int:
+    """Print every metric of two result files side by side, returns the number of regressions"""
+    with open(old_path) as f:
+        old = dict(flatten(json.load(f)["results"]))
+    with open(new_path) as f:
+        new = dict(flatten(json.load(f)["results"]))
+
+    regressions = 0
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        if not before or not after:
+            continue
+        # Higher is better for throughput, lower is better for latency
+        slowdown = before / after if name.endswith("_per_s") else after / before
+        flag = ""
+        if slowdown > REGRESSION_THRESHOLD:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name:<60}{before:12.2f} -> {after:12.2f}  x{slowdown:5.2f}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Hour Tower's interaction hot paths")
+    parser.add_argument("--backend", choices=["stub", "tk", "all"], default="all")
+    parser.add_argument("--output", default="benchmark-results.json", help="JSON file to write")
+    parser.add_argument("--quick", action="store_true", help="Run a tenth of the iterations")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="Compare two result files instead of running")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare) else 0)
+
+    scale = 0.1 if args.quick else 1.0
+    backends = ["stub", "tk"] if args.backend == "all" else [args.backend]
+    results = {}
+    skipped = {}
+
+    with virtual_display():
+        for name in backends:
+            try:
+                results[name] = run_backend(name, scale)
+            except tk.TclError as e:
+                skipped[name] = str(e)
+                print(f"{name}: skipped ({e})")
+                continue
+            for bench, metrics in results[name].items():
+                print(f"{name:5} {bench:22} {json.dumps(rounded(metrics))}")
+
+    results["engine"] = {
+        "slot_index": {str(count): slot_index_bench.run(count) for count in (12, 60, 240)}
+    }
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tk": tk.TkVersion,
+            "scale": scale,
+            "skipped": skipped
+        },
+        "results": results
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
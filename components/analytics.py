@@ -0,0 +1,225 @@
+"""
+Streaming analytics over recorded game events
+"""
+
+import argparse
+import json
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Set
+from .event_log import (BLOCK, COMPLETE, CORRECT, INCORRECT, NEW_GAME, REDO, RESET, RESTORE, SESSION, UNDO,
+                        EventRecord, read_records)
+
+class Histogram:
+    """Fixed-width bucket histogram, so a distribution takes the same memory for any amount of data
+
+    Values past the last bucket are counted in an overflow bucket; exact
+    count, total, min and max are kept alongside.
+    """
+
+    def __init__(self, bucket_width: float, max_value: float):
+        self.bucket_width = bucket_width
+        self.max_value = max_value
+        self.buckets = array("L", bytes(array("L").itemsize * (math.ceil(max_value / bucket_width) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """Count one value"""
+        index = min(int(max(value, 0) / self.bucket_width), len(self.buckets) - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def mean(self) -> float:
+        """Average of all values"""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Approximate the p-th percentile (0-100) to within one bucket"""
+        if not self.count:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                if index == len(self.buckets) - 1:
+                    return self.max  # Overflow bucket, the exact max is the best estimate
+                # Interpolate inside the bucket, clamped to the values actually seen
+                fraction = 1 - (seen - target) / count
+                value = (index + fraction) * self.bucket_width
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        """Count, mean, range and common percentiles"""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean(), 3),
+            "min": round(self.min, 3),
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max, 3)
+        }
+
+class SessionClock:
+    """Running timestamps for one session, needed to turn events into durations"""
+
+    __slots__ = ("last_placement", "block_start", "blocks", "undone")
+
+    def __init__(self):
+        self.last_placement: Optional[float] = None  # Game start or previous correct placement
+        self.block_start: Optional[float] = None  # When the current tower block was started
+        self.blocks = 0  # Most tower blocks completed, so a block finished again after an undo is not timed twice
+        self.undone: Set[int] = set()  # Numbers taken back, whose next correct placement was already counted
+
+class PlayAnalytics:
+    """Aggregates error rates and timing distributions over any number of events
+
+    Records are read from the log as a stream and folded straight into
+    fixed-size counters and histograms, so memory depends on the board
+    size and the number of sessions seen, never on the number of events:
+
+    - per-number attempts and errors, for error rates
+    - time to place each number: from the game start or the previous
+      correct placement to this one, overall and per number
+    - tower block completion times: from the tower's start or previous block
+
+    Placing a number again after undoing it, or finishing a block again,
+    is not counted a second time.
+    - game completion times from ``time_spent``
+    """
+
+    PLACE_BUCKET = 0.25  # seconds
+    PLACE_MAX = 120
+    BLOCK_BUCKET = 5
+    BLOCK_MAX = 3600
+
+    def __init__(self):
+        self.attempts = array("L")
+        self.errors = array("L")
+        self.time_to_place = Histogram(self.PLACE_BUCKET, self.PLACE_MAX)
+        self.time_to_place_by_number: Dict[int, Histogram] = {}
+        self.block_times = Histogram(self.BLOCK_BUCKET, self.BLOCK_MAX)
+        self.game_times = Histogram(self.BLOCK_BUCKET, self.BLOCK_MAX)
+        self.clocks: Dict[int, SessionClock] = {}
+        self.users: Dict[int, str] = {}
+        self.events = 0
+
+    def count_number(self, number: int, error: bool):
+        """Count one attempt at a number, growing the counters for bigger boards"""
+        if number >= len(self.attempts):
+            grow = number + 1 - len(self.attempts)
+            self.attempts.extend(array("L", bytes(self.attempts.itemsize * grow)))
+            self.errors.extend(array("L", bytes(self.errors.itemsize * grow)))
+        self.attempts[number] += 1
+        if error:
+            self.errors[number] += 1
+
+    def add_records(self, records: Iterable[EventRecord]):
+        """Fold a stream of events into the aggregates"""
+        clocks = self.clocks
+        events = 0
+        for code, session, time, values in records:
+            events += 1
+            clock = clocks.get(session)
+            if clock is None:
+                clock = clocks[session] = SessionClock()
+
+            if code == CORRECT:
+                number = values[0]
+                if number in clock.undone:
+                    clock.undone.discard(number)  # Counted when it was first placed
+                else:
+                    self.count_number(number, False)
+                    if clock.last_placement is not None:
+                        seconds = time - clock.last_placement
+                        self.time_to_place.add(seconds)
+                        histogram = self.time_to_place_by_number.get(number)
+                        if histogram is None:
+                            histogram = self.time_to_place_by_number[number] = Histogram(
+                                self.PLACE_BUCKET, self.PLACE_MAX)
+                        histogram.add(seconds)
+                clock.last_placement = time
+            elif code == INCORRECT:
+                self.count_number(values[0], True)
+            elif code == NEW_GAME:
+                clock.last_placement = time
+                clock.undone.clear()
+                if clock.block_start is None:
+                    clock.block_start = time
+            elif code == BLOCK:
+                if values[0] <= clock.blocks:
+                    continue  # The undone block finished again, it keeps its first time
+                clock.blocks = values[0]
+                if clock.block_start is not None:
+                    self.block_times.add(time - clock.block_start)
+                clock.block_start = time
+            elif code == COMPLETE:
+                self.game_times.add(values[1])
+                clock.last_placement = None
+            elif code == RESET:
+                clock.last_placement = None
+                clock.block_start = None
+                clock.blocks = 0
+                clock.undone.clear()
+            elif code == RESTORE:
+                # Time before the restart is unknown, so this game's gaps start here
+                clock.last_placement = time
+                clock.block_start = None
+                clock.blocks = values[2]
+                clock.undone.clear()
+            elif code == UNDO:
+                clock.undone.update(values[3])
+            elif code == REDO:
+                clock.undone.difference_update(values[3])
+            elif code == SESSION:
+                self.users[session] = values[0]
+        self.events += events
+
+    def add_log(self, path: str):
+        """Stream a whole event log file through the aggregates"""
+        self.add_records(read_records(path))
+
+    def error_rates(self) -> Dict[int, float]:
+        """Fraction of drops of each number that missed, for numbers that were tried"""
+        return {number: self.errors[number] / attempts
+                for number, attempts in enumerate(self.attempts) if attempts}
+
+    def report(self) -> Dict:
+        """All aggregates as plain data"""
+        return {
+            "events": self.events,
+            "sessions": len(self.clocks),
+            "users": len(set(self.users.values())),
+            "error_rates": {number: round(rate, 4) for number, rate in self.error_rates().items()},
+            "time_to_place": self.time_to_place.summary(),
+            "time_to_place_by_number": {number: histogram.summary() for number, histogram
+                                        in sorted(self.time_to_place_by_number.items())},
+            "block_times": self.block_times.summary(),
+            "game_times": self.game_times.summary()
+        }
+
+def main(argv: Optional[List[str]] = None):
+    """Print the aggregates for one or more event logs as JSON"""
+    parser = argparse.ArgumentParser(description="Summarise Hour Tower event logs")
+    parser.add_argument("logs", nargs="+", help="Event log files")
+    args = parser.parse_args(argv)
+
+    analytics = PlayAnalytics()
+    for path in args.logs:
+        analytics.add_log(path)
+    print(json.dumps(analytics.report(), indent=2))
+
+if __name__ == "__main__":
+    main()
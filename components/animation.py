@@ -0,0 +1,145 @@
+"""
+Frame-clock animation scheduler for the Hour Tower canvas
+"""
+
+import time
+import tkinter as tk
+from typing import Callable, Dict, Optional
+from .per_canvas import PerCanvas
+from .update_queue import UpdateQueue
+
+class Tween:
+    """A keyed animation driven by a progress value from 0.0 to 1.0"""
+
+    def __init__(self, key: str, start: float, duration: float,
+                 step: Callable[[float], None], on_done: Optional[Callable[[], None]] = None):
+        self.key = key
+        self.start = start  # ms on the animator clock
+        self.duration = duration
+        self.step = step
+        self.on_done = on_done
+
+class Animator(PerCanvas):
+    """Runs every active tween from a single ``after`` tick per frame
+
+    Tweens are keyed: starting a tween with a key that is already running
+    replaces it, so repeated triggers restart an animation instead of
+    stacking timers. When nothing is animating no timer is pending, and when
+    only delayed tweens are waiting the animator sleeps until the first one
+    is due. Writes the steps post to the canvas UpdateQueue are flushed
+    together at the end of the tick.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, canvas: tk.Canvas, clock: Callable[[], float] = time.perf_counter):
+        self.canvas = canvas
+        self.clock = clock
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.tweens: Dict[str, Tween] = {}
+        self.after_id = None
+        self.next_tick_at = None
+        self.frames = 0
+        self.metrics = None  # Optional Metrics registry to report frame times to
+
+    def now(self) -> float:
+        """Current time in ms"""
+        return self.clock() * 1000
+
+    def animate(self, key: str, duration_ms: float, step: Callable[[float], None],
+                on_done: Optional[Callable[[], None]] = None, delay_ms: float = 0) -> Tween:
+        """Start (or restart) a tween, replacing any running tween with the same key"""
+        tween = Tween(key, self.now() + delay_ms, duration_ms, step, on_done)
+        self.tweens[key] = tween
+        self.schedule()
+        return tween
+
+    def cancel(self, key: str, finish: bool = False):
+        """Stop a tween, optionally jumping it to its end state first"""
+        tween = self.tweens.pop(key, None)
+        if tween is not None and finish:
+            tween.step(1.0)
+            if tween.on_done:
+                tween.on_done()
+        if not self.tweens:
+            self.stop_timer()
+
+    def finish_all(self):
+        """Jump every tween, delayed ones included, to its end state and apply the writes
+
+        Tweens started by another's on_done are finished too, but each key
+        only once, so a tween that restarts itself, like the glow pulse,
+        does not loop forever.
+        """
+        finished = set()
+        while True:
+            keys = [key for key in self.tweens if key not in finished]
+            if not keys:
+                break
+            for key in keys:
+                finished.add(key)
+                self.cancel(key, finish=True)
+        self.updates.flush()
+
+    def cancel_prefix(self, prefix: str):
+        """Stop every tween whose key starts with prefix"""
+        for key in [key for key in self.tweens if key.startswith(prefix)]:
+            del self.tweens[key]
+        if not self.tweens:
+            self.stop_timer()
+
+    def is_active(self, key: str) -> bool:
+        """Check if a tween is running or waiting to start"""
+        return key in self.tweens
+
+    def is_idle(self) -> bool:
+        """Check if nothing is animating and no timer is pending"""
+        return not self.tweens and self.after_id is None
+
+    def stop_timer(self):
+        """Cancel the pending tick"""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+            self.next_tick_at = None
+
+    def schedule(self):
+        """Make sure a tick is pending for the earliest tween that needs one"""
+        if not self.tweens:
+            return
+        now = self.now()
+        due = max(min(tween.start for tween in self.tweens.values()), now)
+        if self.next_tick_at is not None and self.next_tick_at <= max(due, now + self.FRAME_MS):
+            return
+
+        self.stop_timer()
+        delay = max(self.FRAME_MS, int(due - now))
+        self.next_tick_at = now + delay
+        self.after_id = self.canvas.after(delay, self.tick)
+
+    def tick(self):
+        """Advance every active tween by one frame"""
+        due_at = self.next_tick_at
+        self.after_id = None
+        self.next_tick_at = None
+        self.frames += 1
+        now = self.now()
+
+        for key, tween in list(self.tweens.items()):
+            if now < tween.start:
+                continue
+            progress = min(1.0, (now - tween.start) / tween.duration) if tween.duration > 0 else 1.0
+            tween.step(progress)
+            # A step or an earlier on_done may have replaced or cancelled this tween
+            if progress >= 1.0 and self.tweens.get(key) is tween:
+                del self.tweens[key]
+                if tween.on_done:
+                    tween.on_done()
+        self.updates.flush()
+
+        if self.metrics is not None:
+            # A tick firing late means the event loop was busy with something else
+            if due_at is not None:
+                self.metrics.record("frame_late", max(now - due_at, 0) / 1000)
+            self.metrics.record("frame", (self.now() - now) / 1000)
+        self.schedule()
@@ -0,0 +1,339 @@
+"""
+Synthesized sound effects and a background mixer
+"""
+
+import math
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from array import array
+from collections import deque
+from operator import add
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+SAMPLE_RATE = 22050
+BLOCK_FRAMES = 512  # About 23 ms per mixed block
+
+def tone(frequency: float, seconds: float, volume: float = 0.3, decay: float = 0.0,
+         attack: float = 0.005, harmonics: Tuple[float, ...] = ()) -> List[float]:
+    """A sine tone with a short attack and optional exponential decay, as floats in -1..1
+
+    harmonics are the relative volumes of the 2nd, 3rd, ... partials.
+    """
+    frames = int(seconds * SAMPLE_RATE)
+    attack_frames = max(int(attack * SAMPLE_RATE), 1)
+    release_frames = min(int(0.01 * SAMPLE_RATE), frames)
+    step = 2 * math.pi * frequency / SAMPLE_RATE
+    partials = [(1, 1.0)] + [(n + 2, level) for n, level in enumerate(harmonics)]
+    norm = sum(level for _, level in partials)
+    samples = []
+    for i in range(frames):
+        envelope = min(i / attack_frames, 1.0, (frames - i) / release_frames)
+        if decay:
+            envelope *= math.exp(-decay * i / SAMPLE_RATE)
+        value = sum(level * math.sin(step * n * i) for n, level in partials) / norm
+        samples.append(volume * envelope * value)
+    return samples
+
+def sequence(notes: Iterable[Tuple[float, List[float]]]) -> List[float]:
+    """Mix tones that start at given offsets (in seconds) into one buffer"""
+    out: List[float] = []
+    for start, samples in notes:
+        offset = int(start * SAMPLE_RATE)
+        if len(out) < offset + len(samples):
+            out.extend([0.0] * (offset + len(samples) - len(out)))
+        for i, value in enumerate(samples, offset):
+            out[i] += value
+    return out
+
+def synthesize_chime() -> List[float]:
+    """Two bright bell notes for a correct placement"""
+    return sequence([
+        (0.0, tone(1046.5, 0.5, 0.25, decay=6, harmonics=(0.3, 0.1))),
+        (0.09, tone(1568.0, 0.55, 0.22, decay=6, harmonics=(0.3, 0.1))),
+    ])
+
+def synthesize_error() -> List[float]:
+    """A soft low double bump, gentle enough for small children"""
+    return sequence([
+        (0.0, tone(233.1, 0.14, 0.3, decay=8, attack=0.02, harmonics=(0.2,))),
+        (0.16, tone(196.0, 0.2, 0.3, decay=8, attack=0.02, harmonics=(0.2,))),
+    ])
+
+def synthesize_fanfare() -> List[float]:
+    """A rising major arpeggio ending on a held chord"""
+    notes = [(0.0, 523.3), (0.13, 659.3), (0.26, 784.0)]
+    parts = [(start, tone(frequency, 0.2, 0.22, decay=3, harmonics=(0.4, 0.2)))
+             for start, frequency in notes]
+    for frequency in (523.3, 659.3, 784.0, 1046.5):
+        parts.append((0.39, tone(frequency, 0.9, 0.12, decay=2.5, harmonics=(0.4, 0.2))))
+    return sequence(parts)
+
+# Effect name -> synthesizer, rendered once when a Mixer starts
+SOUNDS: Dict[str, Callable[[], List[float]]] = {
+    "success": synthesize_chime,
+    "error": synthesize_error,
+    "victory": synthesize_fanfare,
+}
+
+def to_pcm(samples: List[float]) -> array:
+    """Convert floats in -1..1 to signed 16-bit PCM"""
+    return array("h", [max(-32768, min(32767, int(value * 32767))) for value in samples])
+
+class Voice:
+    """One effect being played, and how far into it the mixer is"""
+
+    __slots__ = ("samples", "position", "requested_at")
+
+    def __init__(self, samples: array, requested_at: float):
+        self.samples = samples
+        self.position = 0
+        self.requested_at = requested_at
+
+def mix_block(voices: List[Voice], frames: int = BLOCK_FRAMES) -> array:
+    """Sum the next block of every voice with clipping, advancing each voice"""
+    out = [0] * frames
+    for voice in voices:
+        chunk = voice.samples[voice.position:voice.position + frames]
+        out[:len(chunk)] = map(add, out, chunk)
+        voice.position += frames
+    if len(voices) > 1:
+        out = [-32768 if value < -32768 else 32767 if value > 32767 else value for value in out]
+    return array("h", out)
+
+def render_offline(schedule: Iterable[Tuple[float, str]], seconds: float,
+                   bank: Optional[Dict[str, array]] = None) -> array:
+    """Mix a list of (start seconds, effect name) exactly as the mixer would, without a clock
+
+    Starts are rounded to the mixer's block boundaries, matching when a
+    live mixer would pick them up.
+    """
+    if bank is None:
+        bank = {name: to_pcm(make()) for name, make in SOUNDS.items()}
+    pending = sorted(schedule)
+    voices: List[Voice] = []
+    out = array("h")
+    total_blocks = math.ceil(seconds * SAMPLE_RATE / BLOCK_FRAMES)
+    for block in range(total_blocks):
+        block_end = (block + 1) * BLOCK_FRAMES / SAMPLE_RATE
+        while pending and pending[0][0] < block_end:
+            voices.append(Voice(bank[pending.pop(0)[1]], 0.0))
+        out.extend(mix_block(voices))
+        voices = [voice for voice in voices if voice.position < len(voice.samples)]
+    return out
+
+class WavSink:
+    """Writes mixed audio to a WAV file, for machines without audio hardware"""
+
+    def __init__(self, path: str, sample_rate: int = SAMPLE_RATE):
+        self.path = path
+        self.file = wave.open(path, "wb")
+        self.file.setnchannels(1)
+        self.file.setsampwidth(2)
+        self.file.setframerate(sample_rate)
+        self.frames_written = 0
+
+    def write(self, block: array):
+        self.file.writeframes(block.tobytes())
+        self.frames_written += len(block)
+
+    def close(self):
+        self.file.close()
+
+class PipeSink:
+    """Streams raw PCM to a command line audio player"""
+
+    CLOSE_TIMEOUT = 1.0  # seconds for the player to drain before it is killed
+
+    def __init__(self, command: List[str]):
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def write(self, block: array):
+        self.process.stdin.write(block.tobytes())
+        self.process.stdin.flush()
+
+    def close(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.process.wait(self.CLOSE_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self.abort()
+
+    def abort(self):
+        """Kill the player, which also fails a write blocked on its full pipe"""
+        self.process.kill()
+        self.process.wait()
+
+# Players that accept signed 16-bit mono PCM on stdin, tried in order
+PLAYER_COMMANDS = [
+    ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(SAMPLE_RATE), "-"],
+    ["paplay", "--raw", "--format=s16le", "--channels=1", f"--rate={SAMPLE_RATE}"],
+    ["pw-cat", "--playback", "--format", "s16", "--channels", "1", "--rate", str(SAMPLE_RATE), "-"],
+]
+
+def open_device_sink() -> Optional[PipeSink]:
+    """Open the first available audio player, or None when there is none"""
+    for command in PLAYER_COMMANDS:
+        if shutil.which(command[0]):
+            try:
+                return PipeSink(command)
+            except OSError:
+                continue
+    return None
+
+class Mixer:
+    """Plays effects from a background thread, mixing any that overlap
+
+    play only queues a request, so callers on the UI thread never wait for
+    audio. The thread renders the sound bank once when it starts, then
+    mixes BLOCK_FRAMES at a time while anything is playing and sleeps
+    otherwise. Blocks are paced against the clock and kept at most
+    lead_blocks ahead, so a new effect is heard within a block or two
+    instead of queueing behind audio already handed to the device.
+
+    sink is anything with write(array) and close(); None opens the audio
+    device on first use and stays silent if there is none. With
+    realtime=False blocks are written as fast as they are mixed. With
+    start=False nothing runs until start() or the first play().
+    """
+
+    LEAD_BLOCKS = 2
+    CLOSE_TIMEOUT = 0.5  # seconds close waits for the thread before aborting the sink
+
+    def __init__(self, sink=None, sounds: Optional[Dict[str, Callable[[], List[float]]]] = None,
+                 realtime: bool = True, lead_blocks: int = LEAD_BLOCKS,
+                 clock: Callable[[], float] = time.perf_counter, start: bool = True):
+        self.sink = sink
+        self.sounds = sounds if sounds is not None else SOUNDS
+        self.realtime = realtime
+        self.lead_blocks = lead_blocks
+        self.clock = clock
+        self.bank: Dict[str, array] = {}
+        self.ready = threading.Event()
+        self.no_device = False
+
+        self.requests: List[Tuple[str, float]] = []
+        self.stop_requested = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.latencies = deque(maxlen=1000)  # Seconds from play() until the effect's first block was written
+        self.blocks_written = 0
+
+        self.thread: Optional[threading.Thread] = None
+        if start:
+            self.start()
+
+    def start(self):
+        """Start the mixer thread, which renders the sound bank first"""
+        with self.condition:
+            if self.thread is None and not self.closed:
+                self.thread = threading.Thread(target=self.run, name="sound-mixer", daemon=True)
+                self.thread.start()
+
+    def play(self, name: str):
+        """Queue an effect to start on the next block, starting the mixer if needed"""
+        with self.condition:
+            if self.closed:
+                return
+            self.requests.append((name, self.clock()))
+            self.condition.notify()
+        if self.thread is None:
+            self.start()
+
+    def stop_all(self):
+        """Silence everything playing or queued"""
+        with self.condition:
+            self.requests.clear()
+            self.stop_requested = True
+            self.condition.notify()
+
+    def run(self):
+        """Mixer thread: render the bank, then mix while there is anything to play"""
+        self.bank = {name: to_pcm(make()) for name, make in self.sounds.items()}
+        self.ready.set()
+
+        voices: List[Voice] = []
+        stream_start = None
+        blocks = 0
+        block_seconds = BLOCK_FRAMES / SAMPLE_RATE
+        while True:
+            with self.condition:
+                while not self.requests and not voices and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    break
+                if self.stop_requested:
+                    voices.clear()
+                    self.stop_requested = False
+                requests, self.requests = self.requests, []
+
+            started = []
+            for name, requested_at in requests:
+                samples = self.bank.get(name)
+                if samples is not None:
+                    voice = Voice(samples, requested_at)
+                    voices.append(voice)
+                    started.append(voice)
+            if not voices:
+                continue
+
+            if self.sink is None:
+                self.sink = None if self.no_device else open_device_sink()
+                if self.sink is None:
+                    # No audio device, drop effects instead of mixing into nowhere
+                    self.no_device = True
+                    voices.clear()
+                    continue
+
+            block = mix_block(voices)
+            if self.realtime:
+                now = self.clock()
+                if stream_start is None:
+                    stream_start = now
+                    blocks = 0
+                due = stream_start + (blocks - self.lead_blocks) * block_seconds
+                if due > now:
+                    time.sleep(due - now)
+            try:
+                self.sink.write(block)
+            except OSError:
+                # The player went away, try to open a fresh one for the next effect
+                voices.clear()
+                self.sink = None
+                continue
+            blocks += 1
+            self.blocks_written += 1
+
+            written_at = self.clock()
+            for voice in started:
+                self.latencies.append(written_at - voice.requested_at)
+            voices = [voice for voice in voices if voice.position < len(voice.samples)]
+            if not voices:
+                stream_start = None  # Idle, pacing restarts with the next effect
+
+        if self.sink is not None:
+            self.sink.close()
+
+    def close(self):
+        """Stop the mixer thread and close the sink"""
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(self.CLOSE_TIMEOUT)
+            if self.thread.is_alive():
+                # Most likely blocked writing to a player that stopped reading its pipe
+                abort = getattr(self.sink, "abort", None)
+                if abort is not None:
+                    abort()
+                self.thread.join(self.CLOSE_TIMEOUT)
+        elif self.sink is not None:
+            self.sink.close()
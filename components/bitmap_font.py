@@ -0,0 +1,99 @@
+"""
+Bitmap font for drawing canvas text without a display
+"""
+
+from typing import Iterator, List, Tuple
+
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 8  # Seven rows above the baseline and one for descenders
+ADVANCE = GLYPH_WIDTH + 1
+
+# Printable ASCII, one byte per column from the left with bit 0 the top row
+GLYPHS = {
+    " ": (0x00, 0x00, 0x00, 0x00, 0x00), "!": (0x00, 0x00, 0x5F, 0x00, 0x00),
+    '"': (0x00, 0x07, 0x00, 0x07, 0x00), "#": (0x14, 0x7F, 0x14, 0x7F, 0x14),
+    "$": (0x24, 0x2A, 0x7F, 0x2A, 0x12), "%": (0x23, 0x13, 0x08, 0x64, 0x62),
+    "&": (0x36, 0x49, 0x56, 0x20, 0x50), "'": (0x00, 0x00, 0x07, 0x00, 0x00),
+    "(": (0x00, 0x1C, 0x22, 0x41, 0x00), ")": (0x00, 0x41, 0x22, 0x1C, 0x00),
+    "*": (0x2A, 0x1C, 0x7F, 0x1C, 0x2A), "+": (0x08, 0x08, 0x3E, 0x08, 0x08),
+    ",": (0x00, 0x80, 0x70, 0x30, 0x00), "-": (0x08, 0x08, 0x08, 0x08, 0x08),
+    ".": (0x00, 0x00, 0x60, 0x60, 0x00), "/": (0x20, 0x10, 0x08, 0x04, 0x02),
+    "0": (0x3E, 0x51, 0x49, 0x45, 0x3E), "1": (0x00, 0x42, 0x7F, 0x40, 0x00),
+    "2": (0x72, 0x49, 0x49, 0x49, 0x46), "3": (0x21, 0x41, 0x49, 0x4D, 0x33),
+    "4": (0x18, 0x14, 0x12, 0x7F, 0x10), "5": (0x27, 0x45, 0x45, 0x45, 0x39),
+    "6": (0x3C, 0x4A, 0x49, 0x49, 0x31), "7": (0x41, 0x21, 0x11, 0x09, 0x07),
+    "8": (0x36, 0x49, 0x49, 0x49, 0x36), "9": (0x46, 0x49, 0x49, 0x29, 0x1E),
+    ":": (0x00, 0x00, 0x14, 0x00, 0x00), ";": (0x00, 0x40, 0x34, 0x00, 0x00),
+    "<": (0x00, 0x08, 0x14, 0x22, 0x41), "=": (0x14, 0x14, 0x14, 0x14, 0x14),
+    ">": (0x00, 0x41, 0x22, 0x14, 0x08), "?": (0x02, 0x01, 0x59, 0x09, 0x06),
+    "@": (0x3E, 0x41, 0x5D, 0x59, 0x4E), "A": (0x7C, 0x12, 0x11, 0x12, 0x7C),
+    "B": (0x7F, 0x49, 0x49, 0x49, 0x36), "C": (0x3E, 0x41, 0x41, 0x41, 0x22),
+    "D": (0x7F, 0x41, 0x41, 0x41, 0x3E), "E": (0x7F, 0x49, 0x49, 0x49, 0x41),
+    "F": (0x7F, 0x09, 0x09, 0x09, 0x01), "G": (0x3E, 0x41, 0x41, 0x51, 0x73),
+    "H": (0x7F, 0x08, 0x08, 0x08, 0x7F), "I": (0x00, 0x41, 0x7F, 0x41, 0x00),
+    "J": (0x20, 0x40, 0x41, 0x3F, 0x01), "K": (0x7F, 0x08, 0x14, 0x22, 0x41),
+    "L": (0x7F, 0x40, 0x40, 0x40, 0x40), "M": (0x7F, 0x02, 0x1C, 0x02, 0x7F),
+    "N": (0x7F, 0x04, 0x08, 0x10, 0x7F), "O": (0x3E, 0x41, 0x41, 0x41, 0x3E),
+    "P": (0x7F, 0x09, 0x09, 0x09, 0x06), "Q": (0x3E, 0x41, 0x51, 0x21, 0x5E),
+    "R": (0x7F, 0x09, 0x19, 0x29, 0x46), "S": (0x26, 0x49, 0x49, 0x49, 0x32),
+    "T": (0x01, 0x01, 0x7F, 0x01, 0x01), "U": (0x3F, 0x40, 0x40, 0x40, 0x3F),
+    "V": (0x1F, 0x20, 0x40, 0x20, 0x1F), "W": (0x3F, 0x40, 0x38, 0x40, 0x3F),
+    "X": (0x63, 0x14, 0x08, 0x14, 0x63), "Y": (0x07, 0x08, 0x70, 0x08, 0x07),
+    "Z": (0x61, 0x51, 0x49, 0x45, 0x43), "[": (0x00, 0x7F, 0x41, 0x41, 0x00),
+    "\\": (0x02, 0x04, 0x08, 0x10, 0x20), "]": (0x00, 0x41, 0x41, 0x7F, 0x00),
+    "^": (0x04, 0x02, 0x01, 0x02, 0x04), "_": (0x40, 0x40, 0x40, 0x40, 0x40),
+    "`": (0x00, 0x01, 0x02, 0x04, 0x00), "a": (0x20, 0x54, 0x54, 0x54, 0x78),
+    "b": (0x7F, 0x48, 0x44, 0x44, 0x38), "c": (0x38, 0x44, 0x44, 0x44, 0x20),
+    "d": (0x38, 0x44, 0x44, 0x48, 0x7F), "e": (0x38, 0x54, 0x54, 0x54, 0x18),
+    "f": (0x08, 0x7E, 0x09, 0x01, 0x02), "g": (0x18, 0xA4, 0xA4, 0xA4, 0x7C),
+    "h": (0x7F, 0x08, 0x04, 0x04, 0x78), "i": (0x00, 0x44, 0x7D, 0x40, 0x00),
+    "j": (0x40, 0x80, 0x84, 0x7D, 0x00), "k": (0x7F, 0x10, 0x28, 0x44, 0x00),
+    "l": (0x00, 0x41, 0x7F, 0x40, 0x00), "m": (0x7C, 0x04, 0x18, 0x04, 0x78),
+    "n": (0x7C, 0x08, 0x04, 0x04, 0x78), "o": (0x38, 0x44, 0x44, 0x44, 0x38),
+    "p": (0xFC, 0x24, 0x24, 0x24, 0x18), "q": (0x18, 0x24, 0x24, 0x28, 0xFC),
+    "r": (0x7C, 0x08, 0x04, 0x04, 0x08), "s": (0x48, 0x54, 0x54, 0x54, 0x20),
+    "t": (0x04, 0x3F, 0x44, 0x40, 0x20), "u": (0x3C, 0x40, 0x40, 0x20, 0x7C),
+    "v": (0x1C, 0x20, 0x40, 0x20, 0x1C), "w": (0x3C, 0x40, 0x30, 0x40, 0x3C),
+    "x": (0x44, 0x28, 0x10, 0x28, 0x44), "y": (0x1C, 0xA0, 0xA0, 0xA0, 0x7C),
+    "z": (0x44, 0x64, 0x54, 0x4C, 0x44), "{": (0x00, 0x08, 0x36, 0x41, 0x00),
+    "|": (0x00, 0x00, 0x7F, 0x00, 0x00), "}": (0x00, 0x41, 0x36, 0x08, 0x00),
+    "~": (0x08, 0x04, 0x08, 0x10, 0x08),
+}
+
+# Drawn in place of characters the font does not have, such as emoji
+MISSING = (0x00, 0x00, 0x00, 0x00, 0x00)
+
+def text_size(text: str) -> Tuple[int, int]:
+    """Columns and rows of dots a block of text takes, one line per newline"""
+    lines = text.split("\n")
+    return max(max(len(line) for line in lines) * ADVANCE - 1, 0), len(lines) * (GLYPH_HEIGHT + 1) - 1
+
+def glyph_runs(char: str) -> List[Tuple[int, int, int]]:
+    """The dots of one character, as runs (column, row, length) of dots in a row"""
+    runs = []
+    columns = GLYPHS.get(char, MISSING)
+    for row in range(GLYPH_HEIGHT):
+        bit = 1 << row
+        run_start = None
+        for column, byte in enumerate(columns + (0,)):
+            if byte & bit:
+                if run_start is None:
+                    run_start = column
+            elif run_start is not None:
+                runs.append((run_start, row, column - run_start))
+                run_start = None
+    return runs
+
+def text_layout(text: str, justify: str = "left") -> Iterator[Tuple[str, int, int]]:
+    """Where each character of a block of text goes, as (char, column, row) of its top left dot
+
+    Lines narrower than the block are moved over by justify, "left",
+    "center" or "right", as Tk does. Spaces are left out.
+    """
+    width = text_size(text)[0]
+    for line_number, line in enumerate(text.split("\n")):
+        indent = width - (len(line) * ADVANCE - 1)
+        indent = 0 if justify == "left" else indent // 2 if justify == "center" else indent
+        for i, char in enumerate(line):
+            if char != " ":
+                yield char, indent + i * ADVANCE, line_number * (GLYPH_HEIGHT + 1)
@@ -4,37 +4,43 @@ Clock face component with positions for numbers
 
 import tkinter as tk
 import math
+from typing import List, Optional, Tuple
+from .animation import Animator
 from .colors import NeonColors
+from .fonts import FontBook
+from .engine import Board
+from .layout import Layout
+from .sprites import SpriteCache
+from .update_queue import UpdateQueue
 
 class ClockFace:
-    """The main clock face with positions for numbers"""
+    """Renders the clock face and the positions of a Board"""
     
-    def __init__(self, canvas: tk.Canvas, center_x: int, center_y: int, radius: int = 200):
+    SLOT_TAG = "slot_circle"
+    PLACED_TAG = "placed_number"
+    
+    WIGGLE_MS = 600
+    
+    def __init__(self, canvas: tk.Canvas, center_x: int, center_y: int, radius: int = 200,
+                 board: Optional[Board] = None, animator: Optional[Animator] = None,
+                 sprites: Optional[SpriteCache] = None):
         self.canvas = canvas
+        self.animator = animator if animator is not None else Animator.for_canvas(canvas)
+        self.sprites = sprites if sprites is not None else SpriteCache.for_canvas(canvas)
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.layout = Layout.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
         self.center_x = center_x
         self.center_y = center_y
         self.radius = radius
-        self.positions = []
-        self.placed_numbers = {}
-        
-        # Create clock outline with glow effect
-        self.clock_outline = canvas.create_oval(
-            center_x - radius, center_y - radius,
-            center_x + radius, center_y + radius,
-            outline=NeonColors.WHITE, width=4
-        )
+        self.board = board if board is not None else Board(center_x, center_y, radius)
+        self.slot_items: List[int] = []  # Empty position circle of each board slot, by slot index
+        self.placed_items: List[Optional[Tuple[int, int]]] = []  # Placed circle and text, created on first placement
+        self.drawn = 0  # Bit set for each slot drawn with its number placed
         
-        # Add glow effect to clock
-        self.clock_glow1 = canvas.create_oval(
-            center_x - radius - 3, center_y - radius - 3,
-            center_x + radius + 3, center_y + radius + 3,
-            outline=NeonColors.DEEP_PURPLE, width=2, stipple="gray50"
-        )
-        self.clock_glow2 = canvas.create_oval(
-            center_x - radius - 6, center_y - radius - 6,
-            center_x + radius + 6, center_y + radius + 6,
-            outline=NeonColors.DEEP_PURPLE, width=1, stipple="gray25"
-        )
+        # Clock outline and its glow are one pre-rendered sprite
+        self.outline_image = self.outline_sprite()
+        self.clock_outline = canvas.create_image(center_x, center_y, image=self.outline_image)
         
         # Create center dot
         self.center_dot = canvas.create_oval(
@@ -56,107 +62,115 @@ class ClockFace:
         self.create_number_positions()
     
     def create_number_positions(self):
-        """Create the 12 circular positions around the clock"""
-        # Define the correct number positions around a clock face
-        # 12 at top, 1 at 1 o'clock, 2 at 2 o'clock, etc.
-        number_positions = [12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
-        
-        for i in range(12):
-            angle = i * 30 - 90  # Start at 12 o'clock position
-            angle_rad = math.radians(angle)
-            
-            x = self.center_x + (self.radius - 40) * math.cos(angle_rad)
-            y = self.center_y + (self.radius - 40) * math.sin(angle_rad)
-            
+        """Create the circular positions around the clock"""
+        # Slot geometry and its spatial index (12 at top, 1 at 1 o'clock, etc.) come from the board
+        self.slot_image = self.slot_sprite()
+        for slot in self.board.slots:
             # Create position circle with subtle glow
-            position_circle = self.canvas.create_oval(
-                x - 20, y - 20, x + 20, y + 20,
-                outline=NeonColors.DEEP_PURPLE, width=2, stipple="gray75"
-            )
-            
-            self.positions.append({
-                'number': number_positions[i],  # Use the correct number for this position
-                'x': x,
-                'y': y,
-                'circle': position_circle,
-                'occupied': False
-            })
+            self.slot_items.append(self.canvas.create_image(
+                slot.x, slot.y, image=self.slot_image, tags=(self.SLOT_TAG,)
+            ))
+            self.placed_items.append(None)
+    
+    def outline_sprite(self):
+        """Get the clock outline sprite"""
+        return self.sprites.get("ring", self.radius * 2, self.radius * 2, outline=NeonColors.WHITE,
+                                outline_width=4, glow_color=NeonColors.DEEP_PURPLE, glow=6)
+    
+    def slot_sprite(self):
+        """Get the empty position sprite"""
+        return self.sprites.get("ring", 40, 40, outline=NeonColors.DEEP_PURPLE, outline_width=2, alpha=0.75)
+    
+    def rescale(self):
+        """Redraw the sprites and line widths after the layout scale changed
+        
+        Slots, placed numbers and hands were already moved by the layout and
+        the board keeps its design geometry, so only the images change.
+        """
+        self.outline_image = self.outline_sprite()
+        self.canvas.itemconfig(self.clock_outline, image=self.outline_image)
+        self.slot_image = self.slot_sprite()
+        self.updates.itemconfig(self.SLOT_TAG, image=self.slot_image)
+        self.updates.itemconfig(self.hour_hand, width=6 * self.layout.scale)
+        self.updates.itemconfig(self.minute_hand, width=4 * self.layout.scale)
     
     def check_placement(self, number: int, x: int, y: int) -> bool:
         """Check if a number is placed in the correct position"""
-        for position in self.positions:
-            if position['number'] == number:
-                distance = math.sqrt((x - position['x'])**2 + (y - position['y'])**2)
-                return distance < 30  # Within 30 pixels
-        return False
+        return self.board.check_placement(number, x, y)
     
-    def place_number(self, number: int, x: int, y: int) -> bool:
-        """Place a number in its correct position"""
-        for position in self.positions:
-            if position['number'] == number and not position['occupied']:
-                # Remove the position circle
-                self.canvas.delete(position['circle'])
-                
-                # Create the placed number with glow effect
-                placed_circle = self.canvas.create_oval(
-                    position['x'] - 25, position['y'] - 25,
-                    position['x'] + 25, position['y'] + 25,
-                    fill=NeonColors.DEEP_PURPLE, outline=NeonColors.WHITE, width=3
-                )
-                
-                placed_text = self.canvas.create_text(
-                    position['x'], position['y'], text=str(number),
-                    font=("Permanent Marker", 24, "bold"), fill=NeonColors.WHITE
-                )
-                
-                position['occupied'] = True
-                self.placed_numbers[number] = {
-                    'circle': placed_circle,
-                    'text': placed_text
-                }
-                return True
-        return False
+    def place_number(self, number: int) -> bool:
+        """Draw a number in its position once the board has accepted it"""
+        slot = self.board.get_slot(number)
+        if slot is None or self.drawn & slot.bit:
+            return False
+        
+        # Hide the position circle
+        self.updates.itemconfig(self.slot_items[slot.index], state=tk.HIDDEN)
+        
+        placed = self.placed_items[slot.index]
+        if placed is not None:
+            # Show the items kept from an earlier round
+            for item in placed:
+                self.updates.itemconfig(item, state=tk.NORMAL)
+        else:
+            # Create the placed number with glow effect
+            placed_circle = self.canvas.create_oval(
+                *self.layout.to_screen(slot.x - 25, slot.y - 25, slot.x + 25, slot.y + 25),
+                fill=NeonColors.DEEP_PURPLE, outline=NeonColors.WHITE, width=3,
+                tags=(self.PLACED_TAG,)
+            )
+            
+            placed_text = self.canvas.create_text(
+                *self.layout.to_screen(slot.x, slot.y), text=str(number),
+                font=self.fonts.get(24), fill=NeonColors.WHITE,
+                tags=(self.PLACED_TAG,)
+            )
+            
+            self.placed_items[slot.index] = (placed_circle, placed_text)
+        
+        self.drawn |= slot.bit
+        return True
+    
+    def unplace_number(self, number: int) -> bool:
+        """Show a number's position as empty again after an undo"""
+        slot = self.board.get_slot(number)
+        if slot is None or not self.drawn & slot.bit:
+            return False
+        
+        for item in self.placed_items[slot.index]:
+            self.updates.itemconfig(item, state=tk.HIDDEN)
+        self.updates.itemconfig(self.slot_items[slot.index], state=tk.NORMAL)
+        self.drawn &= ~slot.bit
+        return True
     
     def wiggle_hands(self):
         """Animate clock hands wiggling for incorrect placement"""
-        def wiggle_step(step=0):
-            if step < 6:
-                angle = math.sin(step * 0.5) * 5
-                angle_rad = math.radians(angle)
-                
-                # Wiggle hour hand
-                end_x = self.center_x + 60 * math.sin(angle_rad)
-                end_y = self.center_y - 60 * math.cos(angle_rad)
-                self.canvas.coords(self.hour_hand, self.center_x, self.center_y, end_x, end_y)
-                
-                # Wiggle minute hand
-                end_x = self.center_x + 90 * math.sin(angle_rad)
-                end_y = self.center_y - 90 * math.cos(angle_rad)
-                self.canvas.coords(self.minute_hand, self.center_x, self.center_y, end_x, end_y)
-                
-                self.canvas.after(100, lambda: wiggle_step(step + 1))
-            else:
-                # Reset hands to normal position
-                self.canvas.coords(self.hour_hand, self.center_x, self.center_y, self.center_x, self.center_y - 60)
-                self.canvas.coords(self.minute_hand, self.center_x, self.center_y, self.center_x, self.center_y - 90)
+        def wiggle_step(progress: float):
+            angle = math.sin(progress * 3) * 5
+            angle_rad = math.radians(angle)
+            
+            # Wiggle hour hand
+            end_x = self.center_x + 60 * math.sin(angle_rad)
+            end_y = self.center_y - 60 * math.cos(angle_rad)
+            self.updates.coords(self.hour_hand, self.center_x, self.center_y, end_x, end_y)
+            
+            # Wiggle minute hand
+            end_x = self.center_x + 90 * math.sin(angle_rad)
+            end_y = self.center_y - 90 * math.cos(angle_rad)
+            self.updates.coords(self.minute_hand, self.center_x, self.center_y, end_x, end_y)
         
-        wiggle_step()
+        def reset_hands():
+            # Reset hands to normal position
+            self.updates.coords(self.hour_hand, self.center_x, self.center_y, self.center_x, self.center_y - 60)
+            self.updates.coords(self.minute_hand, self.center_x, self.center_y, self.center_x, self.center_y - 90)
+        
+        # Restarts the wiggle if one is already running
+        self.animator.animate("wiggle_hands", self.WIGGLE_MS, wiggle_step, on_done=reset_hands)
     
     def reset(self):
-        """Reset the clock face to initial state"""
-        # Clear placed numbers
-        for position in self.positions:
-            if position['occupied']:
-                self.canvas.delete(self.placed_numbers[position['number']]['circle'])
-                self.canvas.delete(self.placed_numbers[position['number']]['text'])
-                position['occupied'] = False
-        
-        self.placed_numbers.clear()
-        
-        # Recreate position circles
-        for position in self.positions:
-            position['circle'] = self.canvas.create_oval(
-                position['x'] - 20, position['y'] - 20,
-                position['x'] + 20, position['y'] + 20,
-                outline=NeonColors.DEEP_PURPLE, width=2, stipple="gray75"
-            ) 
\ No newline at end of file
+        """Redraw the clock face for an empty board"""
+        # Placed items are hidden rather than deleted, so a reset costs the
+        # same two canvas calls no matter how many rounds have been played
+        self.updates.itemconfig(self.PLACED_TAG, state=tk.HIDDEN)
+        self.updates.itemconfig(self.SLOT_TAG, state=tk.NORMAL)
+        self.drawn = 0
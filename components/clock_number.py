@@ -3,88 +3,129 @@ Draggable clock number component
 """
 
 import tkinter as tk
+from typing import Optional
+from .animation import Animator
 from .colors import NeonColors
+from .fonts import FontBook
+from .hit_grid import HitGrid
+from .item_pool import ItemPool
+from .layout import Layout
+from .pulse import Pulser
+from .sprites import SpriteCache
 
 class ClockNumber:
     """Represents a draggable number on the clock"""
     
-    def __init__(self, canvas: tk.Canvas, number: int, x: int, y: int, color: str):
+    BOUNCE_MS = 250
+    HIT_RADIUS = 26  # The circle and its outline, not the glow around them
+    
+    def __init__(self, canvas: tk.Canvas, number: int, x: int, y: int, color: str,
+                 on_grab=None, pool: Optional[ItemPool] = None, animator: Optional[Animator] = None,
+                 sprites: Optional[SpriteCache] = None, hits: Optional[HitGrid] = None,
+                 pulser: Optional[Pulser] = None):
         self.canvas = canvas
         self.number = number
         self.x = x
         self.y = y
         self.color = color
+        self.on_grab = on_grab
+        self.pool = pool if pool is not None else ItemPool(canvas)
+        self.animator = animator if animator is not None else Animator.for_canvas(canvas)
+        self.sprites = sprites if sprites is not None else SpriteCache.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
+        self.layout = Layout.for_canvas(canvas)
+        self.hits = hits if hits is not None else HitGrid.for_canvas(canvas)
+        self.pulser = pulser if pulser is not None else Pulser.for_canvas(canvas)
         self.dragging = False
         self.drag_offset_x = 0
         self.drag_offset_y = 0
         
-        # Create the number circle with glow effect
-        self.circle = canvas.create_oval(
-            x - 25, y - 25, x + 25, y + 25,
-            fill=color, outline=NeonColors.WHITE, width=3
-        )
+        # All items share one tag so they move and raise as a group
+        self.tag = f"clock_number_{id(self)}"
         
-        # Add glow effect (multiple outline layers)
-        self.glow1 = canvas.create_oval(
-            x - 28, y - 28, x + 28, y + 28,
-            outline=color, width=2, stipple="gray50"
-        )
-        self.glow2 = canvas.create_oval(
-            x - 31, y - 31, x + 31, y + 31,
-            outline=color, width=1, stipple="gray25"
+        # The circle, its white outline and the glow are one pre-rendered sprite
+        self.image = self.sprite()
+        self.circle = self.pool.acquire(
+            "number_circle", "image", (x, y), image=self.image, tags=(self.tag,)
         )
         
         # Create the number text
-        self.text = canvas.create_text(
-            x, y, text=str(number), font=("Permanent Marker", 20, "bold"),
-            fill=NeonColors.WHITE
+        self.text = self.pool.acquire(
+            "number_text", "text", (x, y), text=str(number), font=self.fonts.get(20),
+            fill=NeonColors.WHITE, tags=(self.tag,)
         )
         
-        # Bind mouse events
-        canvas.tag_bind(self.circle, "<Button-1>", self.start_drag)
-        canvas.tag_bind(self.text, "<Button-1>", self.start_drag)
+        # The label glows toward the number's color, in step with the other numbers of that color
+        self.pulser.add(self.text, "fill", NeonColors.WHITE, NeonColors.blend(NeonColors.WHITE, color, 0.6))
+        
+        # Reused items keep their old stacking order, so bring the group to the front
+        canvas.tag_raise(self.tag)
+        
+        # Presses are found by the canvas's hit grid, on top like the items
+        self.hits.add(self, self.hit_box(), self.start_drag, tag=self.tag, circle=True)
+    
+    def sprite(self):
+        """Get the number's circle sprite"""
+        return self.sprites.get("circle", 50, 50, fill=self.color, outline=NeonColors.WHITE,
+                                outline_width=3, glow_color=self.color, glow=6)
+    
+    def hit_box(self):
+        """The box around the circle a press has to land in to grab the number"""
+        r = self.HIT_RADIUS
+        return (self.x - r, self.y - r, self.x + r, self.y + r)
+    
+    def rescale(self):
+        """Redraw the sprite after the layout scale changed"""
+        self.image = self.sprite()
+        self.canvas.itemconfig(self.circle, image=self.image)
     
     def start_drag(self, event):
         """Start dragging the number"""
+        # Catch the number mid-bounce if it is still flying home
+        self.animator.cancel(f"bounce_{self.tag}")
         self.dragging = True
-        self.drag_offset_x = event.x - self.x
-        self.drag_offset_y = event.y - self.y
-        self.canvas.tag_raise(self.circle)
-        self.canvas.tag_raise(self.text)
-        self.canvas.tag_raise(self.glow1)
-        self.canvas.tag_raise(self.glow2)
+        x, y = self.layout.to_design(event.x, event.y)
+        self.drag_offset_x = x - self.x
+        self.drag_offset_y = y - self.y
+        self.canvas.tag_raise(self.tag)
+        self.hits.lift(self)
+        if self.on_grab:
+            self.on_grab(self)
     
     def drag(self, event):
         """Handle dragging motion"""
         if self.dragging:
-            new_x = event.x - self.drag_offset_x
-            new_y = event.y - self.drag_offset_y
-            
-            # Move all elements
-            self.canvas.coords(self.circle, new_x - 25, new_y - 25, new_x + 25, new_y + 25)
-            self.canvas.coords(self.glow1, new_x - 28, new_y - 28, new_x + 28, new_y + 28)
-            self.canvas.coords(self.glow2, new_x - 31, new_y - 31, new_x + 31, new_y + 31)
-            self.canvas.coords(self.text, new_x, new_y)
-            
-            self.x = new_x
-            self.y = new_y
+            x, y = self.layout.to_design(event.x, event.y)
+            self.move_to(x - self.drag_offset_x, y - self.drag_offset_y)
+    
+    def move_to(self, new_x: float, new_y: float):
+        """Move all elements to a new center with a single canvas call"""
+        scale = self.layout.scale
+        self.canvas.move(self.tag, (new_x - self.x) * scale, (new_y - self.y) * scale)
+        self.x = new_x
+        self.y = new_y
+        self.hits.move(self, self.hit_box())
     
     def stop_drag(self):
         """Stop dragging the number"""
         self.dragging = False
     
     def remove(self):
-        """Remove the number from the canvas"""
-        self.canvas.delete(self.circle)
-        self.canvas.delete(self.glow1)
-        self.canvas.delete(self.glow2)
-        self.canvas.delete(self.text)
+        """Remove the number from the canvas, keeping its items for reuse"""
+        self.animator.cancel(f"bounce_{self.tag}")
+        self.hits.remove(self)
+        self.pulser.remove(self.text, untag=False)  # Releasing clears the item's tags
+        self.pool.release("number_circle", self.circle)
+        self.pool.release("number_text", self.text)
     
     def bounce_back(self, original_x: int, original_y: int):
         """Animate bouncing back to original position"""
-        self.x = original_x
-        self.y = original_y
-        self.canvas.coords(self.circle, original_x - 25, original_y - 25, original_x + 25, original_y + 25)
-        self.canvas.coords(self.glow1, original_x - 28, original_y - 28, original_x + 28, original_y + 28)
-        self.canvas.coords(self.glow2, original_x - 31, original_y - 31, original_x + 31, original_y + 31)
-        self.canvas.coords(self.text, original_x, original_y) 
\ No newline at end of file
+        start_x, start_y = self.x, self.y
+        
+        def bounce_step(progress: float):
+            # Ease out so the number slows down as it lands
+            eased = 1 - (1 - progress) ** 3
+            self.move_to(start_x + (original_x - start_x) * eased,
+                         start_y + (original_y - start_y) * eased)
+        
+        self.animator.animate(f"bounce_{self.tag}", self.BOUNCE_MS, bounce_step)
@@ -2,6 +2,8 @@
 Neon color palette for Lite-Brite aesthetic
 """
 
+from functools import lru_cache
+
 class NeonColors:
     """Neon color palette for Lite-Brite aesthetic"""
     # New palette based on the user's image
@@ -17,13 +19,32 @@ class NeonColors:
     WHITE = "#FFFFFF"
     BLACK = "#000000"
     
+    # Colors of the numbers and tower blocks, built once
+    PALETTE = (DEEP_PURPLE, HOT_MAGENTA, GOLDEN_YELLOW)
+    
     @classmethod
-    def get_neon_palette(cls) -> list[str]:
+    def get_neon_palette(cls) -> tuple[str, ...]:
         """Get the full neon color palette for the numbers"""
-        return [cls.DEEP_PURPLE, cls.HOT_MAGENTA, cls.GOLDEN_YELLOW]
+        return cls.PALETTE
     
     @classmethod
     def get_color_by_index(cls, index: int) -> str:
         """Get a color from the palette by index"""
-        colors = cls.get_neon_palette()
-        return colors[index % len(colors)] 
\ No newline at end of file
+        return cls.PALETTE[index % len(cls.PALETTE)]
+    
+    @staticmethod
+    def blend(start: str, end: str, amount: float) -> str:
+        """Blend two hex colors, amount 0.0 gives start and 1.0 gives end"""
+        r1, g1, b1 = int(start[1:3], 16), int(start[3:5], 16), int(start[5:7], 16)
+        r2, g2, b2 = int(end[1:3], 16), int(end[3:5], 16), int(end[5:7], 16)
+        return "#{:02X}{:02X}{:02X}".format(
+            round(r1 + (r2 - r1) * amount),
+            round(g1 + (g2 - g1) * amount),
+            round(b1 + (b2 - b1) * amount)
+        )
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def ramp(start: str, end: str, steps: int) -> tuple[str, ...]:
+        """Get steps + 1 colors blending evenly from start to end, computed once per ramp"""
+        return tuple(NeonColors.blend(start, end, i / steps) for i in range(steps + 1))
@@ -0,0 +1,547 @@
+"""
+Headless game state and rules for Hour Tower
+"""
+
+import math
+import random
+import struct
+import time
+from array import array
+from collections import deque, namedtuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from .colors import NeonColors
+from .slot_index import SlotIndex
+from .spawn_layout import SpawnLayout
+
+# Numbers in clockwise order starting from the 12 o'clock position
+CLOCK_ORDER = [12, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+
+# Packed game state: score, tower progress and blocks, elapsed; then the occupancy and remaining numbers masks
+STATE = struct.Struct("<iIId")
+MASK_LENGTH = struct.Struct("<H")  # Bytes in a packed mask, so boards of any size fit
+
+# The part of a game a placement changes, as plain integers
+Snapshot = namedtuple("Snapshot", "occupied score tower_progress tower_blocks")
+
+def pack_mask(mask: int) -> bytes:
+    """A bitmask as its length in bytes then the bytes, lowest first"""
+    data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+    return MASK_LENGTH.pack(len(data)) + data
+
+def unpack_mask(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read a mask written by pack_mask, returning it and the offset after it"""
+    length = MASK_LENGTH.unpack_from(data, offset)[0]
+    start = offset + MASK_LENGTH.size
+    return int.from_bytes(data[start:start + length], "little"), start + length
+
+class BoardSlot:
+    """A single position on the clock face, occupied when its bit is set in the board's mask"""
+
+    __slots__ = ("number", "x", "y", "index", "bit", "board")
+
+    def __init__(self, number: int, x: float, y: float, index: int, board: "Board"):
+        self.number = number
+        self.x = x
+        self.y = y
+        self.index = index  # Position in Board.slots
+        self.bit = 1 << index
+        self.board = board
+
+    @property
+    def occupied(self) -> bool:
+        return bool(self.board.occupied & self.bit)
+
+class Board:
+    """Clock face geometry and occupancy, without any drawing"""
+
+    RING_SPACING = 50  # Distance between rings on multi-ring boards
+
+    def __init__(self, center_x: int, center_y: int, radius: int = 200, snap_distance: int = 30,
+                 rings: Optional[Sequence[Sequence[int]]] = None):
+        self.occupied = 0  # Bit i set when the i-th slot has its number
+        self.placed = 0  # Number of occupied slots
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = radius
+        self.snap_distance = snap_distance
+        # Numbers on each ring, clockwise from the top, outermost ring first
+        self.rings = [list(ring) for ring in rings] if rings is not None else [CLOCK_ORDER]
+        self.slots: List[BoardSlot] = []
+        self.index = SlotIndex(center_x, center_y, snap_distance)
+        self.create_slots()
+
+    def create_slots(self):
+        """Create the positions around the clock and index them"""
+        self.slots.clear()
+        self.index = SlotIndex(self.center_x, self.center_y, self.snap_distance)
+        for ring_number, numbers in enumerate(self.rings):
+            ring_radius = self.radius - 40 - ring_number * self.RING_SPACING
+            step = 360 / len(numbers)
+            ring_slots = []
+            for i, number in enumerate(numbers):
+                angle_rad = math.radians(i * step - 90)  # Start at 12 o'clock position
+                x = self.center_x + ring_radius * math.cos(angle_rad)
+                y = self.center_y + ring_radius * math.sin(angle_rad)
+                ring_slots.append(BoardSlot(number, x, y, len(self.slots) + len(ring_slots), self))
+            self.slots.extend(ring_slots)
+            self.index.add_ring(ring_radius, ring_slots)
+
+    def get_slot(self, number: int) -> Optional[BoardSlot]:
+        """Get the slot a number belongs in"""
+        return self.index.get(number)
+
+    def slot_at(self, x: float, y: float) -> Optional[BoardSlot]:
+        """Get the slot a drop point lands in, if any"""
+        return self.index.slot_at(x, y)
+
+    def nearest_free_slot(self, x: float, y: float) -> Optional[BoardSlot]:
+        """Get the closest unoccupied slot to a point"""
+        return self.index.nearest_free_slot(x, y)
+
+    def check_placement(self, number: int, x: float, y: float) -> bool:
+        """Check if a number is dropped close enough to its correct position"""
+        slot = self.index.slot_at(x, y)
+        return slot is not None and slot.number == number
+
+    def place_number(self, number: int) -> bool:
+        """Mark a number's position as occupied"""
+        slot = self.get_slot(number)
+        if slot is None or self.occupied & slot.bit:
+            return False
+        self.occupied |= slot.bit
+        self.placed += 1
+        return True
+
+    def is_full(self) -> bool:
+        """Check if every position is occupied"""
+        return self.placed == len(self.slots)
+
+    def restore(self, occupied: int):
+        """Set the occupied positions from a mask saved from occupied"""
+        self.occupied = occupied & ((1 << len(self.slots)) - 1)
+        self.placed = bin(self.occupied).count("1")
+
+    def reset(self):
+        """Clear all occupied positions"""
+        self.occupied = 0
+        self.placed = 0
+
+class TowerState:
+    """Tower building progress, without any drawing
+
+    A tower can grow without limit, so completed blocks are kept in two
+    flat arrays, one byte and one double per block, rather than as objects.
+    """
+
+    def __init__(self, max_progress: int = 12):
+        self.progress = 0
+        self.max_progress = max_progress  # Correct answers needed to complete a block
+        self.blocks = array("B")  # Palette index of each completed block
+        self.completed_at = array("d")  # Clock time each block was completed, 0.0 if restored
+
+    def add_progress(self, now: float = 0.0) -> bool:
+        """Add progress toward a block, returns True when a block is completed"""
+        self.progress += 1
+        if self.progress >= self.max_progress:
+            palette_size = len(NeonColors.get_neon_palette())
+            self.blocks.append(len(self.blocks) % palette_size)
+            self.completed_at.append(now)
+            self.progress = 0
+            return True
+        return False
+
+    def reset(self):
+        """Reset the tower to initial state"""
+        self.progress = 0
+        del self.blocks[:]
+        del self.completed_at[:]
+
+    def rewind(self, progress: int, block_count: int, now: float = 0.0):
+        """Go back or forward to a progress and number of blocks, keeping the blocks both share"""
+        palette_size = len(NeonColors.get_neon_palette())
+        self.progress = progress
+        del self.blocks[block_count:]
+        del self.completed_at[block_count:]
+        for i in range(len(self.blocks), block_count):
+            self.blocks.append(i % palette_size)
+            self.completed_at.append(now)
+
+    def restore(self, progress: int, block_count: int):
+        """Rebuild the tower from saved progress and a number of completed blocks"""
+        palette_size = len(NeonColors.get_neon_palette())
+        self.progress = progress
+        self.blocks = array("B", (i % palette_size for i in range(block_count)))
+        self.completed_at = array("d", bytes(8 * block_count))
+
+class Piece:
+    """A draggable number that has not been placed yet, and where it spawned"""
+
+    __slots__ = ("number", "x", "y", "color", "home")
+
+    def __init__(self, number: int, x: float, y: float, color: str):
+        self.number = number
+        self.x = x
+        self.y = y
+        self.color = color
+        self.home = (x, y)
+
+class PieceTable:
+    """The unplaced pieces of a round, indexed directly by number
+
+    Pieces sit in a list at their number's index, so finding, removing and
+    counting them takes constant time, and iterating gives them in number
+    order as they were spawned. remaining has bit n set while number n is
+    still to be placed.
+    """
+
+    def __init__(self):
+        self.by_number: List[Optional[Piece]] = []
+        self.remaining = 0
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self):
+        return (piece for piece in self.by_number if piece is not None)
+
+    def add(self, piece: Piece):
+        if piece.number >= len(self.by_number):
+            self.by_number.extend([None] * (piece.number + 1 - len(self.by_number)))
+        if self.by_number[piece.number] is None:
+            self.count += 1
+        self.by_number[piece.number] = piece
+        self.remaining |= 1 << piece.number
+
+    def get(self, number: int) -> Optional[Piece]:
+        return self.by_number[number] if 0 <= number < len(self.by_number) else None
+
+    def remove(self, number: int) -> Optional[Piece]:
+        piece = self.get(number)
+        if piece is not None:
+            self.by_number[number] = None
+            self.remaining &= ~(1 << number)
+            self.count -= 1
+        return piece
+
+    def clear(self):
+        self.by_number = []
+        self.remaining = 0
+        self.count = 0
+
+class GameHistory:
+    """Bounded undo and redo of the placements of one round
+
+    An entry is a Snapshot of four integers, the board being a bitmask, so
+    a step costs the same few bytes however big the board is. What never
+    changes within a round, the pieces with their homes and colors, is
+    shared by every entry instead of copied. Past depth steps the oldest
+    entry is dropped.
+    """
+
+    def __init__(self, depth: int = 50):
+        self.depth = depth
+        self.undo_stack = deque(maxlen=depth)
+        self.redo_stack: List[Snapshot] = []
+
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    def push(self, snapshot: Snapshot):
+        """Remember the state before a new step, which forgets whatever could be redone"""
+        self.undo_stack.append(snapshot)
+        self.redo_stack.clear()
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+class GameEngine:
+    """Game state and rules, independent of any display
+
+    Renderers subscribe with a callback taking ``(event, data)`` and are
+    notified after each state change. Events emitted:
+
+    - ``game_started``: ``pieces``
+    - ``game_reset``
+    - ``correct_placement``: ``number``, ``score``, ``block_complete``
+    - ``incorrect_placement``: ``number``, ``x``, ``y``, ``home``
+    - ``game_complete``: ``score``, ``time_spent``
+    - ``game_restored``: ``pieces``, ``placed``, ``score``, ``tower_progress``,
+      ``tower_blocks``, ``elapsed``
+    - ``undo`` and ``redo``: ``placed`` and ``returned``, the numbers put on
+      and taken off the board, ``pieces`` returned, ``score``,
+      ``tower_progress`` and ``tower_blocks``
+
+    Pieces spawn on a ring around the board, sized to the board: for the
+    classic 12 numbers it is SPAWN_DISTANCE from the center of a board of
+    radius CLASSIC_RADIUS, clipped to spawn_bounds, and bigger boards scale
+    both with their radius and widen the ring to keep the room per piece.
+    Pieces start SPAWN_SEPARATION apart and are packed no closer than
+    MIN_SPAWN_SEPARATION when that many do not fit.
+
+    Each engine draws its spawn layouts from its own generator, seeded with
+    seed (a random one when not given), and reads time from clock. Given
+    the same seed, clock and calls, an engine always plays out the same way,
+    which is what replays rely on.
+    """
+
+    CLASSIC_RADIUS = 180
+    SPAWN_DISTANCE = (220, 260)
+    # Spawn bounds around the classic board's center: room for the title above, the tower right and buttons below
+    SPAWN_MARGINS = (295, 245, 245, 155)
+    SPAWN_SEPARATION = 56
+    MIN_SPAWN_SEPARATION = 30  # A little over a piece's radius, so every number stays readable and grabbable
+
+    def __init__(self, board: Optional[Board] = None, tower: Optional[TowerState] = None,
+                 spawn_bounds: Optional[Tuple[float, float, float, float]] = None,
+                 seed: Optional[int] = None, user: str = "player_name",
+                 clock: Callable[[], float] = time.time, history_depth: int = 50,
+                 spawn_separation: float = SPAWN_SEPARATION, min_spawn_separation: float = MIN_SPAWN_SEPARATION):
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.clock = clock
+        self.board = board if board is not None else Board(325, 325, self.CLASSIC_RADIUS)
+        self.tower = tower if tower is not None else TowerState()
+        scale = self.board.radius / self.CLASSIC_RADIUS
+        if spawn_bounds is None:
+            left, top, right, bottom = (margin * scale for margin in self.SPAWN_MARGINS)
+            spawn_bounds = (self.board.center_x - left, self.board.center_y - top,
+                            self.board.center_x + right, self.board.center_y + bottom)
+        self.spawn_bounds = spawn_bounds  # (left, top, right, bottom) area pieces may spawn in
+        inner, outer = (distance * scale for distance in self.SPAWN_DISTANCE)
+        # Widen the ring so each piece has the room it has on the classic board
+        pieces = len(self.board.slots) / len(CLOCK_ORDER)
+        outer = math.sqrt(inner * inner + max(pieces, 1) * (outer * outer - inner * inner))
+        self.spawn_layout = SpawnLayout(
+            self.board.center_x, self.board.center_y, inner, outer, spawn_bounds,
+            separation=spawn_separation, min_separation=min(min_spawn_separation, spawn_separation), seed=self.seed
+        )
+
+        self.pieces = PieceTable()
+        self.round_pieces = PieceTable()  # Every piece spawned this round, placed or not
+        self.history = GameHistory(history_depth)
+        self.score = 0
+        self.game_complete = False
+        self.start_time = self.clock()
+        self.listeners: List[Callable[[str, Dict], None]] = []
+
+        # User progress dictionary
+        self.user_progress = {
+            "user": user,
+            "level": 1,
+            "score": 0,
+            "completed": False,
+            "time_spent": 0.0
+        }
+
+    def subscribe(self, listener: Callable[[str, Dict], None]):
+        """Register a callback for state change events"""
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Dict], None]):
+        """Remove a previously registered callback"""
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def emit(self, event: str, **data):
+        """Notify all listeners of a state change"""
+        for listener in self.listeners:
+            listener(event, data)
+
+    def start_new_game(self):
+        """Start a new game with random number placement"""
+        self.pieces.clear()
+        self.history.clear()
+
+        # Reset game state
+        self.score = 0
+        self.game_complete = False
+        self.start_time = self.clock()
+        self.user_progress["score"] = 0
+        self.user_progress["completed"] = False
+        self.user_progress["time_spent"] = 0.0
+
+        self.spawn_pieces()
+        self.emit("game_started", pieces=list(self.pieces))
+
+    def spawn_pieces(self):
+        """Spawn one piece per position, all at once and without overlaps"""
+        numbers = sorted(slot.number for slot in self.board.slots)
+        positions = self.spawn_layout.generate(len(numbers))
+        self.round_pieces.clear()
+        for i, (number, (x, y)) in enumerate(zip(numbers, positions)):
+            color = NeonColors.get_color_by_index(i)
+            piece = Piece(number, x, y, color)
+            self.pieces.add(piece)
+            self.round_pieces.add(piece)
+
+    def restore(self, score: int, placed: Sequence[int], tower_progress: int = 0,
+                tower_blocks: int = 0, elapsed: float = 0.0):
+        """Continue an unfinished game from saved progress
+
+        Placed numbers are put back on the board, the rest are spawned as in
+        a new game, and the timer resumes from elapsed seconds.
+        """
+        self.pieces.clear()
+        self.history.clear()
+        self.board.reset()
+        self.tower.restore(tower_progress, tower_blocks)
+        self.spawn_pieces()
+
+        placed = [number for number in placed if self.board.place_number(number)]
+        for number in placed:
+            self.pieces.remove(number)
+
+        self.score = score
+        self.game_complete = False
+        self.start_time = self.clock() - elapsed
+        self.user_progress["score"] = score
+        self.user_progress["completed"] = False
+        self.user_progress["time_spent"] = 0.0
+
+        self.emit("game_restored", pieces=list(self.pieces), placed=placed, score=score,
+                  tower_progress=tower_progress, tower_blocks=tower_blocks, elapsed=elapsed)
+
+    def get_piece(self, number: int) -> Optional[Piece]:
+        """Get the unplaced piece for a number"""
+        return self.pieces.get(number)
+
+    def pack_state(self) -> bytes:
+        """The game in progress as a few bytes: score, tower and time, the masks, then each piece's home"""
+        homes = array("f")
+        for piece in self.pieces:
+            homes.extend(piece.home)
+        return (STATE.pack(self.score, self.tower.progress, len(self.tower.blocks), self.clock() - self.start_time)
+                + pack_mask(self.board.occupied) + pack_mask(self.pieces.remaining) + homes.tobytes())
+
+    def unpack_state(self, data: bytes):
+        """Continue the game saved by pack_state, with every piece back at its home"""
+        score, tower_progress, tower_blocks, elapsed = STATE.unpack_from(data)
+        occupied, offset = unpack_mask(data, STATE.size)
+        remaining, offset = unpack_mask(data, offset)
+        homes = array("f", data[offset:])
+        self.board.restore(occupied)
+        self.tower.restore(tower_progress, tower_blocks)
+        self.pieces.clear()
+        self.round_pieces.clear()
+        self.history.clear()  # Placed pieces have no saved home to go back to
+        numbers = sorted(slot.number for slot in self.board.slots)
+        for i, number in enumerate(numbers):
+            if remaining >> number & 1:
+                x, y = homes[2 * len(self.pieces)], homes[2 * len(self.pieces) + 1]
+                piece = Piece(number, x, y, NeonColors.get_color_by_index(i))
+                self.pieces.add(piece)
+                self.round_pieces.add(piece)
+
+        self.score = score
+        self.game_complete = False
+        self.start_time = self.clock() - elapsed
+        self.user_progress["score"] = score
+        self.user_progress["completed"] = False
+        self.user_progress["time_spent"] = 0.0
+
+        placed = [slot.number for slot in self.board.slots if slot.occupied]
+        self.emit("game_restored", pieces=list(self.pieces), placed=placed, score=score,
+                  tower_progress=tower_progress, tower_blocks=tower_blocks, elapsed=elapsed)
+
+    def handle_number_placement(self, number: int, x: float, y: float) -> bool:
+        """Handle a number being dropped at (x, y)"""
+        piece = self.get_piece(number)
+        if piece is None:
+            return False
+
+        # Check if number is placed correctly
+        if self.board.check_placement(number, x, y):
+            snapshot = self.snapshot()
+            if not self.board.place_number(number):
+                return False
+            self.history.push(snapshot)
+
+            # Remove from draggable numbers
+            self.pieces.remove(number)
+
+            # Update score and progress
+            self.score += 10
+            self.user_progress["score"] = self.score
+            block_complete = self.tower.add_progress(self.clock())
+            self.emit("correct_placement", number=number, score=self.score,
+                      block_complete=block_complete)
+
+            # Check if game is complete
+            if len(self.pieces) == 0:
+                self.history.clear()  # A finished game stays finished
+                self.game_complete = True
+                self.user_progress["completed"] = True
+                self.user_progress["time_spent"] = self.clock() - self.start_time
+                self.emit("game_complete", score=self.score,
+                          time_spent=self.user_progress["time_spent"])
+            return True
+
+        # Incorrect placement, send the piece back where it started
+        home = piece.home
+        piece.x, piece.y = home
+        self.emit("incorrect_placement", number=number, x=x, y=y, home=home)
+        return False
+
+    def snapshot(self) -> Snapshot:
+        """The state a placement changes, for the history"""
+        return Snapshot(self.board.occupied, self.score, self.tower.progress, len(self.tower.blocks))
+
+    def undo(self) -> bool:
+        """Take back the last correct placement, returns False when there is nothing to undo"""
+        if not self.history.undo_stack:
+            return False
+        self.history.redo_stack.append(self.snapshot())
+        self.apply_snapshot("undo", self.history.undo_stack.pop())
+        return True
+
+    def redo(self) -> bool:
+        """Put back the last undone placement, returns False when there is nothing to redo"""
+        if not self.history.redo_stack:
+            return False
+        self.history.undo_stack.append(self.snapshot())
+        self.apply_snapshot("redo", self.history.redo_stack.pop())
+        return True
+
+    def apply_snapshot(self, event: str, snapshot: Snapshot):
+        """Move to a snapshot, touching only the slots whose occupancy differs"""
+        placed = []
+        returned = []
+        changed = self.board.occupied ^ snapshot.occupied
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            slot = self.board.slots[bit.bit_length() - 1]
+            if snapshot.occupied & bit:
+                placed.append(slot.number)
+                self.pieces.remove(slot.number)
+            else:
+                piece = self.round_pieces.get(slot.number)
+                piece.x, piece.y = piece.home
+                self.pieces.add(piece)
+                returned.append(piece)
+        self.board.restore(snapshot.occupied)
+        self.tower.rewind(snapshot.tower_progress, snapshot.tower_blocks, self.clock())
+
+        self.score = snapshot.score
+        self.user_progress["score"] = snapshot.score
+        self.emit(event, placed=placed, returned=[piece.number for piece in returned], pieces=returned,
+                  score=snapshot.score, tower_progress=snapshot.tower_progress,
+                  tower_blocks=snapshot.tower_blocks)
+
+    def reset_game(self):
+        """Reset the game to initial state"""
+        self.score = 0
+        self.game_complete = False
+        self.board.reset()
+        self.tower.reset()
+        self.history.clear()
+        self.emit("game_reset")
+        self.start_new_game()
+
+    def get_remaining_numbers(self) -> int:
+        """Get number of remaining numbers to place"""
+        return len(self.pieces)
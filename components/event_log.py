@@ -0,0 +1,497 @@
+"""
+Append-only event log for user progress and game events
+"""
+
+import contextlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Every record is framed so a torn or damaged write can be detected and skipped
+MAGIC = 0xA7
+MAGIC_BYTE = bytes((MAGIC,))
+FRAME = struct.Struct("<BHI")  # magic, payload length, crc32 of payload
+MAX_PAYLOAD = 0xFFFF
+READ_CHUNK = 1 << 20
+HEADER = struct.Struct("<BQd")  # event code, session key, unix timestamp
+
+# Event codes
+SESSION = 1  # body: user name (utf-8)
+NEW_GAME = 2
+CORRECT = 3  # number, score
+INCORRECT = 4  # number, x, y
+RESET = 5
+COMPLETE = 6  # score, time_spent
+BLOCK = 7  # completed blocks in the tower
+RESTORE = 8  # score, tower progress, tower blocks, elapsed, then the placed numbers
+UNDO = 9  # score, tower progress, tower blocks, then the numbers taken off the board
+REDO = 10  # score, tower progress, tower blocks, then the numbers put back
+
+BODIES = {
+    NEW_GAME: struct.Struct("<"),
+    CORRECT: struct.Struct("<HI"),
+    INCORRECT: struct.Struct("<Hff"),
+    RESET: struct.Struct("<"),
+    COMPLETE: struct.Struct("<Id"),
+    BLOCK: struct.Struct("<H"),
+    RESTORE: struct.Struct("<IHHd"),
+    UNDO: struct.Struct("<IHH"),
+    REDO: struct.Struct("<IHH"),
+}
+NUMBER_LISTS = (RESTORE, UNDO, REDO)  # Codes whose body ends in a list of numbers
+PLACED_NUMBER = struct.Struct("<H")
+
+# Recovery starts from a checkpoint file next to the log instead of the log's first record
+CHECKPOINT_SUFFIX = ".checkpoint"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_TAIL = 32  # Log bytes before the checkpoint offset, kept to tell if the log was replaced
+ACTIVE_SECONDS = 24 * 3600  # Sessions this recent are all checkpointed, older ones only if a user's latest
+
+# Only the data needs to be durable, not the file's timestamps
+sync = getattr(os, "fdatasync", os.fsync)
+
+EventRecord = namedtuple("EventRecord", "code session time values")
+
+def encode_record(code: int, session: int, timestamp: float, *values) -> bytes:
+    """Pack one event into a framed record"""
+    payload = HEADER.pack(code, session, timestamp)
+    if code == SESSION:
+        payload += values[0].encode("utf-8")
+    elif code in NUMBER_LISTS:
+        *fixed, numbers = values
+        payload += BODIES[code].pack(*fixed) + b"".join(PLACED_NUMBER.pack(n) for n in numbers)
+    else:
+        payload += BODIES[code].pack(*values)
+    return FRAME.pack(MAGIC, len(payload), zlib.crc32(payload)) + payload
+
+def decode_payload(payload: bytes) -> EventRecord:
+    """Unpack a record payload, raising ValueError if it does not parse"""
+    try:
+        code, session, timestamp = HEADER.unpack_from(payload)
+        body = payload[HEADER.size:]
+        if code == SESSION:
+            values = (body.decode("utf-8"),)
+        elif code in NUMBER_LISTS:
+            fixed = BODIES[code].unpack_from(body)
+            rest = body[BODIES[code].size:]
+            numbers = tuple(n for (n,) in PLACED_NUMBER.iter_unpack(rest))
+            values = fixed + (numbers,)
+        else:
+            values = BODIES[code].unpack(body)
+    except (KeyError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Bad event record: {e}") from e
+    return EventRecord(code, session, timestamp, values)
+
+def read_records(path: str, chunk_size: int = READ_CHUNK) -> Iterator[EventRecord]:
+    """Stream every intact record in a log file, in write order
+
+    The file is read chunk_size bytes at a time, so memory stays bounded
+    however large the log grows. Damaged bytes (a write torn by a crash, or
+    a stray partial batch) are skipped by scanning forward to the next frame
+    whose checksum matches, so one bad write never hides the records after it.
+    """
+    for record, _ in scan_records(path, chunk_size=chunk_size):
+        yield record
+
+def scan_records(path: str, position: int = 0, chunk_size: int = READ_CHUNK) -> Iterator[Tuple[EventRecord, int]]:
+    """Stream the intact records from a byte position on, each with the offset just past it"""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with f:
+        f.seek(position)
+        base = position  # File offset of data[0]
+        data = b""
+        offset = 0
+        eof = False
+        while True:
+            # Keep a whole maximum-size frame buffered so any length can be checked
+            if not eof and len(data) - offset < FRAME.size + MAX_PAYLOAD:
+                chunk = f.read(chunk_size)
+                if chunk:
+                    base += offset
+                    data = data[offset:] + chunk
+                    offset = 0
+                else:
+                    eof = True
+                continue
+            if len(data) - offset < FRAME.size:
+                return
+
+            magic, length, crc = FRAME.unpack_from(data, offset)
+            start = offset + FRAME.size
+            payload = data[start:start + length]
+            if magic == MAGIC and len(payload) == length and zlib.crc32(payload) == crc:
+                try:
+                    record = decode_payload(payload)
+                except ValueError:
+                    pass
+                else:
+                    offset = start + length
+                    yield record, base + offset
+                    continue
+            # Resynchronise on the next possible frame
+            next_magic = data.find(MAGIC_BYTE, offset + 1)
+            offset = next_magic if next_magic >= 0 else len(data)
+
+class ProgressState:
+    """The last known state of one session, rebuilt by replaying its records"""
+
+    def __init__(self, user: str, session: int):
+        self.user = user
+        self.session = session
+        self.score = 0
+        self.completed = False
+        self.time_spent = 0.0
+        self.placed: List[int] = []
+        self.tower_progress = 0
+        self.tower_blocks = 0
+        self.started_at: Optional[float] = None
+        self.last_time = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds played in the current game when the last record was written"""
+        if self.started_at is None:
+            return 0.0
+        return max(self.last_time - self.started_at, 0.0)
+
+    def apply(self, record: EventRecord):
+        """Advance the state by one record"""
+        self.last_time = record.time
+        code = record.code
+        if code == NEW_GAME:
+            self.score = 0
+            self.completed = False
+            self.time_spent = 0.0
+            self.placed = []
+            self.started_at = record.time
+        elif code == CORRECT:
+            number, self.score = record.values
+            self.placed.append(number)
+            self.tower_progress += 1
+        elif code == BLOCK:
+            self.tower_blocks = record.values[0]
+            self.tower_progress = 0
+        elif code == RESET:
+            self.score = 0
+            self.completed = False
+            self.placed = []
+            self.tower_progress = 0
+            self.tower_blocks = 0
+        elif code == COMPLETE:
+            self.score, self.time_spent = record.values
+            self.completed = True
+        elif code == RESTORE:
+            self.score, self.tower_progress, self.tower_blocks, elapsed, placed = record.values
+            self.placed = list(placed)
+            self.completed = False
+            self.started_at = record.time - elapsed
+        elif code == UNDO:
+            self.score, self.tower_progress, self.tower_blocks, returned = record.values
+            self.placed = [number for number in self.placed if number not in returned]
+            self.completed = False
+        elif code == REDO:
+            self.score, self.tower_progress, self.tower_blocks, placed = record.values
+            self.placed.extend(placed)
+
+    def as_dict(self) -> Dict:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, values: Dict) -> "ProgressState":
+        state = cls(values["user"], values["session"])
+        vars(state).update(values)
+        return state
+
+    def user_progress(self) -> Dict:
+        """The state in GameEngine.user_progress form"""
+        return {
+            "user": self.user,
+            "level": 1,
+            "score": self.score,
+            "completed": self.completed,
+            "time_spent": self.time_spent
+        }
+
+def latest_states(sessions: Dict[int, ProgressState]) -> Dict[str, ProgressState]:
+    """Each user's session with the most recent record"""
+    latest: Dict[str, ProgressState] = {}
+    for state in sessions.values():
+        best = latest.get(state.user)
+        if best is None or state.last_time >= best.last_time:
+            latest[state.user] = state
+    return latest
+
+def log_tail(path: str, offset: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(max(offset - CHECKPOINT_TAIL, 0))
+        return f.read(min(offset, CHECKPOINT_TAIL))
+
+def load_checkpoint(path: str) -> Tuple[int, Dict[int, ProgressState]]:
+    """The log offset and session states of the log's checkpoint, or (0, {}) if it has no usable one
+
+    A checkpoint is only used if the log still holds the bytes it was
+    taken after, so a log that was replaced or truncated is read in full.
+    """
+    try:
+        with open(path + CHECKPOINT_SUFFIX, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        offset = checkpoint["offset"]
+        if checkpoint["version"] != CHECKPOINT_VERSION or offset > os.path.getsize(path):
+            return 0, {}
+        if log_tail(path, offset) != bytes.fromhex(checkpoint["tail"]):
+            return 0, {}
+        states = (ProgressState.from_dict(values) for values in checkpoint["sessions"])
+        return offset, {state.session: state for state in states}
+    except (OSError, ValueError, KeyError, TypeError):
+        return 0, {}
+
+def save_checkpoint(path: str, offset: int, sessions: Dict[int, ProgressState]):
+    """Write the states of the log up to offset, replacing the old checkpoint in one rename
+
+    Every session with a record in the last ACTIVE_SECONDS is kept, since
+    it may still be writing, and of older ones only each user's latest.
+    """
+    newest = max((state.last_time for state in sessions.values()), default=0.0)
+    kept = {id(state) for state in latest_states(sessions).values()}
+    checkpoint = {
+        "version": CHECKPOINT_VERSION,
+        "offset": offset,
+        "tail": log_tail(path, offset).hex(),
+        "sessions": [state.as_dict() for state in sessions.values()
+                     if id(state) in kept or state.last_time >= newest - ACTIVE_SECONDS],
+    }
+    temporary = f"{path}{CHECKPOINT_SUFFIX}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(temporary, path + CHECKPOINT_SUFFIX)
+    except OSError:
+        # Only costs a longer recovery next time
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+
+def apply_record(sessions: Dict[int, ProgressState], record: EventRecord) -> bool:
+    """Advance the state of a record's session, False if the session is not known"""
+    if record.code == SESSION:
+        state = sessions[record.session] = ProgressState(record.values[0], record.session)
+        state.last_time = record.time
+        return True
+    state = sessions.get(record.session)
+    if state is None:
+        return False
+    state.apply(record)
+    return True
+
+def recover(path: str, save: bool = True) -> Dict[str, ProgressState]:
+    """Rebuild the latest state of each user from a log file
+
+    Replays the records written since the log's checkpoint on top of the
+    states saved in it, so startup reads only what is new rather than the
+    whole history. A session the checkpoint left out as idle that has
+    written again is rebuilt from the whole log. With save, a fresh
+    checkpoint is written afterwards.
+
+    When a user has several sessions in the log, the one with the most
+    recent record wins.
+    """
+    offset, sessions = load_checkpoint(path)
+    start = offset
+    missing = set()
+    for record, offset in scan_records(path, start):
+        if not apply_record(sessions, record):
+            missing.add(record.session)
+    if missing and start:
+        rebuilt: Dict[int, ProgressState] = {}
+        for record, end in scan_records(path):
+            if end > offset:
+                break  # Appended since, left for the next recovery like everything else
+            if record.session in missing:
+                apply_record(rebuilt, record)
+        sessions.update(rebuilt)
+    if save and offset > start:
+        save_checkpoint(path, offset, sessions)
+    return latest_states(sessions)
+
+class EventLog:
+    """Group-committing writer for the append-only event log
+
+    append only encodes a record into an in-memory batch; a background
+    thread writes each batch with a single O_APPEND write and one fsync,
+    either when batch_size records are waiting or flush_interval seconds
+    after the first one arrived. Many sessions (or several processes on the
+    same file) therefore share one fsync instead of paying one each.
+    Anything appended before a crash may be lost only if it had not been
+    flushed yet; what is on disk is always readable by read_records.
+
+    Every checkpoint_every records, and once close has everything on
+    disk, the background thread brings the log's checkpoint up to date, so
+    a long-running station's next startup only replays what was written
+    since. close does not wait for that last checkpoint; join thread to.
+    """
+
+    BATCH_SIZE = 256
+    FLUSH_INTERVAL = 0.2  # seconds
+    CHECKPOINT_EVERY = 10000  # records
+
+    def __init__(self, path: str, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL,
+                 checkpoint_every: int = CHECKPOINT_EVERY):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        self.unchecked = 0  # Records written since the last checkpoint
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+        self.fd = os.open(path, flags, 0o644)
+
+        self.pending: List[bytes] = []
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.closed = False
+        self.drained = threading.Event()  # Set once the thread has written everything appended before close
+        self.session_base = os.getpid() << 32  # Session keys stay unique across processes
+        self.session_count = 0
+        self.records_written = 0
+        self.batches_written = 0
+
+        self.thread = threading.Thread(target=self.run, name="event-log", daemon=True)
+        self.thread.start()
+
+    def new_session(self, user: str) -> int:
+        """Start a session for a user and get its key"""
+        with self.condition:
+            self.session_count += 1
+            session = self.session_base | self.session_count
+        self.append(SESSION, session, user)
+        return session
+
+    def append(self, code: int, session: int, *values, timestamp: Optional[float] = None):
+        """Queue one record for the next batch"""
+        record = encode_record(code, session, time.time() if timestamp is None else timestamp, *values)
+        with self.condition:
+            if self.closed:
+                raise ValueError("Event log is closed")
+            self.pending.append(record)
+            if len(self.pending) == 1 or len(self.pending) >= self.batch_size:
+                self.condition.notify()
+
+    def flush(self):
+        """Write and fsync everything appended so far, with one write and one fsync"""
+        # Holding write_lock while taking the batch keeps batches in append order
+        with self.write_lock:
+            with self.condition:
+                batch, self.pending = self.pending, []
+            if not batch:
+                return
+            view = memoryview(b"".join(batch))
+            while view:
+                written = os.write(self.fd, view)
+                view = view[written:]
+            sync(self.fd)
+            self.records_written += len(batch)
+            self.batches_written += 1
+            self.unchecked += len(batch)
+
+    def checkpoint(self):
+        """Save the states of everything written so far as the log's checkpoint"""
+        self.unchecked = 0
+        recover(self.path)
+
+    def run(self):
+        """Background loop committing batches"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if self.closed and not self.pending:
+                    break
+                # Give other sessions a chance to join this batch
+                deadline = time.monotonic() + self.flush_interval
+                while len(self.pending) < self.batch_size and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+            self.flush()
+            if self.unchecked >= self.checkpoint_every:
+                self.checkpoint()
+        self.drained.set()
+        if self.unchecked:
+            self.checkpoint()
+
+    def close(self):
+        """Write and fsync outstanding records and close the file, leaving the checkpoint to the thread"""
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify()
+        self.drained.wait()
+        os.close(self.fd)
+
+    def attach(self, engine) -> "SessionRecorder":
+        """Record a GameEngine's events under a new session for its user"""
+        recorder = SessionRecorder(self, engine)
+        engine.subscribe(recorder.on_engine_event)
+        return recorder
+
+class SessionRecorder:
+    """Turns one engine's events into event log records"""
+
+    def __init__(self, log: EventLog, engine):
+        self.log = log
+        self.engine = engine
+        self.session = log.new_session(engine.user_progress["user"])
+
+    def on_engine_event(self, event: str, data: Dict):
+        """Append the record for an engine event"""
+        log, session = self.log, self.session
+        if event == "game_started":
+            log.append(NEW_GAME, session)
+        elif event == "correct_placement":
+            log.append(CORRECT, session, data["number"], data["score"])
+            if data["block_complete"]:
+                log.append(BLOCK, session, len(self.engine.tower.blocks))
+        elif event == "incorrect_placement":
+            log.append(INCORRECT, session, data["number"], data["x"], data["y"])
+        elif event == "game_reset":
+            log.append(RESET, session)
+        elif event == "game_complete":
+            log.append(COMPLETE, session, data["score"], data["time_spent"])
+        elif event == "game_restored":
+            log.append(RESTORE, session, data["score"], data["tower_progress"], data["tower_blocks"],
+                       data["elapsed"], data["placed"])
+        elif event == "undo":
+            log.append(UNDO, session, data["score"], data["tower_progress"], data["tower_blocks"], data["returned"])
+        elif event == "redo":
+            log.append(REDO, session, data["score"], data["tower_progress"], data["tower_blocks"], data["placed"])
+
+    def detach(self):
+        """Stop recording this engine"""
+        self.engine.unsubscribe(self.on_engine_event)
+
+def restore_latest(engine, states: Dict[str, ProgressState]) -> bool:
+    """Resume the engine user's unfinished game, if the log has one"""
+    state = states.get(engine.user_progress["user"])
+    if state is None:
+        return False
+    if state.completed:
+        # The last game was finished, start a fresh one on the same tower
+        if not (state.tower_progress or state.tower_blocks):
+            return False
+        engine.restore(0, [], state.tower_progress, state.tower_blocks)
+    elif state.placed or state.tower_progress or state.tower_blocks:
+        engine.restore(state.score, state.placed, state.tower_progress, state.tower_blocks, state.elapsed)
+    else:
+        return False
+    return True
@@ -0,0 +1,55 @@
+"""
+Shared fonts for the Hour Tower canvas
+"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from .per_canvas import PerCanvas
+
+class FontBook(PerCanvas):
+    """Resolves each game font once and hands out the shared Font object
+
+    Passing a ("Permanent Marker", 20, "bold") tuple to create_text makes Tk
+    parse the description and look the family up again for every item. A
+    named Font is resolved once and shared by every item that uses it.
+    The offscreen canvas makes its own stand-in fonts, and without either
+    the plain tuple is returned instead.
+    
+    Sizes are given for the 800x600 design layout. set_scale resizes every
+    Font in place, which redraws all the text using it without touching the
+    items.
+    """
+
+    FAMILY = "Permanent Marker"
+
+    def __init__(self, master=None, family: str = FAMILY):
+        self.master = master
+        self.family = family
+        self.scale = 1.0
+        self.fonts = {}
+
+    def get(self, size: int, weight: str = "bold"):
+        """Get the game font at a size"""
+        key = (size, weight)
+        font = self.fonts.get(key)
+        if font is None:
+            if isinstance(self.master, tk.Misc):
+                font = tkfont.Font(root=self.master, family=self.family, size=self.scaled(size), weight=weight)
+            elif hasattr(self.master, "create_font"):
+                font = self.master.create_font(self.family, self.scaled(size), weight)
+            else:
+                font = (self.family, self.scaled(size), weight)
+            self.fonts[key] = font
+        return font
+    
+    def scaled(self, size: int) -> int:
+        return max(1, round(size * self.scale))
+    
+    def set_scale(self, scale: float):
+        """Resize every font for a layout scale"""
+        self.scale = scale
+        for (size, weight), font in self.fonts.items():
+            if not isinstance(font, tuple):
+                font.configure(size=self.scaled(size))
+            else:
+                self.fonts[size, weight] = (self.family, self.scaled(size), weight)
@@ -2,146 +2,164 @@
 Game logic and state management for Hour Tower
 """
 
-import random
-import math
 import time
-from typing import List, Tuple
-from .colors import NeonColors
+from typing import Callable, Dict, List, Optional
 from .clock_number import ClockNumber
+from .engine import GameEngine
+from .item_pool import ItemPool
 
 class GameLogic:
-    """Handles game logic and state management"""
-    
-    def __init__(self, canvas, clock_face, tower, sound_effects, message_display):
+    """Connects the headless GameEngine to the tkinter components"""
+
+    def __init__(self, canvas, clock_face, tower, sound_effects, message_display,
+                 user: str = "player_name", seed: Optional[int] = None,
+                 clock: Callable[[], float] = time.time):
         self.canvas = canvas
         self.clock_face = clock_face
         self.tower = tower
         self.sound_effects = sound_effects
         self.message_display = message_display
-        
-        self.numbers = []
-        self.original_positions = []
-        self.score = 0
-        self.game_complete = False
-        self.start_time = time.time()
-        
-        # User progress dictionary
-        self.user_progress = {
-            "user": "player_name",
-            "level": 1,
-            "score": 0,
-            "completed": False,
-            "time_spent": 0.0
-        }
-    
-    def start_new_game(self):
-        """Start a new game with random number placement"""
+
+        # All rules and state live in the engine, this class only renders them
+        self.engine = GameEngine(clock_face.board, tower.state, seed=seed, user=user, clock=clock)
+        self.engine.subscribe(self.on_engine_event)
+
+        self.numbers: Dict[int, ClockNumber] = {}  # Draggable numbers by their number
+        self.item_pool = ItemPool(canvas)  # Number items are recycled between rounds
+        self.drag_target = None  # The number currently being dragged, if any
+        self.recorder = None  # Optional InputRecorder capturing the player's inputs
+
+    @property
+    def score(self) -> int:
+        return self.engine.score
+
+    @property
+    def game_complete(self) -> bool:
+        return self.engine.game_complete
+
+    @property
+    def user_progress(self) -> Dict:
+        return self.engine.user_progress
+
+    def on_engine_event(self, event: str, data: Dict):
+        """Update the canvas after an engine state change"""
+        if event == "game_started":
+            self.show_pieces(data["pieces"])
+
+        elif event == "game_restored":
+            self.clock_face.reset()
+            for number in data["placed"]:
+                self.clock_face.place_number(number)
+            self.tower.sync()
+            self.show_pieces(data["pieces"])
+
+        elif event == "game_reset":
+            self.clock_face.reset()
+            self.tower.sync()
+
+        elif event == "correct_placement":
+            self.clock_face.place_number(data["number"])
+
+            # Remove from draggable numbers
+            number = self.numbers.pop(data["number"], None)
+            if number is not None:
+                number.remove()
+
+            self.tower.sync()
+            self.sound_effects.play_success()
+            self.message_display.show_success("Great Job!")
+
+        elif event in ("undo", "redo"):
+            # Only the numbers that changed are redrawn
+            for number in data["returned"]:
+                self.clock_face.unplace_number(number)
+            for number in data["placed"]:
+                self.clock_face.place_number(number)
+                clock_number = self.numbers.pop(number, None)
+                if clock_number is not None:
+                    if clock_number is self.drag_target:
+                        self.drag_target = None
+                    clock_number.remove()
+            for piece in data["pieces"]:
+                self.show_piece(piece)
+            self.tower.sync()
+
+        elif event == "incorrect_placement":
+            self.clock_face.wiggle_hands()
+            number = self.numbers.get(data["number"])
+            if number is not None:
+                number.bounce_back(*data["home"])
+            self.sound_effects.play_error()
+            self.message_display.show_error()
+
+        elif event == "game_complete":
+            self.sound_effects.play_victory()
+            self.message_display.show_victory()
+
+    def show_pieces(self, pieces):
+        """Replace the draggable numbers with new ones for each piece"""
         # Clear existing numbers
-        for number in self.numbers:
+        for number in self.numbers.values():
             number.remove()
         self.numbers.clear()
-        self.original_positions.clear()
-        
-        # Reset game state
-        self.score = 0
-        self.game_complete = False
-        self.start_time = time.time()
-        self.user_progress["score"] = 0
-        self.user_progress["completed"] = False
-        self.user_progress["time_spent"] = 0.0
-        
-        # Get clock center for positioning numbers
-        cx = self.clock_face.center_x
-        cy = self.clock_face.center_y
-
-        # Create random positions for numbers 1-12
-        colors = NeonColors.get_neon_palette()
-        for i in range(12):
-            # Random position around the clock, ensuring visibility
-            is_valid_position = False
-            x, y = 0, 0
-            while not is_valid_position:
-                angle = random.uniform(0, 2 * math.pi)
-                distance = random.uniform(220, 260) 
-                x = cx + distance * math.cos(angle)
-                y = cy + distance * math.sin(angle)
-                
-                # Check if the position is valid (not overlapping tower or buttons)
-                if x > 30 and x < 570 and y > 80 and y < 480:
-                    is_valid_position = True
-            
-            color = NeonColors.get_color_by_index(i)
-            number = ClockNumber(self.canvas, i + 1, x, y, color)
-            self.numbers.append(number)
-            self.original_positions.append((x, y))
-    
+        self.drag_target = None
+
+        for piece in pieces:
+            self.show_piece(piece)
+
+    def show_piece(self, piece):
+        """Draw a draggable number for a piece"""
+        self.numbers[piece.number] = ClockNumber(self.canvas, piece.number, piece.x, piece.y, piece.color,
+                                                 on_grab=self.set_drag_target, pool=self.item_pool)
+
+    def rescale(self):
+        """Redraw the draggable numbers after the layout scale changed"""
+        for number in self.numbers.values():
+            number.rescale()
+
+    def set_drag_target(self, number: ClockNumber):
+        """Remember which number the player picked up"""
+        self.drag_target = number
+        if self.recorder is not None:
+            self.recorder.press(number.number, number.x + number.drag_offset_x,
+                                number.y + number.drag_offset_y, (number.x, number.y))
+
+    def start_new_game(self):
+        """Start a new game with random number placement"""
+        self.engine.start_new_game()
+
     def handle_number_placement(self, number: ClockNumber, x: int, y: int) -> bool:
         """Handle placing a number on the clock"""
-        # Check if number is placed correctly
-        if self.clock_face.check_placement(number.number, x, y):
-            # Correct placement
-            if self.clock_face.place_number(number.number, x, y):
-                # Remove from draggable numbers
-                index = self.numbers.index(number)
-                number.remove()
-                self.numbers.pop(index)
-                self.original_positions.pop(index)
-                
-                # Update score and progress
-                self.score += 10
-                self.user_progress["score"] = self.score
-                self.tower.add_progress()
-                
-                # Play success sound
-                self.sound_effects.play_success()
-                
-                # Show success message
-                self.message_display.show_success("Great Job!")
-                
-                # Check if game is complete
-                if len(self.numbers) == 0:
-                    self.game_complete = True
-                    self.user_progress["completed"] = True
-                    self.user_progress["time_spent"] = time.time() - self.start_time
-                    self.sound_effects.play_victory()
-                    self.message_display.show_victory()
-                
-                return True
-        else:
-            # Incorrect placement
-            self.clock_face.wiggle_hands()
-            index = self.numbers.index(number)
-            number.bounce_back(self.original_positions[index][0], self.original_positions[index][1])
-            self.sound_effects.play_error()
-            self.message_display.show_error()
-            return False
-    
+        return self.engine.handle_number_placement(number.number, x, y)
+
     def reset_game(self):
         """Reset the game to initial state"""
-        self.score = 0
-        self.game_complete = False
-        
-        # Reset clock face
-        self.clock_face.reset()
-        
-        # Reset tower
-        self.tower.reset()
-        
-        # Start new game
-        self.start_new_game()
-    
+        self.engine.reset_game()
+
+    def undo(self) -> bool:
+        """Take back the last correct placement"""
+        return self.engine.undo()
+
+    def redo(self) -> bool:
+        """Put back the last undone placement"""
+        return self.engine.redo()
+
     def get_score(self) -> int:
         """Get current score"""
         return self.score
-    
+
     def is_game_complete(self) -> bool:
         """Check if game is complete"""
         return self.game_complete
-    
+
     def get_remaining_numbers(self) -> int:
         """Get number of remaining numbers to place"""
-        return len(self.numbers)
-    
+        return self.engine.get_remaining_numbers()
+
     def get_numbers(self) -> List[ClockNumber]:
         """Get list of current draggable numbers"""
-        return self.numbers.copy() 
\ No newline at end of file
+        return list(self.numbers.values())
+
+    def get_number(self, number: int) -> Optional[ClockNumber]:
+        """Get the draggable number for a number, if it has not been placed"""
+        return self.numbers.get(number)
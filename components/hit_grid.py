@@ -0,0 +1,153 @@
+"""
+Pointer hit-testing for the Hour Tower canvas
+"""
+
+import tkinter as tk
+from typing import Callable, Dict, Optional, Set, Tuple
+from .layout import Layout
+from .per_canvas import PerCanvas
+
+Box = Tuple[float, float, float, float]
+
+class HitTarget:
+    """A pressable box, or the circle inside it, and what to call when it is pressed"""
+
+    def __init__(self, box: Box, on_press: Callable, z: int, tag: Optional[str] = None, circle: bool = False):
+        self.box = box
+        self.on_press = on_press
+        self.z = z
+        self.tag = tag
+        self.circle = circle
+        self.cells: Tuple[int, int, int, int] = (0, 0, -1, -1)  # Column and row range it is filed in
+
+class HitGrid(PerCanvas):
+    """Resolves presses with one canvas binding instead of tag_bind on every item
+
+    Draggable numbers and buttons register a box in design coordinates
+    with a press callback. Boxes are filed in the cells of a uniform grid,
+    so a press only looks at the few targets sharing its cell however many
+    are on the board. Moving a target refiles it only when it crosses into
+    other cells.
+
+    Targets stack like canvas items: a new target, or one raised with lift,
+    is on top, and the press goes to the topmost box containing the point.
+    A target registered with the tag of its items only takes the press if
+    no other item, such as a message or the metrics overlay, is drawn over
+    them at that point, as with tag_bind.
+    """
+
+    CELL_SIZE = 64
+
+    @classmethod
+    def create_for(cls, canvas: tk.Canvas) -> "HitGrid":
+        """Make the hit grid for a canvas and bind its press handler"""
+        grid = cls(canvas)
+        canvas.bind("<Button-1>", grid.on_press, add="+")
+        return grid
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.layout = Layout.for_canvas(canvas)
+        self.targets: Dict[object, HitTarget] = {}
+        self.cells: Dict[Tuple[int, int], Set[object]] = {}
+        self.tags: Set[str] = set()
+        self.top = 0
+        self.presses = 0
+        self.refiled = 0
+
+    def cell_range(self, box: Box) -> Tuple[int, int, int, int]:
+        size = self.CELL_SIZE
+        return int(box[0] // size), int(box[1] // size), int(box[2] // size), int(box[3] // size)
+
+    def refile(self, owner, target: HitTarget, cells: Tuple[int, int, int, int]):
+        """Move a target from the cells it is in to a new range of cells"""
+        column0, row0, column1, row1 = target.cells
+        for column in range(column0, column1 + 1):
+            for row in range(row0, row1 + 1):
+                cell = self.cells[(column, row)]
+                cell.discard(owner)
+                if not cell:
+                    del self.cells[(column, row)]
+        column0, row0, column1, row1 = target.cells = cells
+        for column in range(column0, column1 + 1):
+            for row in range(row0, row1 + 1):
+                self.cells.setdefault((column, row), set()).add(owner)
+        self.refiled += 1
+
+    def add(self, owner, box: Box, on_press: Callable, tag: Optional[str] = None, circle: bool = False):
+        """Register a box (x0, y0, x1, y1) on top of every other target, replacing owner's old one
+
+        tag is the canvas tag of the target's items, circle makes only the
+        circle filling the box pressable.
+        """
+        self.remove(owner)
+        self.top += 1
+        target = self.targets[owner] = HitTarget(box, on_press, self.top, tag, circle)
+        if tag is not None:
+            self.tags.add(tag)
+        self.refile(owner, target, self.cell_range(box))
+
+    def move(self, owner, box: Box):
+        """Update a target's box after it moved"""
+        target = self.targets.get(owner)
+        if target is None:
+            return
+        target.box = box
+        cells = self.cell_range(box)
+        if cells != target.cells:
+            self.refile(owner, target, cells)
+
+    def lift(self, owner):
+        """Put a target above every other one, as tag_raise does for its items"""
+        target = self.targets.get(owner)
+        if target is not None:
+            self.top += 1
+            target.z = self.top
+
+    def remove(self, owner):
+        """Stop a target from taking presses"""
+        target = self.targets.pop(owner, None)
+        if target is not None:
+            self.tags.discard(target.tag)
+            self.refile(owner, target, (0, 0, -1, -1))
+
+    def target_at(self, x: float, y: float) -> Optional[object]:
+        """Get the topmost target whose box contains a design point"""
+        candidates = self.cells.get((int(x // self.CELL_SIZE), int(y // self.CELL_SIZE)))
+        if not candidates:
+            return None
+        found = None
+        found_z = 0
+        for owner in candidates:
+            target = self.targets[owner]
+            if target.z > found_z and self.contains(target, x, y):
+                found, found_z = owner, target.z
+        return found
+
+    @staticmethod
+    def contains(target: HitTarget, x: float, y: float) -> bool:
+        x0, y0, x1, y1 = target.box
+        if target.circle:
+            radius = (x1 - x0) / 2
+            return (x - x0 - radius) ** 2 + (y - (y0 + y1) / 2) ** 2 <= radius * radius
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+    def covered(self, owner, x: int, y: int) -> bool:
+        """Whether an item that is not a target is drawn over owner's items at a canvas point"""
+        tag = self.targets[owner].tag
+        if tag is None:
+            return False
+        for item in reversed(self.canvas.find_overlapping(x, y, x, y)):
+            tags = self.canvas.gettags(item)
+            if tag in tags:
+                return False
+            if self.tags.isdisjoint(tags):
+                return True
+        return False
+
+    def on_press(self, event):
+        """Canvas <Button-1> handler"""
+        owner = self.target_at(*self.layout.to_design(event.x, event.y))
+        if owner is not None and not self.covered(owner, event.x, event.y):
+            self.presses += 1
+            self.targets[owner].on_press(event)
@@ -0,0 +1,44 @@
+"""
+Reusable canvas item pool
+"""
+
+import tkinter as tk
+from typing import Dict, List
+from .layout import Layout
+
+class ItemPool:
+    """Hands out hidden canvas items instead of creating and deleting them
+
+    Released items are hidden and kept per role (for example "number_glow").
+    Items are only reused for the same role, so options and bindings that a
+    caller does not set again carry over unchanged. Canvas item ids stop
+    growing once the pool has warmed up.
+    """
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.layout = Layout.for_canvas(canvas)
+        self.free: Dict[str, List[int]] = {}
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, role: str, kind: str, coords, **options) -> int:
+        """Get a visible item for a role, of a type ("oval", "rectangle", "text", ...)"""
+        free = self.free.get(role)
+        options.setdefault("tags", ())
+        coords = self.layout.to_screen(*coords)
+        if free:
+            item = free.pop()
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfig(item, state=tk.NORMAL, **options)
+            self.reused += 1
+            return item
+
+        create = getattr(self.canvas, f"create_{kind}")
+        self.created += 1
+        return create(*coords, **options)
+
+    def release(self, role: str, item: int):
+        """Hide an item and keep it for reuse"""
+        self.canvas.itemconfig(item, state=tk.HIDDEN, tags=())
+        self.free.setdefault(role, []).append(item)
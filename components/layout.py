@@ -0,0 +1,97 @@
+"""
+Resolution-independent layout for the Hour Tower canvas
+"""
+
+import tkinter as tk
+from typing import List, Tuple
+from .fonts import FontBook
+from .per_canvas import PerCanvas
+from .sprites import SpriteCache
+
+class Layout(PerCanvas):
+    """Maps the 800x600 design space the game is laid out in onto the window
+
+    Every component keeps its geometry, and the engine its board, in design
+    coordinates. The canvas shows them scaled uniformly to fit the window
+    and centered in it. Pointer events are mapped back with to_design, and
+    items created or moved after startup map their coordinates with
+    to_screen (the UpdateQueue and ItemPool do this for their callers).
+
+    On a resize every existing item is moved with one canvas.scale and one
+    canvas.move on the "all" tag instead of rebuilding the scene. Fonts
+    are resized in place and the components registered with watch redraw
+    their sprites at the new size. Configure events arrive continuously
+    while the window is dragged, so the resize is applied once the size has
+    been stable for RESIZE_DEBOUNCE_MS.
+    """
+
+    DESIGN_WIDTH = 800
+    DESIGN_HEIGHT = 600
+    RESIZE_DEBOUNCE_MS = 120
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.scale = 1.0
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.watchers = []  # Components with a rescale() method
+        self.after_id = None
+        self.pending_size = None
+        self.resizes = 0
+
+    def watch(self, *components):
+        """Have components redraw their sprites after each resize"""
+        self.watchers.extend(components)
+
+    def to_screen(self, *coords) -> List[float]:
+        """Map flat design coordinates (x0, y0, x1, y1, ...) to canvas coordinates"""
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        if self.scale == 1.0 and not self.offset_x and not self.offset_y:
+            return list(coords)
+        scale = self.scale
+        return [value * scale + (self.offset_x if i % 2 == 0 else self.offset_y)
+                for i, value in enumerate(coords)]
+
+    def to_design(self, x: float, y: float) -> Tuple[float, float]:
+        """Map a canvas point, such as a pointer event, to design coordinates"""
+        return (x - self.offset_x) / self.scale, (y - self.offset_y) / self.scale
+
+    def on_configure(self, event):
+        """Canvas <Configure> handler, waits for the size to settle before resizing"""
+        self.pending_size = (event.width, event.height)
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+        self.after_id = self.canvas.after(self.RESIZE_DEBOUNCE_MS, self.apply_pending)
+
+    def apply_pending(self):
+        self.after_id = None
+        if self.pending_size is not None:
+            self.resize(*self.pending_size)
+
+    def resize(self, width: int, height: int) -> bool:
+        """Fit the design space to a canvas size, returns False if nothing changed"""
+        scale = min(width / self.DESIGN_WIDTH, height / self.DESIGN_HEIGHT)
+        offset_x = (width - self.DESIGN_WIDTH * scale) / 2
+        offset_y = (height - self.DESIGN_HEIGHT * scale) / 2
+        if (abs(scale - self.scale) < 1e-4 and abs(offset_x - self.offset_x) < 0.5
+                and abs(offset_y - self.offset_y) < 0.5):
+            return False
+
+        # screen = design * scale + offset, so the old screen position is
+        # scaled by the ratio and then shifted to the new offset
+        ratio = scale / self.scale
+        if ratio != 1.0:
+            self.canvas.scale("all", 0, 0, ratio, ratio)
+        self.canvas.move("all", offset_x - self.offset_x * ratio, offset_y - self.offset_y * ratio)
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+        if ratio != 1.0:
+            self.scale = scale
+            FontBook.for_canvas(self.canvas).set_scale(scale)
+            SpriteCache.for_canvas(self.canvas).scale = scale
+            for component in self.watchers:
+                component.rescale()
+        self.resizes += 1
+        return True
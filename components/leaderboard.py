@@ -0,0 +1,216 @@
+"""
+Shared-memory leaderboard for kiosk stations running on one machine
+"""
+
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional
+from .engine import GameEngine
+
+MAGIC = b"HTLB"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sII")  # Magic, format version, number of stations
+CLOSING = struct.Struct("<I")  # Set by the launcher to ask every station to quit
+CLOSING_OFFSET = HEADER.size
+CREATOR = struct.Struct("<I")  # Process id of the launcher, to tell a live segment from a crashed one's
+CREATOR_OFFSET = CLOSING_OFFSET + CLOSING.size
+HEADER_SIZE = 64
+SEQUENCE = struct.Struct("<I")
+# user, score, completed, games completed, time_spent, best time, last update; a record fills a cache line
+BODY = struct.Struct("<24siBIddd3x")
+RECORD_SIZE = SEQUENCE.size + BODY.size
+
+def attach(name: str) -> shared_memory.SharedMemory:
+    """Open an existing segment without registering it with this process's resource tracker"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    segment = shared_memory.SharedMemory(name)
+    # A process started by multiprocessing shares its parent's tracker, where registering
+    # again changes nothing and unregistering would drop the creator's own registration
+    if multiprocessing.parent_process() is None:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+def process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        return True  # Windows frees a segment with its last handle, so one that exists is in use
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+Standing = namedtuple("Standing", "station user score completed games time_spent best_time updated")
+
+class Leaderboard:
+    """Scores and completion times of every station, in one shared-memory segment
+
+    Each station owns one fixed-size record and is its only writer, so
+    no lock is taken. A record starts with a sequence number that is odd
+    while it is being written: readers copy the record and retry if the
+    sequence was odd or changed meanwhile. Records are read with struct
+    straight from the mapped memory, with no pickling or pipes, so a
+    display can poll every station several times a second.
+
+    The process that creates the segment unlinks it when it closes and
+    is the only one registering it with the resource tracker; other
+    processes only open it. A segment left behind by a launcher that
+    crashed is removed when the next one is created.
+    """
+
+    READ_RETRIES = 100
+
+    def __init__(self, segment: shared_memory.SharedMemory, owner: bool):
+        self.segment = segment
+        self.owner = owner
+        magic, version, self.stations = HEADER.unpack_from(segment.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{segment.name} is not a Hour Tower leaderboard")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"{segment.name} needs a newer version of the game (format {version})")
+
+    @classmethod
+    def create(cls, stations: int, name: Optional[str] = None) -> "Leaderboard":
+        """Make a new, empty leaderboard segment
+
+        Raises FileExistsError if a running launcher already uses the name.
+        """
+        size = HEADER_SIZE + stations * RECORD_SIZE
+        try:
+            segment = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            if name is None:
+                raise
+            cls.remove_stale(name)
+            segment = shared_memory.SharedMemory(name, create=True, size=size)
+        segment.buf[:segment.size] = bytes(segment.size)  # Some platforms round up and leave garbage
+        HEADER.pack_into(segment.buf, 0, MAGIC, FORMAT_VERSION, stations)
+        CREATOR.pack_into(segment.buf, CREATOR_OFFSET, os.getpid())
+        return cls(segment, owner=True)
+
+    @staticmethod
+    def remove_stale(name: str):
+        """Unlink a segment whose creator has exited, raise FileExistsError if it is still running"""
+        segment = attach(name)
+        creator = 0
+        if segment.size >= HEADER_SIZE and HEADER.unpack_from(segment.buf, 0)[0] == MAGIC:
+            creator = CREATOR.unpack_from(segment.buf, CREATOR_OFFSET)[0]
+        segment.close()
+        if process_alive(creator):
+            raise FileExistsError(f"leaderboard {name} is in use by process {creator}")
+        # Opened tracked this time, as unlinking also unregisters it
+        stale = shared_memory.SharedMemory(name)
+        stale.close()
+        stale.unlink()
+
+    @classmethod
+    def open(cls, name: str) -> "Leaderboard":
+        """Open a segment made by another process
+
+        The segment is not registered with this process's resource
+        tracker, so exiting never unlinks it from under its creator.
+        """
+        return cls(attach(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.segment.name
+
+    @property
+    def closing(self) -> bool:
+        return bool(CLOSING.unpack_from(self.segment.buf, CLOSING_OFFSET)[0])
+
+    def request_close(self):
+        """Ask every station to quit, they check closing on a timer"""
+        CLOSING.pack_into(self.segment.buf, CLOSING_OFFSET, 1)
+
+    def offset(self, station: int) -> int:
+        if not 0 <= station < self.stations:
+            raise IndexError(f"station {station} is not on a {self.stations} station leaderboard")
+        return HEADER_SIZE + station * RECORD_SIZE
+
+    def write(self, station: int, user: str, score: int, completed: bool, games: int,
+              time_spent: float, best_time: float):
+        """Update a station's record, only ever called by that station"""
+        buf = self.segment.buf
+        offset = self.offset(station)
+        sequence = SEQUENCE.unpack_from(buf, offset)[0]
+        SEQUENCE.pack_into(buf, offset, (sequence + 1) & 0xFFFFFFFF)
+        BODY.pack_into(buf, offset + SEQUENCE.size, user.encode("utf-8")[:24], score, completed, games,
+                       time_spent, best_time, time.time())
+        SEQUENCE.pack_into(buf, offset, (sequence + 2) & 0xFFFFFFFF)
+
+    def read(self, station: int) -> Optional[Standing]:
+        """A consistent copy of a station's record, None if it never wrote one or kept changing"""
+        buf = self.segment.buf
+        offset = self.offset(station)
+        for _ in range(self.READ_RETRIES):
+            before = SEQUENCE.unpack_from(buf, offset)[0]
+            if before & 1:
+                continue
+            body = BODY.unpack_from(buf, offset + SEQUENCE.size)
+            if SEQUENCE.unpack_from(buf, offset)[0] != before:
+                continue
+            if not before:
+                return None
+            user, score, completed, games, time_spent, best_time, updated = body
+            return Standing(station, user.rstrip(b"\0").decode("utf-8", "replace"), score, bool(completed),
+                            games, time_spent, best_time, updated)
+        return None
+
+    def standings(self) -> List[Standing]:
+        """Every station that has played, best first: most games, then highest score, then fastest"""
+        standings = [standing for standing in map(self.read, range(self.stations)) if standing is not None]
+        standings.sort(key=lambda s: (-s.games, -s.score, s.best_time or float("inf")))
+        return standings
+
+    def publish(self, station: int, engine: GameEngine) -> "StationPublisher":
+        """Keep a station's record up to date with an engine's user_progress"""
+        return StationPublisher(self, station, engine)
+
+    def close(self):
+        """Unmap the segment, and remove it if this process created it"""
+        self.segment.close()
+        if self.owner:
+            self.segment.unlink()
+
+class StationPublisher:
+    """Writes one engine's score, completion and time to its leaderboard record"""
+
+    EVENTS = ("game_started", "game_reset", "game_restored", "correct_placement", "game_complete", "undo", "redo")
+
+    def __init__(self, leaderboard: Leaderboard, station: int, engine: GameEngine):
+        self.leaderboard = leaderboard
+        self.station = station
+        self.engine = engine
+        self.games = 0
+        self.best_time = 0.0
+        engine.subscribe(self.on_engine_event)
+        self.write()
+
+    def on_engine_event(self, event: str, data: Dict):
+        if event == "game_complete":
+            self.games += 1
+            if not self.best_time or data["time_spent"] < self.best_time:
+                self.best_time = data["time_spent"]
+        if event in self.EVENTS:
+            self.write()
+
+    def write(self):
+        progress = self.engine.user_progress
+        self.leaderboard.write(self.station, progress["user"], progress["score"], progress["completed"],
+                               self.games, progress["time_spent"], self.best_time)
+
+    def close(self):
+        """Stop publishing the engine"""
+        self.engine.unsubscribe(self.on_engine_event)
@@ -0,0 +1,190 @@
+"""
+Runtime metrics for a long-running game
+"""
+
+import contextlib
+import json
+import os
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+from .per_canvas import PerCanvas
+
+class Timer:
+    """Durations of one kind of work: totals since start, percentiles over the recent ones"""
+
+    RECENT = 512
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=self.RECENT)
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def summary(self) -> Dict:
+        """Count, mean and worst in ms, with percentiles of the recent samples"""
+        if not self.count:
+            return {"count": 0}
+        recent = sorted(self.recent)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3),
+            "p50_ms": round(recent[len(recent) // 2] * 1000, 3),
+            "p95_ms": round(recent[min(int(len(recent) * 0.95), len(recent) - 1)] * 1000, 3),
+            "recent_max_ms": round(recent[-1] * 1000, 3),
+            "max_ms": round(self.max * 1000, 3)
+        }
+
+class Metrics(PerCanvas):
+    """Registry of handler timings, gauges and event rates for one canvas
+
+    Everything is bounded: timers keep totals plus a fixed window of recent
+    samples, and rates only remember the last minute of events, so the
+    registry can stay on for months of kiosk uptime.
+    """
+
+    RATE_WINDOW = 60.0  # seconds
+
+    @classmethod
+    def create_for(cls, canvas) -> "Metrics":
+        return cls()
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.started_at = clock()
+        self.timers: Dict[str, Timer] = {}
+        self.gauges: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+        self.rate_events: Dict[str, deque] = {}
+
+    def record(self, name: str, seconds: float):
+        """Add one duration to a timer"""
+        timer = self.timers.get(name)
+        if timer is None:
+            timer = self.timers[name] = Timer()
+        timer.add(seconds)
+
+    @contextlib.contextmanager
+    def timed(self, name: str):
+        """Time the body of a with block"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.record(name, self.clock() - start)
+
+    def set_gauge(self, name: str, value: float):
+        """Set a value sampled from the outside, such as an item count"""
+        self.gauges[name] = value
+
+    def count(self, name: str, amount: int = 1):
+        """Add to a counter and remember when, for its per-minute rate"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+        events = self.rate_events.get(name)
+        if events is None:
+            events = self.rate_events[name] = deque()
+        events.append(self.clock())
+        self.trim(events)
+
+    def trim(self, events: deque):
+        """Forget events older than the rate window"""
+        horizon = self.clock() - self.RATE_WINDOW
+        while events and events[0] < horizon:
+            events.popleft()
+
+    def per_minute(self, name: str) -> float:
+        """Events of a counter over the last minute"""
+        events = self.rate_events.get(name)
+        if not events:
+            return 0.0
+        self.trim(events)
+        return len(events) * 60.0 / self.RATE_WINDOW
+
+    def on_engine_event(self, event: str, data: Dict):
+        """Count placements from a GameEngine subscription"""
+        if event in ("correct_placement", "incorrect_placement"):
+            self.count("placements")
+            self.count(event)
+        elif event == "game_complete":
+            self.count("games_completed")
+
+    def sample_canvas(self, canvas):
+        """Sample the live item count and the pending after callbacks of a canvas"""
+        self.set_gauge("canvas_items", len(canvas.find_all()))
+        self.set_gauge("pending_after", len(canvas.tk.splitlist(canvas.tk.call("after", "info"))))
+
+    def snapshot(self) -> Dict:
+        """Everything recorded so far, as plain data"""
+        return {
+            "time": time.time(),
+            "uptime_s": round(self.clock() - self.started_at, 1),
+            "timers": {name: timer.summary() for name, timer in self.timers.items()},
+            "gauges": dict(self.gauges),
+            "counters": dict(self.counters),
+            "per_minute": {name: round(self.per_minute(name), 2) for name in self.rate_events}
+        }
+
+class MetricsMonitor:
+    """Samples the canvas on a slow timer, refreshes the overlay and dumps snapshots
+
+    Snapshots are appended as JSON lines; once the file passes MAX_DUMP_BYTES
+    it is moved aside to "<path>.1" and a new one is started.
+    """
+
+    SAMPLE_MS = 1000
+    DUMP_EVERY = 60  # samples
+    MAX_DUMP_BYTES = 5 * 1024 * 1024
+
+    def __init__(self, canvas, metrics: Metrics, dump_path: Optional[str] = None, overlay=None):
+        self.canvas = canvas
+        self.metrics = metrics
+        self.dump_path = dump_path
+        self.overlay = overlay
+        self.after_id = None
+        self.samples = 0
+
+    def start(self):
+        """Start sampling"""
+        if self.after_id is None:
+            self.after_id = self.canvas.after(self.SAMPLE_MS, self.tick)
+
+    def stop(self, dump: bool = True):
+        """Stop sampling, writing one last snapshot unless dump is False"""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        if dump:
+            self.dump()
+
+    def tick(self):
+        """Take one sample"""
+        self.after_id = None
+        with self.metrics.timed("metrics_sample"):
+            self.metrics.sample_canvas(self.canvas)
+            self.samples += 1
+            if self.overlay is not None and self.overlay.visible:
+                self.overlay.update(self.metrics.snapshot())
+            if self.samples % self.DUMP_EVERY == 0:
+                self.dump()
+        self.start()
+
+    def dump(self):
+        """Append a snapshot to the dump file"""
+        if self.dump_path is None:
+            return
+        try:
+            directory = os.path.dirname(os.path.abspath(self.dump_path))
+            os.makedirs(directory, exist_ok=True)
+            if os.path.exists(self.dump_path) and os.path.getsize(self.dump_path) > self.MAX_DUMP_BYTES:
+                os.replace(self.dump_path, f"{self.dump_path}.1")
+            with open(self.dump_path, "a") as f:
+                f.write(json.dumps(self.metrics.snapshot()) + "\n")
+        except OSError as e:
+            print(f"Could not write metrics to {self.dump_path}: {e}")
@@ -0,0 +1,409 @@
+"""
+In-memory canvas and software rendering of the Hour Tower scene
+"""
+
+import itertools
+import math
+import tkinter as tk
+from collections import Counter, OrderedDict
+from typing import Dict, List, Tuple
+from .bitmap_font import GLYPH_HEIGHT, GLYPH_WIDTH, glyph_runs, text_layout, text_size
+from .colors import NeonColors
+from .raster import Raster, Stamp
+
+class StubTk:
+    """The few raw Tcl commands the game runs through canvas.tk"""
+
+    def __init__(self, canvas: "OffscreenCanvas"):
+        self.canvas = canvas
+
+    def call(self, *args):
+        if args == ("after", "info"):
+            return tuple(self.canvas.pending_after)
+        raise NotImplementedError(f"Tcl command not emulated: {args}")
+
+    def splitlist(self, value):
+        return tuple(value)
+
+class OffscreenFont:
+    """Stands in for a named tkfont.Font, so resizing it resizes the text drawn with it"""
+
+    def __init__(self, family: str, size: int, weight: str = "normal"):
+        self.options = {"family": family, "size": size, "weight": weight}
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def cget(self, option: str):
+        return self.options[option]
+
+class OffscreenCanvas:
+    """Keeps canvas items in memory and counts every call made on it
+
+    Only the parts of the Canvas API the game uses are implemented. Items are
+    dicts of their coords, options and tags; tags and item ids are resolved
+    the way Tk does, with "all" matching every item. Components draw on it
+    exactly as on a tk.Canvas, and a SceneRenderer turns what they drew into
+    pixels. The benchmarks use the call counts as the canvas work an
+    operation costs.
+    """
+
+    def __init__(self, width: int = 800, height: int = 600, background: str = NeonColors.BLACK):
+        self.width = width
+        self.height = height
+        self.background = background
+        self.items = {}
+        self.order = []  # Stacking order, bottom first
+        self.ids = itertools.count(1)
+        self.calls = Counter()
+        self.pending_after = {}
+        self.after_ids = itertools.count(1)
+        self.tk = StubTk(self)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_counts(self):
+        self.calls.clear()
+
+    def find(self, tag_or_id):
+        """Get the ids matching an item id or tag, in stacking order"""
+        if isinstance(tag_or_id, int):
+            return [tag_or_id] if tag_or_id in self.items else []
+        if tag_or_id == "all":
+            return list(self.order)
+        return [i for i in self.order if tag_or_id in self.items[i]["tags"]]
+
+    def _create(self, kind, coords, options):
+        self.calls["create_" + kind] += 1
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item = next(self.ids)
+        self.items[item] = {"type": kind, "coords": list(coords), "options": options, "tags": list(tags)}
+        self.order.append(item)
+        return item
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def coords(self, tag_or_id, *coords):
+        self.calls["coords"] += 1
+        if len(coords) == 1 and isinstance(coords[0], (list, tuple)):
+            coords = coords[0]
+        matches = self.find(tag_or_id)
+        if not coords:
+            return list(self.items[matches[0]]["coords"]) if matches else []
+        for item in matches:
+            self.items[item]["coords"] = list(coords)
+
+    def move(self, tag_or_id, dx, dy):
+        self.calls["move"] += 1
+        for item in self.find(tag_or_id):
+            c = self.items[item]["coords"]
+            self.items[item]["coords"] = [v + (dx if i % 2 == 0 else dy) for i, v in enumerate(c)]
+
+    def scale(self, tag_or_id, x0, y0, sx, sy):
+        self.calls["scale"] += 1
+        for item in self.find(tag_or_id):
+            c = self.items[item]["coords"]
+            self.items[item]["coords"] = [
+                x0 + (v - x0) * sx if i % 2 == 0 else y0 + (v - y0) * sy for i, v in enumerate(c)
+            ]
+
+    def itemconfig(self, tag_or_id, **options):
+        self.calls["itemconfig"] += 1
+        tags = options.pop("tags", None)
+        if isinstance(tags, str):
+            tags = (tags,)
+        for item in self.find(tag_or_id):
+            self.items[item]["options"].update(options)
+            if tags is not None:
+                self.items[item]["tags"] = list(tags)
+
+    itemconfigure = itemconfig
+
+    def itemcget(self, tag_or_id, option):
+        self.calls["itemcget"] += 1
+        matches = self.find(tag_or_id)
+        return self.items[matches[0]]["options"].get(option, "") if matches else ""
+
+    def addtag_withtag(self, new_tag, tag_or_id):
+        self.calls["addtag"] += 1
+        for item in self.find(tag_or_id):
+            if new_tag not in self.items[item]["tags"]:
+                self.items[item]["tags"].append(new_tag)
+
+    def dtag(self, tag_or_id, tag_to_delete=None):
+        self.calls["dtag"] += 1
+        tag_to_delete = tag_to_delete if tag_to_delete is not None else tag_or_id
+        for item in self.find(tag_or_id):
+            if tag_to_delete in self.items[item]["tags"]:
+                self.items[item]["tags"].remove(tag_to_delete)
+
+    def gettags(self, tag_or_id):
+        matches = self.find(tag_or_id)
+        return tuple(self.items[matches[0]]["tags"]) if matches else ()
+
+    def type(self, tag_or_id):
+        matches = self.find(tag_or_id)
+        return self.items[matches[0]]["type"] if matches else None
+
+    def delete(self, *tags_or_ids):
+        self.calls["delete"] += 1
+        for tag_or_id in tags_or_ids:
+            for item in self.find(tag_or_id):
+                del self.items[item]
+                self.order.remove(item)
+
+    def tag_raise(self, tag_or_id, above=None):
+        self.calls["tag_raise"] += 1
+        matches = self.find(tag_or_id)
+        for item in matches:
+            self.order.remove(item)
+        reference = self.find(above) if above is not None else []
+        index = self.order.index(reference[-1]) + 1 if reference else len(self.order)
+        self.order[index:index] = matches
+
+    def tag_lower(self, tag_or_id, below=None):
+        self.calls["tag_lower"] += 1
+        matches = self.find(tag_or_id)
+        for item in matches:
+            self.order.remove(item)
+        reference = self.find(below) if below is not None else []
+        index = self.order.index(reference[0]) if reference else 0
+        self.order[index:index] = matches
+
+    def tag_bind(self, tag_or_id, sequence=None, func=None, add=None):
+        self.calls["tag_bind"] += 1
+
+    def bind(self, sequence=None, func=None, add=None):
+        self.calls["bind"] += 1
+
+    def find_all(self):
+        return tuple(self.order)
+
+    def find_overlapping(self, x0, y0, x1, y1):
+        """Get the visible items whose bounding box meets a rectangle, in stacking order"""
+        found = []
+        for item in self.order:
+            data = self.items[item]
+            if data["options"].get("state") == tk.HIDDEN:
+                continue
+            box = self.item_box(data)
+            if box is not None and box[0] <= x1 and x0 <= box[2] and box[1] <= y1 and y0 <= box[3]:
+                found.append(item)
+        return tuple(found)
+
+    @staticmethod
+    def item_box(data: Dict):
+        """An item's bounding box as the renderer draws it, None if it draws nothing"""
+        coords, options = data["coords"], data["options"]
+        if data["type"] == "image":
+            image = options.get("image")
+            if not isinstance(image, Raster):
+                return None
+            return (coords[0] - image.width / 2, coords[1] - image.height / 2,
+                    coords[0] + image.width / 2, coords[1] + image.height / 2)
+        if data["type"] == "text":
+            left, top, width, height, _ = SceneRenderer.text_box(coords, options)
+            return left, top, left + width, top + height
+        pad = options.get("width", 1) / 2
+        return min(coords[0::2]) - pad, min(coords[1::2]) - pad, max(coords[0::2]) + pad, max(coords[1::2]) + pad
+
+    def after(self, ms, func=None, *args):
+        self.calls["after"] += 1
+        after_id = f"after#{next(self.after_ids)}"
+        self.pending_after[after_id] = (ms, func, args)
+        return after_id
+
+    def after_idle(self, func, *args):
+        return self.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self.calls["after_cancel"] += 1
+        self.pending_after.pop(after_id, None)
+
+    def run_after(self, limit: int = 10000):
+        """Run pending after callbacks (including ones they schedule) until idle"""
+        runs = 0
+        while self.pending_after and runs < limit:
+            after_id = next(iter(self.pending_after))
+            _, func, args = self.pending_after.pop(after_id)
+            if func is not None:
+                func(*args)
+            runs += 1
+        return runs
+
+    def create_font(self, family: str, size: int, weight: str = "normal") -> OffscreenFont:
+        """Make a font that FontBook can resize in place, as it does Tk's named fonts"""
+        return OffscreenFont(family, size, weight)
+
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def update_idletasks(self):
+        pass
+
+class SceneRenderer:
+    """Draws the items of an OffscreenCanvas into a Raster the way Tk shows them
+
+    Every item is drawn from a Stamp: sprites are prepared once per image,
+    and ovals, rectangles, lines and text are rasterized once per shape,
+    size and colors. Stamps are kept between frames, so drawing a scene
+    again, or another state of it, mostly copies pixels that are already
+    rendered. Text is drawn in a bitmap font scaled to the item's font size,
+    one stamp per character, so a score that changes every frame still
+    reuses the digits drawn before.
+    """
+
+    MAX_STAMPS = 512
+    TEXT_CONDENSE = 0.75  # Dots are narrower than tall, closer to the game font's widths
+
+    def __init__(self, canvas: OffscreenCanvas, max_stamps: int = MAX_STAMPS):
+        self.canvas = canvas
+        self.max_stamps = max_stamps
+        self.stamps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self) -> Raster:
+        """Draw every visible item, bottom first, over the canvas background"""
+        canvas = self.canvas
+        raster = Raster(canvas.width, canvas.height)
+        raster.fill(canvas.background)
+        for item in canvas.order:
+            data = canvas.items[item]
+            if data["options"].get("state") == tk.HIDDEN:
+                continue
+            for stamp, x, y in self.place(data["type"], data["coords"], data["options"]):
+                raster.draw_stamp(stamp, x, y)
+        return raster
+
+    def to_png(self) -> bytes:
+        """Draw the scene and encode it as a PNG"""
+        return self.render().to_png()
+
+    def stamp(self, key: Tuple, draw) -> Stamp:
+        """Get a cached stamp, rasterizing it with draw() the first time"""
+        stamp = self.stamps.get(key)
+        if stamp is not None:
+            self.stamps.move_to_end(key)
+            self.hits += 1
+            return stamp
+        self.misses += 1
+        stamp = self.stamps[key] = Stamp(draw())
+        if len(self.stamps) > self.max_stamps:
+            self.stamps.popitem(last=False)
+        return stamp
+
+    def place(self, kind: str, coords, options: Dict) -> List[Tuple[Stamp, int, int]]:
+        """Get the stamps an item is drawn with and where their top left corners go"""
+        if kind == "image":
+            image = options.get("image")
+            if not isinstance(image, Raster):
+                return []
+            # The key holds the image, so its id cannot be reused while the stamp is cached
+            stamp = self.stamp(("image", image), lambda: image)
+            return [(stamp, round(coords[0] - stamp.width / 2), round(coords[1] - stamp.height / 2))]
+        if kind == "text":
+            return self.place_text(coords, options)
+        if kind in ("oval", "rectangle", "line"):
+            return [self.place_shape(kind, coords, options)]
+        return []
+
+    def place_shape(self, kind: str, coords, options: Dict) -> Tuple[Stamp, int, int]:
+        """Stamp an oval, rectangle or line, keyed on its size and position within a pixel"""
+        width = options.get("width", 1)
+        fill = options.get("fill", NeonColors.BLACK if kind == "line" else "")
+        outline = options.get("outline", NeonColors.BLACK) if kind != "line" else ""
+        pad = width / 2 + 2
+        left = math.floor(min(coords[0::2]) - pad)
+        top = math.floor(min(coords[1::2]) - pad)
+        local = tuple(round(value - (left if i % 2 == 0 else top), 1) for i, value in enumerate(coords))
+        right = math.ceil(max(coords[0::2]) + pad)
+        bottom = math.ceil(max(coords[1::2]) + pad)
+
+        def draw() -> Raster:
+            raster = Raster(right - left, bottom - top)
+            if kind == "line":
+                for i in range(0, len(local) - 2, 2):
+                    raster.stroke_line(*local[i:i + 4], width, fill)
+                return raster
+            x0, y0, x1, y1 = local
+            if kind == "oval":
+                # The game only draws circles
+                cx, cy, radius = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2
+                if fill:
+                    raster.fill_circle(cx, cy, radius, fill)
+                if outline and width:
+                    raster.stroke_circle(cx, cy, radius, width, outline)
+            else:
+                if fill:
+                    raster.fill_rect(x0, y0, x1, y1, fill)
+                if outline and width:
+                    raster.stroke_rect(x0, y0, x1, y1, width, outline)
+            return raster
+
+        return self.stamp((kind, local, fill, outline, width, right - left, bottom - top), draw), left, top
+
+    def place_text(self, coords, options: Dict) -> List[Tuple[Stamp, int, int]]:
+        """Stamp each character of a text item in the bitmap font, placed by the item's anchor"""
+        text = str(options.get("text", ""))
+        fill = options.get("fill", NeonColors.BLACK)
+        if not text.strip() or not fill:
+            return []
+        left, top, _, _, dot = self.text_box(coords, options)
+        dot_x = dot * self.TEXT_CONDENSE
+        key = (round(dot, 3), fill)
+        placed = []
+        for char, column, row in text_layout(text, options.get("justify", "left")):
+            stamp = self.stamp(("glyph", char) + key, lambda: self.draw_glyph(char, dot_x, dot, fill))
+            placed.append((stamp, round(left + column * dot_x), round(top + row * dot)))
+        return placed
+
+    @classmethod
+    def text_box(cls, coords, options: Dict) -> Tuple[float, float, float, float, float]:
+        """Where a text item's glyphs go: left, top, width, height and the height of a dot"""
+        font = options.get("font")
+        size = font.cget("size") if isinstance(font, OffscreenFont) else font[1] if isinstance(font, tuple) else 12
+        pixels = -size if size < 0 else size * 4 / 3  # Negative font sizes are in pixels, as in Tk
+        dot = pixels / (GLYPH_HEIGHT + 1)
+        columns, rows = text_size(str(options.get("text", "")))
+        width, height = columns * dot * cls.TEXT_CONDENSE, rows * dot
+        anchor = options.get("anchor", tk.CENTER)
+        anchor = "" if anchor == tk.CENTER else anchor  # Compass points only from here on
+        x, y = coords[0], coords[1]
+        left = x if "w" in anchor else x - width if "e" in anchor else x - width / 2
+        top = y if "n" in anchor else y - height if "s" in anchor else y - height / 2
+        return left, top, width, height, dot
+
+    @staticmethod
+    def draw_glyph(char: str, dot_x: float, dot: float, fill: str) -> Raster:
+        # Dot edges land on whole pixels, so neighbouring dots leave no seams
+        raster = Raster(math.ceil(GLYPH_WIDTH * dot_x) + 1, math.ceil(GLYPH_HEIGHT * dot) + 1)
+        for column, row, length in glyph_runs(char):
+            raster.fill_pixels(round(column * dot_x), round(row * dot), round((column + length) * dot_x),
+                               round((row + 1) * dot), fill)
+        return raster
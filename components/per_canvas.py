@@ -0,0 +1,25 @@
+"""
+Objects shared by everything drawing on one canvas
+"""
+
+class PerCanvas:
+    """Mixin giving a class one shared instance per canvas
+
+    Instances are kept in a dict on the canvas itself rather than in a
+    registry on the class, so they go when the canvas goes: an instance
+    holding its canvas only makes a cycle, which the collector frees.
+    """
+
+    @classmethod
+    def for_canvas(cls, canvas):
+        """Get the shared instance for a canvas, making it the first time"""
+        shared = vars(canvas).setdefault("_per_canvas", {})
+        instance = shared.get(cls)
+        if instance is None:
+            instance = shared[cls] = cls.create_for(canvas)
+        return instance
+
+    @classmethod
+    def create_for(cls, canvas):
+        """Make the shared instance for a canvas"""
+        return cls(canvas)
@@ -0,0 +1,125 @@
+"""
+Pulsing neon glows for the Hour Tower canvas
+"""
+
+import itertools
+import math
+import tkinter as tk
+from typing import Dict, Optional, Tuple
+from .animation import Animator
+from .colors import NeonColors
+from .per_canvas import PerCanvas
+from .update_queue import UpdateQueue
+
+class PulseGroup:
+    """Items pulsing through the same ramp on the same phase, under one shared tag"""
+
+    def __init__(self, key: Tuple, tag: str, option: str, ramp: Tuple[str, ...], phase: float):
+        self.key = key
+        self.tag = tag
+        self.option = option  # Item option the ramp is written to, "fill" or "outline"
+        self.ramp = ramp
+        self.phase = phase
+        self.members = 0
+        self.shown = 0  # Ramp step the items were last set to
+
+class Pulser(PerCanvas):
+    """Drives glow pulses from precomputed color ramps
+
+    A pulse swings an item's fill or outline from its base color to a peak
+    color and back. The colors in between come from NeonColors.ramp, worked
+    out once per pair of colors, so a frame never blends hex strings. Items
+    with the same ramp and phase share a tag and are written with one
+    itemconfig, and only when their step on the ramp changed, so a frame
+    costs a call per group however many items pulse.
+
+    Pulses run on the canvas Animator's frame clock, as a delayed tween
+    that restarts itself about once per ramp step, so they share its timer
+    and its flush with every other animation. The tween stops while
+    nothing is pulsing and while the window is hidden.
+    """
+
+    PERIOD_MS = 2400
+    STEPS = 12  # Ramp steps from base to peak color
+    TICK_MS = PERIOD_MS // (4 * STEPS)
+    TWEEN_KEY = "pulse"
+
+    def __init__(self, canvas: tk.Canvas, animator: Optional[Animator] = None):
+        self.canvas = canvas
+        self.animator = animator if animator is not None else Animator.for_canvas(canvas)
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.groups: Dict[Tuple, PulseGroup] = {}
+        self.members: Dict[int, PulseGroup] = {}  # Group of each pulsing item
+        self.tags = itertools.count(1)
+        self.paused = False  # Set while the window is hidden
+        self.ticks = 0
+        self.writes = 0
+
+    def add(self, item: int, option: str, base: str, peak: str = NeonColors.WHITE, phase: float = 0.0):
+        """Pulse an item's option from base to peak and back, phase being a fraction of the period"""
+        self.remove(item)
+        phase = round(phase * 2 * self.STEPS) / (2 * self.STEPS) % 1.0  # Close phases share a group
+        key = (option, base, peak, phase)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = PulseGroup(key, f"pulse_{next(self.tags)}", option,
+                                                  NeonColors.ramp(base, peak, self.STEPS), phase)
+        group.members += 1
+        self.members[item] = group
+        self.canvas.addtag_withtag(group.tag, item)
+        if group.shown:
+            # Join the group mid-pulse
+            self.updates.itemconfig(item, **{option: group.ramp[group.shown]})
+        self.start()
+
+    def remove(self, item: int, untag: bool = True):
+        """Stop pulsing an item, leaving it at whatever step it was on
+
+        Pass untag=False when the item's tags are about to be replaced anyway.
+        """
+        group = self.members.pop(item, None)
+        if group is None:
+            return
+        if untag:
+            self.canvas.dtag(item, group.tag)
+        group.members -= 1
+        if not group.members:
+            del self.groups[group.key]
+        if not self.members:
+            self.stop()
+
+    def start(self):
+        """Schedule the next tick if something is pulsing and none is pending"""
+        if self.members and not self.paused and not self.animator.is_active(self.TWEEN_KEY):
+            self.animator.animate(self.TWEEN_KEY, 0, lambda progress: None, on_done=self.tick,
+                                  delay_ms=self.TICK_MS)
+
+    def stop(self):
+        """Cancel the pending tick"""
+        self.animator.cancel(self.TWEEN_KEY)
+
+    def pause(self):
+        """Stop ticking until resume, for when the window is hidden"""
+        self.paused = True
+        self.stop()
+
+    def resume(self):
+        self.paused = False
+        self.start()
+
+    def step_at(self, now_ms: float, phase: float) -> int:
+        """Where a phase is on the ramp at a time, easing in and out at both ends"""
+        position = now_ms / self.PERIOD_MS + phase
+        return round(self.STEPS * (1 - math.cos(2 * math.pi * position)) / 2)
+
+    def tick(self):
+        """Move every group whose step changed to its new color"""
+        self.ticks += 1
+        now = self.animator.now()
+        for group in self.groups.values():
+            step = self.step_at(now, group.phase)
+            if step != group.shown:
+                group.shown = step
+                self.updates.itemconfig_group(group.tag, **{group.option: group.ramp[step]})
+                self.writes += 1
+        self.start()
@@ -0,0 +1,245 @@
+"""
+Small software rasterizer for pre-rendered neon shapes
+"""
+
+import math
+import struct
+import zlib
+from typing import Callable, Tuple
+
+def parse_color(color: str) -> Tuple[int, int, int]:
+    """Convert a "#RRGGBB" color to an (r, g, b) tuple"""
+    return int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+
+class Raster:
+    """An RGBA pixel buffer with antialiased circle and rectangle drawing
+
+    Shapes are drawn from signed distances to their edge, which gives soft
+    edges and glow falloff without any supersampling. Pixels are blended
+    with the "source over" rule so layers stack the way canvas items do.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(width * height * 4)
+
+    def blend(self, x: int, y: int, rgb: Tuple[int, int, int], alpha: float):
+        """Blend a color over the pixel at (x, y)"""
+        if alpha < 0.002 or not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        i = (y * self.width + x) * 4
+        pixels = self.pixels
+        dst = pixels[i + 3]
+        if dst == 0 or alpha >= 1:
+            # Nothing underneath to mix with
+            pixels[i:i + 4] = bytes((rgb[0], rgb[1], rgb[2], round(min(alpha, 1) * 255)))
+            return
+        dst_alpha = dst / 255
+        out_alpha = alpha + dst_alpha * (1 - alpha)
+        for c in range(3):
+            pixels[i + c] = round((rgb[c] * alpha + pixels[i + c] * dst_alpha * (1 - alpha)) / out_alpha)
+        pixels[i + 3] = round(out_alpha * 255)
+
+    def shade_circle(self, cx: float, cy: float, inner: float, outer: float,
+                     coverage: Callable[[float], float], color: str):
+        """Blend color over the band inner..outer around a center
+
+        coverage maps a pixel's distance from the center to its alpha. Only
+        pixels inside the band are visited, so thin rings on large circles
+        stay cheap.
+        """
+        rgb = parse_color(color)
+        inner = max(inner, 0)
+        for y in range(max(int(cy - outer), 0), min(int(math.ceil(cy + outer)) + 1, self.height)):
+            dy = y + 0.5 - cy
+            if abs(dy) > outer:
+                continue
+            x_outer = math.sqrt(outer * outer - dy * dy)
+            x_inner = math.sqrt(inner * inner - dy * dy) if abs(dy) < inner else 0
+            spans = ((cx - x_outer, cx - x_inner), (cx + x_inner, cx + x_outer)) if x_inner else \
+                ((cx - x_outer, cx + x_outer),)
+            for start, end in spans:
+                for x in range(max(int(start), 0), min(int(math.ceil(end)) + 1, self.width)):
+                    dx = x + 0.5 - cx
+                    self.blend(x, y, rgb, coverage(math.sqrt(dx * dx + dy * dy)))
+
+    def fill_circle(self, cx: float, cy: float, radius: float, color: str, alpha: float = 1.0):
+        """Draw a filled circle"""
+        self.shade_circle(cx, cy, 0, radius + 1,
+                          lambda d: alpha * min(max(radius + 0.5 - d, 0), 1), color)
+
+    def stroke_circle(self, cx: float, cy: float, radius: float, width: float, color: str,
+                      alpha: float = 1.0):
+        """Draw a circle outline centered on radius"""
+        half = width / 2
+        self.shade_circle(cx, cy, radius - half - 1, radius + half + 1,
+                          lambda d: alpha * min(max(half + 0.5 - abs(d - radius), 0), 1), color)
+
+    def glow_circle(self, cx: float, cy: float, radius: float, spread: float, color: str,
+                    strength: float = 0.6):
+        """Draw a soft glow fading out over spread pixels beyond radius"""
+        def falloff(d):
+            if d < radius:
+                return 0
+            return strength * max(1 - (d - radius) / spread, 0) ** 2
+        self.shade_circle(cx, cy, radius, radius + spread, falloff, color)
+
+    def shade_rect(self, x0: float, y0: float, x1: float, y1: float, pad: float,
+                   coverage: Callable[[float], float], color: str, hollow: float = None):
+        """Blend color around a rectangle by signed distance to its edge (negative inside)
+
+        Pixels deeper inside than hollow are skipped, for shapes that only
+        touch the edge.
+        """
+        rgb = parse_color(color)
+        x_start = max(int(x0 - pad), 0)
+        x_end = min(int(math.ceil(x1 + pad)) + 1, self.width)
+        for y in range(max(int(y0 - pad), 0), min(int(math.ceil(y1 + pad)) + 1, self.height)):
+            py = y + 0.5
+            xs = range(x_start, x_end)
+            if hollow is not None and y0 + hollow < py < y1 - hollow:
+                # Only the left and right edges of this row are needed
+                xs = [x for x in xs if not (x0 + hollow < x + 0.5 < x1 - hollow)]
+            for x in xs:
+                px = x + 0.5
+                dx = max(x0 - px, 0, px - x1)
+                dy = max(y0 - py, 0, py - y1)
+                if dx or dy:
+                    distance = math.sqrt(dx * dx + dy * dy)
+                else:
+                    distance = -min(px - x0, x1 - px, py - y0, y1 - py)
+                self.blend(x, y, rgb, coverage(distance))
+
+    def fill_rect(self, x0: float, y0: float, x1: float, y1: float, color: str, alpha: float = 1.0):
+        """Draw a filled rectangle"""
+        if alpha >= 1:
+            # Fully covered rows are copied in one slice, only the edge is shaded
+            r, g, b = parse_color(color)
+            ix0, ix1 = max(int(math.ceil(x0 + 0.5)), 0), min(int(x1 - 0.5), self.width)
+            if ix1 > ix0:
+                row = bytes((r, g, b, 255)) * (ix1 - ix0)
+                for y in range(max(int(math.ceil(y0 + 0.5)), 0), min(int(y1 - 0.5), self.height)):
+                    start = (y * self.width + ix0) * 4
+                    self.pixels[start:start + len(row)] = row
+            self.shade_rect(x0, y0, x1, y1, 1, lambda d: min(max(0.5 - d, 0), 1), color, hollow=1)
+            return
+        self.shade_rect(x0, y0, x1, y1, 1, lambda d: alpha * min(max(0.5 - d, 0), 1), color)
+
+    def stroke_rect(self, x0: float, y0: float, x1: float, y1: float, width: float, color: str,
+                    alpha: float = 1.0):
+        """Draw a rectangle outline centered on its edge"""
+        half = width / 2
+        self.shade_rect(x0, y0, x1, y1, half + 1,
+                        lambda d: alpha * min(max(half + 0.5 - abs(d), 0), 1), color, hollow=half + 1)
+
+    def glow_rect(self, x0: float, y0: float, x1: float, y1: float, spread: float, color: str,
+                  strength: float = 0.6):
+        """Draw a soft glow fading out over spread pixels beyond a rectangle"""
+        self.shade_rect(x0, y0, x1, y1, spread,
+                        lambda d: strength * max(1 - d / spread, 0) ** 2 if d > 0 else 0, color, hollow=0)
+
+    def stroke_line(self, x0: float, y0: float, x1: float, y1: float, width: float, color: str,
+                    alpha: float = 1.0):
+        """Draw a straight line with round caps"""
+        rgb = parse_color(color)
+        half = width / 2
+        length_sq = (x1 - x0) ** 2 + (y1 - y0) ** 2
+        xs = range(max(int(min(x0, x1) - half - 1), 0), min(int(math.ceil(max(x0, x1) + half)) + 2, self.width))
+        for y in range(max(int(min(y0, y1) - half - 1), 0), min(int(math.ceil(max(y0, y1) + half)) + 2, self.height)):
+            py = y + 0.5
+            for x in xs:
+                px = x + 0.5
+                # Distance to the closest point of the segment
+                t = ((px - x0) * (x1 - x0) + (py - y0) * (y1 - y0)) / length_sq if length_sq else 0
+                t = min(max(t, 0), 1)
+                distance = math.hypot(px - x0 - t * (x1 - x0), py - y0 - t * (y1 - y0))
+                self.blend(x, y, rgb, alpha * min(max(half + 0.5 - distance, 0), 1))
+
+    def fill_pixels(self, x0: int, y0: int, x1: int, y1: int, color: str):
+        """Fill whole pixels from (x0, y0) up to but not including (x1, y1), with no antialiasing"""
+        x0, x1 = max(x0, 0), min(x1, self.width)
+        if x1 <= x0:
+            return
+        row = bytes(parse_color(color) + (255,)) * (x1 - x0)
+        for y in range(max(y0, 0), min(y1, self.height)):
+            start = (y * self.width + x0) * 4
+            self.pixels[start:start + len(row)] = row
+
+    def fill(self, color: str):
+        """Cover the whole buffer with an opaque color"""
+        self.pixels[:] = bytes(parse_color(color) + (255,)) * (self.width * self.height)
+
+    def draw_stamp(self, stamp: "Stamp", x: int, y: int):
+        """Draw a stamp with its top left corner at (x, y) onto pixels that are already opaque"""
+        pixels = self.pixels
+        source = stamp.pixels
+        width = self.width
+        for row, runs, partial in stamp.rows:
+            target_y = y + row
+            if not 0 <= target_y < self.height:
+                continue
+            source_start = row * stamp.width * 4
+            target_start = (target_y * width + x) * 4
+            for start, end in runs:
+                start, end = max(start, -x), min(end, width - x)
+                if start < end:
+                    pixels[target_start + start * 4:target_start + end * 4] = \
+                        source[source_start + start * 4:source_start + end * 4]
+            for column, r, g, b, a in partial:
+                if 0 <= x + column < width:
+                    i = target_start + column * 4
+                    keep = 255 - a
+                    pixels[i] = (r * a + pixels[i] * keep + 127) // 255
+                    pixels[i + 1] = (g * a + pixels[i + 1] * keep + 127) // 255
+                    pixels[i + 2] = (b * a + pixels[i + 2] * keep + 127) // 255
+
+    def to_png(self) -> bytes:
+        """Encode the buffer as an RGBA PNG"""
+        stride = self.width * 4
+        raw = b"".join(
+            b"\x00" + bytes(self.pixels[y * stride:(y + 1) * stride]) for y in range(self.height)
+        )
+
+        def chunk(kind: bytes, data: bytes) -> bytes:
+            return (struct.pack(">I", len(data)) + kind + data +
+                    struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 6, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+                chunk(b"IDAT", zlib.compress(raw, 6)) + chunk(b"IEND", b""))
+
+class Stamp:
+    """A raster prepared once for drawing many times onto opaque rasters
+
+    Each row keeps its runs of fully opaque pixels, copied with one slice
+    apiece, and its partly covered pixels, blended one at a time.
+    Transparent pixels and empty rows are skipped altogether.
+    """
+
+    def __init__(self, raster: Raster):
+        self.width = raster.width
+        self.height = raster.height
+        self.pixels = bytes(raster.pixels)
+        self.rows = []  # (row, opaque runs as (start, end) columns, partial pixels as (column, r, g, b, a))
+        stride = self.width * 4
+        for y in range(self.height):
+            alphas = self.pixels[y * stride + 3:(y + 1) * stride:4]
+            runs = []
+            partial = []
+            run_start = None
+            for x, alpha in enumerate(alphas):
+                if alpha == 255:
+                    if run_start is None:
+                        run_start = x
+                    continue
+                if run_start is not None:
+                    runs.append((run_start, x))
+                    run_start = None
+                if alpha:
+                    i = y * stride + x * 4
+                    partial.append((x, self.pixels[i], self.pixels[i + 1], self.pixels[i + 2], alpha))
+            if run_start is not None:
+                runs.append((run_start, self.width))
+            if runs or partial:
+                self.rows.append((y, runs, partial))
@@ -0,0 +1,316 @@
+"""
+Deterministic recording and replay of game sessions
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional
+from .engine import GameEngine
+from .layout import Layout
+
+FORMAT_VERSION = 1
+
+# Engine events a replay has to reproduce, and the fields compared
+CHECKED_EVENTS = {
+    "correct_placement": ("number", "score"),
+    "incorrect_placement": ("number",),
+    "game_complete": ("score",),
+}
+
+PointerEvent = namedtuple("PointerEvent", "x y")
+
+class InputRecorder:
+    """Writes the inputs of a session, and what they led to, to a replay file
+
+    A replay file is JSON lines. The first line is a header with the
+    engine's seed and user; every other line is a record with t, the
+    seconds since recording started, and a type:
+
+    - ``press``: ``number`` grabbed, pointer ``x``, ``y`` and the number's
+      center ``at``
+    - ``motion``: pointer ``x``, ``y``
+    - ``release``: pointer ``x``, ``y``, ``number`` and ``drop``, where the
+      number was let go
+    - ``command``: ``name`` ("new_game", "reset", "undo", "redo" or
+      "restore", with the arguments of GameEngine.restore in ``args``)
+    - ``outcome``: an engine ``event`` the replay has to reproduce
+
+    Coordinates are in design units, so a replay plays back the same at any
+    window size. Commands and outcomes are taken from the engine's events,
+    so every way of starting or resetting a game is captured.
+    """
+
+    def __init__(self, path: str, engine: GameEngine, clock: Callable[[], float] = time.perf_counter):
+        self.engine = engine
+        self.clock = clock
+        self.started_at = clock()
+        self.resetting = False
+        self.file = open(path, "w")
+        self.write({"type": "header", "version": FORMAT_VERSION, "seed": engine.seed,
+                    "user": engine.user_progress["user"], "created": time.time()})
+        engine.subscribe(self.on_engine_event)
+
+    def write(self, record: Dict):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def record(self, kind: str, **fields):
+        """Write one timestamped record"""
+        record = {"t": round(self.clock() - self.started_at, 4), "type": kind}
+        record.update(fields)
+        self.write(record)
+        if kind != "motion":
+            # Keep the file useful for a bug report even if the game crashes
+            self.file.flush()
+
+    def press(self, number: int, x: float, y: float, at):
+        self.record("press", number=number, x=x, y=y, at=list(at))
+
+    def motion(self, x: float, y: float):
+        self.record("motion", x=x, y=y)
+
+    def release(self, x: float, y: float, number: int, drop):
+        self.record("release", x=x, y=y, number=number, drop=list(drop))
+
+    def on_engine_event(self, event: str, data: Dict):
+        """Record commands and outcomes from a GameEngine subscription"""
+        if event == "game_reset":
+            # reset_game starts a new game itself, so its game_started is not a command
+            self.resetting = True
+            self.record("command", name="reset")
+        elif event == "game_started":
+            if not self.resetting:
+                self.record("command", name="new_game")
+            self.resetting = False
+        elif event == "game_restored":
+            args = {key: data[key] for key in ("score", "placed", "tower_progress", "tower_blocks", "elapsed")}
+            self.record("command", name="restore", args=args)
+        elif event in ("undo", "redo"):
+            self.record("command", name=event)
+        elif event in CHECKED_EVENTS:
+            self.record("outcome", event=event, **{key: data[key] for key in CHECKED_EVENTS[event]})
+
+    def close(self):
+        """Stop recording and close the file"""
+        if not self.file.closed:
+            self.engine.unsubscribe(self.on_engine_event)
+            self.file.close()
+
+class EngineTarget:
+    """Plays inputs straight into a GameEngine, with no canvas at all"""
+
+    def __init__(self, engine: GameEngine):
+        self.engine = engine
+
+    def press(self, number: int, x: float, y: float, at):
+        pass
+
+    def motion(self, x: float, y: float):
+        pass
+
+    def release(self, x: float, y: float, number: int, drop):
+        self.engine.handle_number_placement(number, *drop)
+
+    def command(self, name: str, args: Optional[Dict] = None):
+        if name == "new_game":
+            self.engine.start_new_game()
+        elif name == "reset":
+            self.engine.reset_game()
+        elif name == "undo":
+            self.engine.undo()
+        elif name == "redo":
+            self.engine.redo()
+        elif name == "restore":
+            self.engine.restore(**args)
+
+class GameLogicTarget:
+    """Plays inputs through GameLogic and its ClockNumbers, drawing every frame on the canvas"""
+
+    def __init__(self, game_logic):
+        self.game_logic = game_logic
+        self.layout = Layout.for_canvas(game_logic.canvas)
+
+    def pointer(self, x: float, y: float) -> PointerEvent:
+        """A pointer event at a design point, in canvas coordinates"""
+        return PointerEvent(*self.layout.to_screen(x, y))
+
+    def press(self, number: int, x: float, y: float, at):
+        clock_number = self.game_logic.get_number(number)
+        if clock_number is not None:
+            # Put the number where the player grabbed it, even if its bounce home has not finished here
+            clock_number.animator.cancel(f"bounce_{clock_number.tag}")
+            clock_number.move_to(*at)
+            clock_number.start_drag(self.pointer(x, y))
+
+    def motion(self, x: float, y: float):
+        target = self.game_logic.drag_target
+        if target is not None:
+            target.drag(self.pointer(x, y))
+
+    def release(self, x: float, y: float, number: int, drop):
+        target = self.game_logic.drag_target
+        if target is None:
+            return
+        target.stop_drag()
+        self.game_logic.drag_target = None
+        self.game_logic.handle_number_placement(target, target.x, target.y)
+
+    def command(self, name: str, args: Optional[Dict] = None):
+        if name == "new_game":
+            self.game_logic.start_new_game()
+        elif name == "reset":
+            self.game_logic.reset_game()
+        elif name == "undo":
+            self.game_logic.undo()
+        elif name == "redo":
+            self.game_logic.redo()
+        elif name == "restore":
+            self.game_logic.engine.restore(**args)
+
+class Replayer:
+    """Feeds a replay file back through a target and checks the outcomes match
+
+    Targets take press, motion, release and command calls (see EngineTarget).
+    run plays every record as fast as possible, or at the recorded pace with
+    realtime=True; schedule paces it on a Tk widget's event loop instead of
+    sleeping. Engines made by make_engine read the replay's own clock, so
+    timings such as time_spent come out as recorded even at full speed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or lines[0].get("type") != "header":
+            raise ValueError(f"{path} is not a replay file")
+        self.header = lines[0]
+        if self.header["version"] > FORMAT_VERSION:
+            raise ValueError(f"{path} needs a newer version of the game (format {self.header['version']})")
+        self.inputs = [record for record in lines[1:] if record["type"] != "outcome"]
+        self.expected = [record for record in lines[1:] if record["type"] == "outcome"]
+        self.now = 0.0
+        self.position = 0
+        self.checked = 0
+        self.divergences: List[Dict] = []
+
+    @property
+    def seed(self) -> int:
+        return self.header["seed"]
+
+    @property
+    def duration(self) -> float:
+        return self.inputs[-1]["t"] if self.inputs else 0.0
+
+    def clock(self) -> float:
+        """Wall time as it was at the record being played"""
+        return self.header["created"] + self.now
+
+    def make_engine(self, **kwargs) -> GameEngine:
+        """A GameEngine set up like the recorded one and watched for divergences"""
+        engine = GameEngine(seed=self.seed, user=self.header["user"], clock=self.clock, **kwargs)
+        self.watch(engine)
+        return engine
+
+    def watch(self, engine: GameEngine):
+        """Compare an engine's outcomes with the recorded ones"""
+        engine.subscribe(self.check)
+
+    def check(self, event: str, data: Dict):
+        if event not in CHECKED_EVENTS:
+            return
+        actual = {"event": event, **{key: data[key] for key in CHECKED_EVENTS[event]}}
+        expected = self.expected_outcome(self.checked)
+        if expected != actual:
+            self.divergences.append({"t": self.now, "expected": expected, "actual": actual})
+        self.checked += 1
+
+    def expected_outcome(self, index: int) -> Optional[Dict]:
+        """The index-th recorded outcome, without its timestamp"""
+        if index >= len(self.expected):
+            return None
+        return {key: value for key, value in self.expected[index].items() if key not in ("t", "type")}
+
+    def apply(self, target, record: Dict):
+        """Play one record"""
+        self.now = record["t"]
+        kind = record["type"]
+        if kind == "press":
+            target.press(record["number"], record["x"], record["y"], record["at"])
+        elif kind == "motion":
+            target.motion(record["x"], record["y"])
+        elif kind == "release":
+            target.release(record["x"], record["y"], record["number"], record["drop"])
+        elif kind == "command":
+            target.command(record["name"], record.get("args"))
+
+    def finish(self) -> Dict:
+        """Flag outcomes that never happened and summarize the run"""
+        if self.checked < len(self.expected):
+            self.divergences.append({"t": self.now, "expected": self.expected_outcome(self.checked), "actual": None})
+        return {
+            "inputs": len(self.inputs),
+            "duration_s": self.duration,
+            "outcomes_checked": self.checked,
+            "divergences": len(self.divergences)
+        }
+
+    def run(self, target, realtime: bool = False, speed: float = 1.0,
+            sleep: Callable[[float], None] = time.sleep) -> Dict:
+        """Play every record into a target, returns a summary with the wall time taken"""
+        started_at = time.perf_counter()
+        for record in self.inputs:
+            if realtime:
+                delay = started_at + record["t"] / speed - time.perf_counter()
+                if delay > 0:
+                    sleep(delay)
+            self.apply(target, record)
+        summary = self.finish()
+        summary["wall_s"] = time.perf_counter() - started_at
+        return summary
+
+    def schedule(self, widget, target, speed: float = 1.0, on_done: Optional[Callable[[Dict], None]] = None):
+        """Play the records from a Tk widget's event loop at the recorded pace"""
+        started_at = time.perf_counter()
+
+        def step():
+            now = time.perf_counter()
+            while self.position < len(self.inputs):
+                record = self.inputs[self.position]
+                due = started_at + record["t"] / speed
+                if due > now:
+                    widget.after(max(int((due - now) * 1000), 1), step)
+                    return
+                self.position += 1
+                self.apply(target, record)
+            summary = self.finish()
+            summary["wall_s"] = time.perf_counter() - started_at
+            if on_done is not None:
+                on_done(summary)
+
+        widget.after(0, step)
+
+def main(argv: Optional[List[str]] = None):
+    """Replay files headless and report whether they still play out the same"""
+    parser = argparse.ArgumentParser(description="Replay recorded Hour Tower sessions without a display")
+    parser.add_argument("replays", nargs="+", help="Replay files")
+    parser.add_argument("--realtime", action="store_true", help="Play at the recorded pace")
+    parser.add_argument("--speed", type=float, default=1.0, help="Pace multiplier with --realtime")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.replays:
+        replayer = Replayer(path)
+        summary = replayer.run(EngineTarget(replayer.make_engine()), args.realtime, args.speed)
+        rate = summary["inputs"] / summary["wall_s"] if summary["wall_s"] else 0.0
+        print(f"{path}: {summary['inputs']} inputs over {summary['duration_s']:.1f} s "
+              f"replayed in {summary['wall_s'] * 1000:.1f} ms ({rate:,.0f} inputs/s), "
+              f"{summary['outcomes_checked']} outcomes checked, {summary['divergences']} divergences")
+        for divergence in replayer.divergences[:5]:
+            print(f"  at {divergence['t']:.2f} s expected {divergence['expected']}, got {divergence['actual']}")
+        failed = failed or bool(replayer.divergences)
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
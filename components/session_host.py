@@ -0,0 +1,190 @@
+"""
+Asyncio host serving many independent game sessions over JSON lines
+"""
+
+import asyncio
+import itertools
+import json
+import math
+from typing import Dict, Optional, Set
+from .engine import GameEngine
+from .event_log import EventLog, ProgressState, restore_latest
+
+class GameSession:
+    """One player's game, with its own board, score, tower and user_progress"""
+
+    def __init__(self, session_id: str, user: str = "player_name", event_log: Optional[EventLog] = None,
+                 recovered: Optional[Dict[str, ProgressState]] = None):
+        self.session_id = session_id
+        self.engine = GameEngine(user=user)
+        self.recorder = event_log.attach(self.engine) if event_log is not None else None
+        if not (recovered and restore_latest(self.engine, recovered)):
+            self.engine.start_new_game()
+
+    def close(self):
+        """Stop recording the session"""
+        if self.recorder is not None:
+            self.recorder.detach()
+
+    def snapshot(self) -> Dict:
+        """Describe the session state for a client"""
+        engine = self.engine
+        return {
+            "session": self.session_id,
+            "score": engine.score,
+            "remaining": engine.get_remaining_numbers(),
+            "complete": engine.game_complete,
+            "pieces": [{"number": piece.number, "x": piece.x, "y": piece.y} for piece in engine.pieces],
+            "slots": [{"number": slot.number, "x": slot.x, "y": slot.y, "occupied": slot.occupied}
+                      for slot in engine.board.slots],
+            "tower": {"progress": engine.tower.progress, "blocks": len(engine.tower.blocks)},
+            "user_progress": dict(engine.user_progress)
+        }
+
+class SessionHost:
+    """Runs many GameSessions in one process for classroom deployments
+
+    Each client connection sends one JSON object per line and gets exactly
+    one JSON line back per request, in order. Requests carry an ``op``:
+
+    - ``new_session`` (optional ``user``): start a game, returns its snapshot
+    - ``place``: ``session``, ``number``, ``x``, ``y``
+    - ``reset``: ``session``
+    - ``state``: ``session``
+    - ``close``: ``session``
+
+    With an event_log every session's events are recorded, and a user's
+    unfinished game from before a restart is resumed by their next
+    ``new_session``.
+
+    Sessions belong to the connection that started them: other connections
+    cannot drive them, and any still open when their connection drops are
+    closed, so clients that vanish do not use up max_sessions.
+
+    An optional ``id`` is echoed back. Each connection is served one request
+    at a time and waits for its reply to drain before reading the next, so a
+    client that stops reading is throttled by the socket instead of growing
+    the host's buffers.
+    """
+
+    MAX_LINE = 64 * 1024
+    WRITE_BUFFER_HIGH = 64 * 1024
+
+    def __init__(self, max_sessions: int = 1000, event_log: Optional[EventLog] = None,
+                 recovered: Optional[Dict[str, ProgressState]] = None):
+        self.max_sessions = max_sessions
+        self.event_log = event_log
+        # Each user's state from before a restart, used once to resume their game
+        self.recovered = dict(recovered) if recovered else {}
+        self.sessions: Dict[str, GameSession] = {}
+        self.session_ids = itertools.count(1)
+        self.requests_handled = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    def handle_request(self, request: Dict, owned: Optional[Set[str]] = None) -> Dict:
+        """Apply one request and build its reply
+
+        owned is the set of session ids of the connection the request came
+        on; sessions it starts are added to it and it may only use those.
+        """
+        self.requests_handled += 1
+        op = request.get("op")
+
+        if op == "new_session":
+            if len(self.sessions) >= self.max_sessions:
+                return {"ok": False, "error": "too many sessions"}
+            user = request.get("user", "player_name")
+            if not isinstance(user, str):
+                return {"ok": False, "error": "user must be a string"}
+            recovered = {user: self.recovered.pop(user)} if user in self.recovered else None
+            session = GameSession(f"s{next(self.session_ids)}", user, self.event_log, recovered)
+            self.sessions[session.session_id] = session
+            if owned is not None:
+                owned.add(session.session_id)
+            return {"ok": True, **session.snapshot()}
+
+        session_id = request.get("session")
+        if not isinstance(session_id, str):
+            return {"ok": False, "error": "session must be a string"}
+        session = self.sessions.get(session_id)
+        if session is None or (owned is not None and session_id not in owned):
+            return {"ok": False, "error": "unknown session"}
+
+        if op == "place":
+            number, x, y = request.get("number"), request.get("x"), request.get("y")
+            if (not isinstance(number, int) or isinstance(number, bool)
+                    or not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in (x, y))
+                    or not math.isfinite(x) or not math.isfinite(y)):
+                return {"ok": False, "error": "place needs number, x and y"}
+            correct = session.engine.handle_number_placement(number, x, y)
+            engine = session.engine
+            return {"ok": True, "correct": bool(correct), "score": engine.score,
+                    "remaining": engine.get_remaining_numbers(), "complete": engine.game_complete}
+        if op == "reset":
+            session.engine.reset_game()
+            return {"ok": True, **session.snapshot()}
+        if op == "state":
+            return {"ok": True, **session.snapshot()}
+        if op == "close":
+            self.close_session(session_id, owned)
+            return {"ok": True, "session": session_id}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def close_session(self, session_id: str, owned: Optional[Set[str]] = None):
+        """End a session and forget it"""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+        if owned is not None:
+            owned.discard(session_id)
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one client connection until it disconnects"""
+        writer.transport.set_write_buffer_limits(high=self.WRITE_BUFFER_HIGH)
+        owned: Set[str] = set()  # Sessions this connection started and has not closed
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    reply = {"ok": False, "error": "invalid json"}
+                else:
+                    reply = self.handle_request(request, owned)
+                    if "id" in request:
+                        reply["id"] = request["id"]
+
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in list(owned):
+                self.close_session(session_id, owned)
+            writer.close()
+
+    async def start_unix(self, path: str):
+        """Listen on a Unix domain socket"""
+        self.server = await asyncio.start_unix_server(self.handle_client, path=path, limit=self.MAX_LINE)
+        return self.server
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 0):
+        """Listen on a local TCP port, for platforms without Unix sockets"""
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=self.MAX_LINE)
+        return self.server
+
+    async def serve_forever(self):
+        """Serve until cancelled"""
+        async with self.server:
+            await self.server.serve_forever()
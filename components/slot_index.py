@@ -0,0 +1,106 @@
+"""
+Polar spatial index for clock face slots
+"""
+
+import math
+from typing import Dict, List, Optional
+
+class SlotRing:
+    """Evenly spaced slots sharing one radius, bucketed by angle"""
+
+    def __init__(self, radius: float, slots: List, start_angle: float):
+        self.radius = radius
+        self.slots = slots
+        self.start_angle = start_angle
+        self.bucket_angle = 2 * math.pi / len(slots)
+
+    def bucket_for(self, angle: float) -> int:
+        """Get the bucket whose slot is angularly closest to an angle"""
+        return int(round((angle - self.start_angle) / self.bucket_angle)) % len(self.slots)
+
+class SlotIndex:
+    """Resolves points to slots by ring radius and polar angle
+
+    Slots on each ring are stored in angle order, so the candidate slot for a
+    point is found with one radius lookup and one angle division instead of
+    scanning every slot.
+    """
+
+    def __init__(self, center_x: float, center_y: float, snap_distance: float, ring_step: float = 10):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.snap_distance = snap_distance
+        self.snap_distance_sq = snap_distance * snap_distance
+        self.ring_step = ring_step
+        self.rings: List[SlotRing] = []
+        self.ring_lookup: List[int] = []  # radius bin -> index of the nearest ring
+        self.by_number: Dict[int, object] = {}
+
+    def add_ring(self, radius: float, slots: List, start_angle: float = -math.pi / 2):
+        """Add a ring of slots listed clockwise from start_angle"""
+        self.rings.append(SlotRing(radius, slots, start_angle))
+        for slot in slots:
+            self.by_number[slot.number] = slot
+        self.build_ring_lookup()
+
+    def build_ring_lookup(self):
+        """Precompute the nearest ring for every radius bin"""
+        max_radius = max(ring.radius for ring in self.rings) + self.snap_distance
+        bins = int(max_radius // self.ring_step) + 2
+        self.ring_lookup = [
+            min(range(len(self.rings)),
+                key=lambda i: abs(self.rings[i].radius - (b + 0.5) * self.ring_step))
+            for b in range(bins)
+        ]
+
+    def ring_at(self, distance: float) -> Optional[SlotRing]:
+        """Get the ring nearest to a distance from the center"""
+        b = int(distance // self.ring_step)
+        if b >= len(self.ring_lookup):
+            return None
+        return self.rings[self.ring_lookup[b]]
+
+    def slot_at(self, x: float, y: float):
+        """Get the slot within snapping distance of a point, if any"""
+        if not self.rings:
+            return None
+        dx = x - self.center_x
+        dy = y - self.center_y
+        ring = self.ring_at(math.hypot(dx, dy))
+        if ring is None:
+            return None
+
+        slot = ring.slots[ring.bucket_for(math.atan2(dy, dx))]
+        if (x - slot.x)**2 + (y - slot.y)**2 < self.snap_distance_sq:
+            return slot
+        return None
+
+    def get(self, number: int):
+        """Get the slot for a number"""
+        return self.by_number.get(number)
+
+    def nearest_free_slot(self, x: float, y: float):
+        """Get the closest unoccupied slot to a point, for snapping and hints"""
+        dx = x - self.center_x
+        dy = y - self.center_y
+        angle = math.atan2(dy, dx)
+
+        best = None
+        best_distance = float("inf")
+        for ring in self.rings:
+            # Walk outward from the point's own bucket in both directions
+            count = len(ring.slots)
+            start = ring.bucket_for(angle)
+            for step in range(count // 2 + 1):
+                found = None
+                for bucket in (start + step, start - step):
+                    slot = ring.slots[bucket % count]
+                    if not slot.occupied:
+                        distance = (x - slot.x)**2 + (y - slot.y)**2
+                        if found is None or distance < found[0]:
+                            found = (distance, slot)
+                if found is not None:
+                    if found[0] < best_distance:
+                        best_distance, best = found
+                    break
+        return best
@@ -2,34 +2,53 @@
 Sound effects management for the Hour Tower game
 """
 
+from .audio import Mixer
+
 class SoundEffects:
-    """Simple sound effect simulation"""
+    """Synthesized sound effects played through a background mixer
+
+    Playing an effect only queues it, so it is safe to call from Tk event
+    handlers. Without an audio device the effects are silently dropped;
+    pass a WavSink to record them instead. With start=False the sounds are
+    not synthesized until start() or the first effect.
+    """
     
-    def __init__(self):
+    def __init__(self, sink=None, start: bool = True):
         self.enabled = True
+        self.mixer = Mixer(sink, start=start)
+    
+    def start(self):
+        """Synthesize the sounds in the background so the first effect is not delayed"""
+        self.mixer.start()
+    
+    def play(self, name: str):
+        """Play an effect by name ("success", "error" or "victory")"""
+        if self.enabled:
+            self.mixer.play(name)
     
     def play_success(self):
         """Play success sound effect"""
-        if self.enabled:
-            # In a real implementation, this would play a chime sound
-            print("🎵 Success chime!")
+        self.play("success")
     
     def play_error(self):
         """Play error sound effect"""
-        if self.enabled:
-            # In a real implementation, this would play a gentle error sound
-            print("🔔 Gentle error sound!")
+        self.play("error")
     
     def play_victory(self):
         """Play victory sound effect"""
-        if self.enabled:
-            print("🎉 Victory fanfare!")
+        self.play("victory")
     
     def toggle(self) -> str:
         """Toggle sound effects on/off"""
         self.enabled = not self.enabled
+        if not self.enabled:
+            self.mixer.stop_all()
         return "ON" if self.enabled else "OFF"
     
     def is_enabled(self) -> bool:
         """Check if sound is enabled"""
-        return self.enabled 
\ No newline at end of file
+        return self.enabled
+    
+    def close(self):
+        """Stop the mixer"""
+        self.mixer.close()
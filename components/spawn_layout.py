@@ -0,0 +1,128 @@
+"""
+Spawn position generator for draggable numbers
+"""
+
+import math
+import random
+from typing import Dict, List, Optional, Tuple
+
+class SpawnLayout:
+    """Poisson-disk sampling of spawn positions on a clipped annulus
+
+    All positions for a round are generated in one batch with Bridson's
+    algorithm: a background grid makes each neighbour check constant time and
+    every accepted sample is tried at most ``attempts`` times, followed by a
+    fixed number of uniform throws to fill gaps in thin regions. The runtime is
+    bounded by the size of the region rather than by luck.
+    """
+
+    MAX_SHRINK_ROUNDS = 8
+    SHRINK_FACTOR = 0.85
+
+    def __init__(self, center_x: float, center_y: float, inner_radius: float, outer_radius: float,
+                 bounds: Tuple[float, float, float, float], separation: float = 56,
+                 attempts: int = 30, seed: Optional[int] = None, min_separation: Optional[float] = None):
+        self.center_x = center_x
+        self.center_y = center_y
+        self.inner_radius = inner_radius
+        self.outer_radius = outer_radius
+        self.bounds = bounds  # (left, top, right, bottom), exclusive
+        self.separation = separation
+        # generate never goes below this, by default the separation itself
+        self.min_separation = min_separation if min_separation is not None else separation
+        self.attempts = attempts
+        self.rng = random.Random(seed)
+        self.last_separation = separation
+
+    def seed(self, seed: Optional[int]):
+        """Reseed the generator so the next layouts are reproducible"""
+        self.rng.seed(seed)
+
+    def contains(self, x: float, y: float) -> bool:
+        """Check if a point is inside the spawn region"""
+        left, top, right, bottom = self.bounds
+        if not (left < x < right and top < y < bottom):
+            return False
+        distance_sq = (x - self.center_x)**2 + (y - self.center_y)**2
+        return self.inner_radius**2 <= distance_sq <= self.outer_radius**2
+
+    def random_point(self) -> Optional[Tuple[float, float]]:
+        """Pick a uniformly distributed point in the region, or None if none was found"""
+        for _ in range(self.attempts * 10):
+            angle = self.rng.uniform(0, 2 * math.pi)
+            # sqrt keeps the distribution uniform over the annulus area
+            distance = math.sqrt(self.rng.uniform(self.inner_radius**2, self.outer_radius**2))
+            x = self.center_x + distance * math.cos(angle)
+            y = self.center_y + distance * math.sin(angle)
+            if self.contains(x, y):
+                return x, y
+        return None
+
+    def sample(self, separation: float) -> List[Tuple[float, float]]:
+        """Fill the region with points at least separation apart"""
+        cell = separation / math.sqrt(2)
+        grid: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        separation_sq = separation * separation
+
+        def cell_of(x, y):
+            return int(x // cell), int(y // cell)
+
+        def is_far_enough(x, y):
+            gx, gy = cell_of(x, y)
+            for nx in range(gx - 2, gx + 3):
+                for ny in range(gy - 2, gy + 3):
+                    other = grid.get((nx, ny))
+                    if other and (x - other[0])**2 + (y - other[1])**2 < separation_sq:
+                        return False
+            return True
+
+        first = self.random_point()
+        if first is None:
+            return []
+        samples = [first]
+        grid[cell_of(*first)] = first
+        active = [first]
+
+        while active:
+            index = self.rng.randrange(len(active))
+            px, py = active[index]
+            for _ in range(self.attempts):
+                angle = self.rng.uniform(0, 2 * math.pi)
+                distance = self.rng.uniform(separation, 2 * separation)
+                x = px + distance * math.cos(angle)
+                y = py + distance * math.sin(angle)
+                if self.contains(x, y) and is_far_enough(x, y):
+                    samples.append((x, y))
+                    grid[cell_of(x, y)] = (x, y)
+                    active.append((x, y))
+                    break
+            else:
+                # No room left around this sample
+                active[index] = active[-1]
+                active.pop()
+
+        # Thin regions starve the ring search, so finish with a bounded
+        # number of uniform throws over the whole region
+        for _ in range(self.attempts * 10):
+            point = self.random_point()
+            if point is not None and is_far_enough(*point):
+                samples.append(point)
+                grid[cell_of(*point)] = point
+        return samples
+
+    def generate(self, count: int) -> List[Tuple[float, float]]:
+        """Generate count spawn positions at least the configured separation apart
+
+        If the region cannot hold count pieces at that separation, it is
+        shrunk a few times, never below ``min_separation``, and sampling is
+        retried; the value used is kept in ``last_separation``. Raises
+        ValueError if count pieces do not fit at min_separation.
+        """
+        separation = self.separation
+        for _ in range(self.MAX_SHRINK_ROUNDS):
+            samples = self.sample(separation)
+            if len(samples) >= count:
+                self.last_separation = separation
+                return self.rng.sample(samples, count)
+            separation = max(separation * self.SHRINK_FACTOR, self.min_separation)
+        raise ValueError(f"Spawn region cannot hold {count} pieces {self.min_separation:g} apart")
@@ -0,0 +1,171 @@
+"""
+Cache of pre-rendered glowing shapes
+"""
+
+import base64
+import contextlib
+import hashlib
+import os
+import tkinter as tk
+from collections import OrderedDict
+from typing import Optional, Tuple
+from .per_canvas import PerCanvas
+from .raster import Raster
+
+class SpriteCache(PerCanvas):
+    """Renders each glowing shape once into an image, with LRU eviction
+
+    Sprites replace the stacks of stippled outline items that used to fake a
+    glow: one image item carries the fill, outline and glow. Images are keyed
+    on every parameter that affects their pixels. Evicting a sprite only drops
+    the cache's reference, so items still showing it keep working.
+
+    Without a Tk master (for example on the headless stub canvas) the Raster
+    itself is stored in place of a PhotoImage.
+
+    With a disk_dir, encoded PNGs are also kept on disk between runs, so
+    only the first start on a machine pays for rasterizing. Each window
+    scale renders its own set, so past max_disk_files the least recently
+    used files are removed, when the cache is first used and then after
+    every PRUNE_EVERY new files.
+
+    Sizes are given for the 800x600 design layout and rendered at the
+    current layout scale.
+    """
+
+    MAX_SPRITES = 64
+    MAX_DISK_FILES = 256  # About eight window scales
+    PRUNE_EVERY = 64  # New files written between prunes
+    RENDER_VERSION = 1  # Bump when rendering changes so older files on disk are not used
+
+    def __init__(self, master=None, max_sprites: int = MAX_SPRITES, disk_dir: Optional[str] = None,
+                 max_disk_files: int = MAX_DISK_FILES):
+        self.master = master
+        self.max_sprites = max_sprites
+        self.disk_dir = disk_dir
+        self.max_disk_files = max_disk_files
+        self.unpruned = None  # Files written since the disk cache was last pruned, None until the first prune
+        self.scale = 1.0  # Set by the Layout when the window is resized
+        self.sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def get(self, shape: str, width: int, height: int, fill: str = "", outline: str = "",
+            outline_width: int = 0, glow_color: str = "", glow: int = 0, alpha: float = 1.0):
+        """Get the image for a shape ("circle", "ring", "rect" or "halo")
+
+        width and height are the size of the shape itself; the image is
+        larger by the glow on every side and is meant to be centered on the
+        shape's center.
+        """
+        if self.scale != 1.0:
+            width, height = round(width * self.scale), round(height * self.scale)
+            outline_width, glow = round(outline_width * self.scale), round(glow * self.scale)
+        key = (shape, width, height, fill, outline, outline_width, glow_color, glow, alpha)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = self.load(key)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    @staticmethod
+    def sprite_size(width: int, height: int, outline_width: int, glow: int) -> Tuple[int, int]:
+        """Get the image size needed for a shape"""
+        margin = glow + outline_width + 2
+        return width + 2 * margin, height + 2 * margin
+
+    def render(self, shape: str, width: int, height: int, fill: str, outline: str,
+               outline_width: int, glow_color: str, glow: int, alpha: float) -> Raster:
+        """Rasterize a shape with its glow"""
+        image_width, image_height = self.sprite_size(width, height, outline_width, glow)
+        raster = Raster(image_width, image_height)
+        cx = image_width / 2
+        cy = image_height / 2
+
+        if shape in ("circle", "ring"):
+            radius = width / 2
+            if glow and glow_color:
+                raster.glow_circle(cx, cy, radius + outline_width / 2, glow, glow_color)
+            if shape == "circle" and fill:
+                raster.fill_circle(cx, cy, radius, fill, alpha)
+            if outline and outline_width:
+                raster.stroke_circle(cx, cy, radius, outline_width, outline, alpha)
+        elif shape == "rect":
+            x0, y0 = cx - width / 2, cy - height / 2
+            x1, y1 = cx + width / 2, cy + height / 2
+            if glow and glow_color:
+                half = outline_width / 2
+                raster.glow_rect(x0 - half, y0 - half, x1 + half, y1 + half, glow, glow_color)
+            if fill:
+                raster.fill_rect(x0, y0, x1, y1, fill, alpha)
+            if outline and outline_width:
+                raster.stroke_rect(x0, y0, x1, y1, outline_width, outline, alpha)
+        elif shape == "halo":
+            # A soft elliptical glow, drawn as a stretched circle
+            raster.shade_rect(cx - width / 2 + height / 2, cy, cx + width / 2 - height / 2, cy, height / 2 + glow,
+                              lambda d: 0.5 * alpha * max(1 - d / (height / 2 + glow), 0) ** 2, glow_color or fill)
+        else:
+            raise ValueError(f"Unknown sprite shape: {shape}")
+        return raster
+
+    def load(self, key: Tuple):
+        """Make the image for a key, from the disk cache when it has one"""
+        if self.disk_dir is None or not isinstance(self.master, tk.Misc):
+            return self.make_image(self.render(*key))
+
+        if self.unpruned is None or self.unpruned >= self.PRUNE_EVERY:
+            self.prune_disk()
+        name = hashlib.sha1(repr((self.RENDER_VERSION,) + key).encode()).hexdigest()
+        path = os.path.join(self.disk_dir, f"{name}.png")
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+            self.disk_hits += 1
+        except OSError:
+            png = self.render(*key).to_png()
+            try:
+                # Write then rename, so a crash never leaves a truncated PNG behind
+                os.makedirs(self.disk_dir, exist_ok=True)
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(png)
+                os.replace(temp_path, path)
+                self.unpruned += 1
+            except OSError:
+                pass
+        else:
+            with contextlib.suppress(OSError):
+                os.utime(path)  # Mark it recently used so pruning keeps it
+        return self.photo(png)
+
+    def prune_disk(self):
+        """Remove the least recently used PNGs past max_disk_files"""
+        self.unpruned = 0
+        try:
+            files = [entry for entry in os.scandir(self.disk_dir) if entry.name.endswith(".png")]
+            if len(files) <= self.max_disk_files:
+                return
+            files.sort(key=lambda entry: entry.stat().st_mtime)
+            for entry in files[:len(files) - self.max_disk_files]:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+    def make_image(self, raster: Raster):
+        """Turn a raster into something create_image can show"""
+        if not isinstance(self.master, tk.Misc):
+            return raster
+        return self.photo(raster.to_png())
+
+    def photo(self, png: bytes) -> tk.PhotoImage:
+        """Load PNG data as a PhotoImage"""
+        data = base64.b64encode(png).decode("ascii")
+        return tk.PhotoImage(master=self.master, data=data, format="png")
@@ -3,47 +3,109 @@ Clock tower building component
 """
 
 import tkinter as tk
+from typing import Optional
+from .animation import Animator
 from .colors import NeonColors
+from .fonts import FontBook
+from .engine import TowerState
+from .layout import Layout
+from .pulse import Pulser
+from .sprites import SpriteCache
+from .update_queue import UpdateQueue
 
 class TowerBlock:
     """Represents a block in the clock tower"""
     
-    def __init__(self, canvas: tk.Canvas, x: int, y: int, width: int, height: int, color: str):
+    def __init__(self, canvas: tk.Canvas, x: int, y: int, width: int, height: int, color: str,
+                 tags=(), sprites: Optional[SpriteCache] = None):
         self.canvas = canvas
+        self.sprites = sprites if sprites is not None else SpriteCache.for_canvas(canvas)
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.layout = Layout.for_canvas(canvas)
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.color = color
+        self.tag = f"tower_block_{id(self)}"
+        tags = (self.tag,) + tuple(tags)
         
-        # Create block with glow effect
-        self.rect = canvas.create_rectangle(
-            x, y, x + width, y + height,
-            fill=color, outline=NeonColors.WHITE, width=3
-        )
-        
-        # Add glow effect
-        self.glow1 = canvas.create_rectangle(
-            x - 2, y - 2, x + width + 2, y + height + 2,
-            outline=color, width=2, stipple="gray50"
-        )
-        self.glow2 = canvas.create_rectangle(
-            x - 4, y - 4, x + width + 4, y + height + 4,
-            outline=color, width=1, stipple="gray25"
-        )
+        # Block, outline and glow are one pre-rendered sprite
+        self.image = self.sprite(color)
+        self.rect = canvas.create_image(*self.layout.to_screen(x + width / 2, y + height / 2),
+                                        image=self.image, tags=tags)
+    
+    def sprite(self, color: str):
+        """Get the block sprite in a color"""
+        return self.sprites.get("rect", self.width, self.height, fill=color, outline=NeonColors.WHITE,
+                                outline_width=3, glow_color=color, glow=4)
+    
+    def rescale(self):
+        """Redraw the sprite after the layout scale changed"""
+        self.image = self.sprite(self.color)
+        self.updates.itemconfig(self.rect, image=self.image)
+    
+    def show(self, color: str):
+        """Show the block again, recolouring it if needed"""
+        self.updates.itemconfig(self.tag, state=tk.NORMAL)
+        self.recolor(color)
+    
+    def recolor(self, color: str):
+        """Draw the block in another color"""
+        if color != self.color:
+            self.color = color
+            self.image = self.sprite(color)
+            self.updates.itemconfig(self.rect, image=self.image)
+    
+    def hide(self):
+        """Hide the block, keeping its items for reuse"""
+        self.updates.itemconfig(self.tag, state=tk.HIDDEN)
+    
+    def drop_in(self, fraction: float):
+        """Draw the block falling onto the tower, 1.0 is in place"""
+        eased = 1 - (1 - fraction) ** 2
+        drop = self.height * (1 - eased)
+        self.updates.coords(self.rect, self.x + self.width / 2, self.y + self.height / 2 - drop)
 
 class ClockTower:
-    """The clock tower building area"""
+    """Renders the clock tower building area for a TowerState
+    
+    However tall the tower grows, only the blocks that fit are drawn, on a
+    fixed set of block items. Once the tower is taller than that, the bottom
+    block stands for every block below the window and is labelled with how
+    many it holds, so the canvas item count never grows.
+    """
     
-    def __init__(self, canvas: tk.Canvas, x: int, y: int, width: int, height: int):
+    BLOCK_TAG = "tower_block"
+    BELL_TAG = "tower_bell"
+    DROP_MS = 400
+    PROGRESS_MS = 200
+    BLOCK_SPACING = 40
+    BLOCK_HEIGHT = 35
+    
+    def __init__(self, canvas: tk.Canvas, x: int, y: int, width: int, height: int,
+                 state: Optional[TowerState] = None, animator: Optional[Animator] = None,
+                 pulser: Optional[Pulser] = None):
         self.canvas = canvas
+        self.animator = animator if animator is not None else Animator.for_canvas(canvas)
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.layout = Layout.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
         self.x = x
         self.y = y
         self.width = width
         self.height = height
-        self.blocks = []
-        self.progress = 0
-        self.max_progress = 12  # Need 12 correct answers to complete a block
+        self.state = state if state is not None else TowerState()
+        self.block_cache = []  # One block item per visible position, recoloured as the tower grows
+        self.visible = 0  # Positions currently showing a block
+        self.drawn = 0  # Blocks in the state when the tower was last drawn
+        self.bell = None
+        self.bell_top = None
+        self.base_label = None
+        self.fill_width = 0
+        
+        # Keep space for the title, the progress bar and the bell above the top block
+        self.capacity = max(int((height - 195) // self.BLOCK_SPACING) + 1, 1)
         
         # Create tower background
         self.background = canvas.create_rectangle(
@@ -54,7 +116,7 @@ class ClockTower:
         # Create tower title
         self.title = canvas.create_text(
             x + width // 2, y + 30,
-            text="CLOCK TOWER", font=("Permanent Marker", 16, "bold"),
+            text="CLOCK TOWER", font=self.fonts.get(16),
             fill=NeonColors.WHITE
         )
         
@@ -71,81 +133,156 @@ class ClockTower:
         # Create progress text
         self.progress_text = canvas.create_text(
             x + width // 2, y + 100,
-            text="0/12 Numbers Placed", font=("Permanent Marker", 12, "bold"),
+            text="0/12 Numbers Placed", font=self.fonts.get(12),
             fill=NeonColors.WHITE
         )
+        
+        # The frame and the progress bar glow while the tower waits for its next block
+        self.pulser = pulser if pulser is not None else Pulser.for_canvas(canvas)
+        self.pulser.add(self.background, "outline", NeonColors.DEEP_PURPLE, NeonColors.HOT_MAGENTA, phase=0.25)
+        self.pulser.add(self.progress_fill, "fill", NeonColors.LIME_GREEN,
+                        NeonColors.blend(NeonColors.LIME_GREEN, NeonColors.WHITE, 0.5), phase=0.25)
+    
+    @property
+    def progress(self) -> int:
+        return self.state.progress
+    
+    @property
+    def max_progress(self) -> int:
+        return self.state.max_progress
     
     def add_progress(self):
         """Add progress toward completing a tower block"""
-        self.progress += 1
+        self.state.add_progress()
+        self.sync()
+    
+    def sync(self):
+        """Redraw the progress bar and blocks from the tower state"""
         progress_ratio = self.progress / self.max_progress
         
-        # Update progress bar
+        # Slide the progress bar to its new width
         fill_width = int((self.width - 44) * progress_ratio)
-        self.canvas.coords(self.progress_fill, 
-                          self.x + 22, self.y + 62,
-                          self.x + 22 + fill_width, self.y + 78)
+        if fill_width != self.fill_width:
+            start_width = self.fill_width
+            self.animator.animate(
+                "tower_progress", self.PROGRESS_MS,
+                lambda progress: self.set_fill(start_width + (fill_width - start_width) * progress)
+            )
+        else:
+            self.animator.cancel("tower_progress")
         
         # Update progress text
-        self.canvas.itemconfig(self.progress_text, 
-                              text=f"{self.progress}/{self.max_progress} Numbers Placed")
+        self.updates.itemconfig(self.progress_text,
+                               text=f"{self.progress}/{self.max_progress} Numbers Placed")
+        
+        blocks = self.state.blocks
+        if not blocks:
+            if self.visible:
+                # Hide every block, the label and the bell with one call each
+                self.animator.cancel_prefix("drop_")
+                self.updates.itemconfig(self.BLOCK_TAG, state=tk.HIDDEN)
+                self.updates.itemconfig(self.BELL_TAG, state=tk.HIDDEN)
+                self.visible = 0
+            self.drawn = 0
+            return
         
-        # Check if block is complete
-        if self.progress >= self.max_progress:
-            self.add_block()
-            self.progress = 0
-            self.canvas.coords(self.progress_fill, self.x + 22, self.y + 62, self.x + 22, self.y + 78)
-            self.canvas.itemconfig(self.progress_text, text="0/12 Numbers Placed")
-    
-    def add_block(self):
-        """Add a new block to the tower"""
-        block_y = self.y + self.height - 40 - (len(self.blocks) * 40)
-        if block_y > self.y + 120:  # Keep space for title and progress
-            colors = NeonColors.get_neon_palette()
-            color = colors[len(self.blocks) % len(colors)]
-            
-            block = TowerBlock(self.canvas, self.x + 20, block_y, self.width - 40, 35, color)
-            self.blocks.append(block)
-            
-            # Add bell to the top if this is the first block
-            if len(self.blocks) == 1:
-                self.add_bell(block_y - 30)
-    
-    def add_bell(self, y_pos: int):
-        """Add a bell to the top of the tower"""
+        # Draw the top of the tower; the bottom position stands for everything below it
+        count = len(blocks)
+        start = max(count - self.capacity, 0)
+        visible = count - start
+        added = count - self.drawn if count > self.drawn else 0
+        colors = NeonColors.get_neon_palette()
+        for i in range(visible):
+            color = colors[blocks[start + i] % len(colors)]
+            if i < self.visible:
+                self.block_cache[i].recolor(color)
+            else:
+                self.show_block(i, color)
+            if i >= visible - added:
+                self.drop_block(self.block_cache[i])
+        for i in range(visible, self.visible):
+            self.remove_block(self.block_cache[i])
+        if visible != self.visible:
+            self.place_bell(self.slot_y(visible - 1) - 30)
+        self.visible = visible
+        self.drawn = count
+        self.label_base(start + 1 if start else 0)
+    
+    def set_fill(self, fill_width: float):
+        """Set the width of the progress bar fill"""
+        self.fill_width = fill_width
+        self.updates.coords(self.progress_fill,
+                            self.x + 22, self.y + 62,
+                            self.x + 22 + fill_width, self.y + 78)
+    
+    def slot_y(self, index: int) -> int:
+        """Top of the block drawn at a position, 0 is the bottom"""
+        return self.y + self.height - 40 - index * self.BLOCK_SPACING
+    
+    def show_block(self, index: int, color: str):
+        """Show a block at a position, creating its item the first time"""
+        if index < len(self.block_cache):
+            self.block_cache[index].show(color)
+        else:
+            self.block_cache.append(TowerBlock(self.canvas, self.x + 20, self.slot_y(index), self.width - 40,
+                                               self.BLOCK_HEIGHT, color, tags=(self.BLOCK_TAG,)))
+    
+    def drop_block(self, block: TowerBlock):
+        """Drop a new block into place"""
+        block.drop_in(0)
+        self.animator.animate(f"drop_{block.tag}", self.DROP_MS, block.drop_in)
+    
+    def remove_block(self, block: TowerBlock):
+        """Hide a block's items"""
+        self.animator.cancel(f"drop_{block.tag}")
+        block.hide()
+    
+    def label_base(self, count: int):
+        """Show how many blocks the bottom position stands for, 0 hides the label"""
+        if not count:
+            if self.base_label is not None:
+                self.updates.itemconfig(self.base_label, state=tk.HIDDEN)
+            return
+        text = f"x{count}"
+        if self.base_label is None:
+            # Created once the bottom block exists, so it is drawn above it
+            base = self.block_cache[0]
+            self.base_label = self.canvas.create_text(
+                *self.layout.to_screen(base.x + base.width / 2, base.y + base.height / 2),
+                text=text, font=self.fonts.get(14), fill=NeonColors.WHITE, tags=(self.BLOCK_TAG,)
+            )
+        else:
+            self.updates.itemconfig(self.base_label, text=text, state=tk.NORMAL)
+    
+    def place_bell(self, y_pos: int):
+        """Put the bell on top of the tower"""
         bell_x = self.x + self.width // 2
-        bell_y = y_pos
+        if self.bell is not None:
+            self.updates.coords(self.bell, bell_x - 15, y_pos, bell_x + 15, y_pos + 30)
+            self.updates.coords(self.bell_top, bell_x - 8, y_pos - 8, bell_x + 8, y_pos + 8)
+            self.updates.itemconfig(self.BELL_TAG, state=tk.NORMAL)
+            return
         
         # Bell body
         self.bell = self.canvas.create_oval(
-            bell_x - 15, bell_y, bell_x + 15, bell_y + 30,
-            fill=NeonColors.GOLDEN_YELLOW, outline=NeonColors.WHITE, width=2
+            *self.layout.to_screen(bell_x - 15, y_pos, bell_x + 15, y_pos + 30),
+            fill=NeonColors.GOLDEN_YELLOW, outline=NeonColors.WHITE, width=2,
+            tags=(self.BELL_TAG,)
         )
         
         # Bell top
         self.bell_top = self.canvas.create_oval(
-            bell_x - 8, bell_y - 8, bell_x + 8, bell_y + 8,
-            fill=NeonColors.ORANGE, outline=NeonColors.WHITE, width=2
+            *self.layout.to_screen(bell_x - 8, y_pos - 8, bell_x + 8, y_pos + 8),
+            fill=NeonColors.ORANGE, outline=NeonColors.WHITE, width=2,
+            tags=(self.BELL_TAG,)
         )
     
+    def rescale(self):
+        """Redraw the block sprites after the layout scale changed"""
+        for block in self.block_cache:
+            block.rescale()
+    
     def reset(self):
         """Reset the tower to initial state"""
-        # Remove all blocks
-        for block in self.blocks:
-            self.canvas.delete(block.rect)
-            self.canvas.delete(block.glow1)
-            self.canvas.delete(block.glow2)
-        
-        self.blocks.clear()
-        
-        # Reset progress
-        self.progress = 0
-        self.canvas.coords(self.progress_fill, self.x + 22, self.y + 62, self.x + 22, self.y + 78)
-        self.canvas.itemconfig(self.progress_text, text="0/12 Numbers Placed")
-        
-        # Remove bell if it exists
-        if hasattr(self, 'bell'):
-            self.canvas.delete(self.bell)
-            self.canvas.delete(self.bell_top)
-            delattr(self, 'bell')
-            delattr(self, 'bell_top') 
\ No newline at end of file
+        self.state.reset()
+        self.sync()
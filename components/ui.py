@@ -3,14 +3,26 @@ UI components for the Hour Tower game
 """
 
 import tkinter as tk
+from typing import Optional
+from .animation import Animator
 from .colors import NeonColors
+from .fonts import FontBook
+from .hit_grid import HitGrid
+from .layout import Layout
+from .metrics import Metrics
+from .pulse import Pulser
+from .sprites import SpriteCache
+from .update_queue import UpdateQueue
 
 class NeonButton:
     """A neon-styled button for the interface"""
     
     def __init__(self, canvas: tk.Canvas, x: int, y: int, width: int, height: int, 
-                 text: str, command, color: str = NeonColors.ORANGE):
+                 text: str, command, color: str = NeonColors.ORANGE,
+                 sprites: Optional[SpriteCache] = None, pulser: Optional[Pulser] = None):
         self.canvas = canvas
+        self.sprites = sprites if sprites is not None else SpriteCache.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
         self.x = x
         self.y = y
         self.width = width
@@ -19,37 +31,42 @@ class NeonButton:
         self.command = command
         self.color = color
         
-        # Create button background with glow effect
-        self.background = canvas.create_rectangle(
-            x, y, x + width, y + height,
-            fill=color, outline=NeonColors.WHITE, width=3
-        )
+        self.tag = f"button_{id(self)}"
         
-        # Add glow effect
-        self.glow1 = canvas.create_rectangle(
-            x - 2, y - 2, x + width + 2, y + height + 2,
-            outline=color, width=2, stipple="gray50"
-        )
-        self.glow2 = canvas.create_rectangle(
-            x - 4, y - 4, x + width + 4, y + height + 4,
-            outline=color, width=1, stipple="gray25"
-        )
+        # Button background, outline and glow are one pre-rendered sprite
+        self.image = self.sprite()
+        self.background = canvas.create_image(x + width / 2, y + height / 2, image=self.image, tags=(self.tag,))
         
         # Create button text
         self.text_item = canvas.create_text(
             x + width // 2, y + height // 2,
-            text=text, font=("Permanent Marker", 14, "bold"),
-            fill=NeonColors.WHITE
+            text=text, font=self.fonts.get(14),
+            fill=NeonColors.WHITE, tags=(self.tag,)
         )
         
-        # Bind click events
-        canvas.tag_bind(self.background, "<Button-1>", self.on_click)
-        canvas.tag_bind(self.text_item, "<Button-1>", self.on_click)
+        # Every button label glows on the same beat
+        self.pulser = pulser if pulser is not None else Pulser.for_canvas(canvas)
+        self.pulser.add(self.text_item, "fill", NeonColors.WHITE, NeonColors.blend(NeonColors.WHITE, color, 0.4),
+                        phase=0.5)
+        
+        # Clicks are found by the canvas's hit grid
+        HitGrid.for_canvas(canvas).add(self, (x, y, x + width, y + height), self.on_click, tag=self.tag)
+    
+    def sprite(self):
+        """Get the button sprite"""
+        return self.sprites.get("rect", self.width, self.height, fill=self.color, outline=NeonColors.WHITE,
+                                outline_width=3, glow_color=self.color, glow=4)
+    
+    def rescale(self):
+        """Redraw the sprite after the layout scale changed"""
+        self.image = self.sprite()
+        self.canvas.itemconfig(self.background, image=self.image)
     
     def on_click(self, event):
         """Handle button click"""
         if self.command:
-            self.command()
+            with Metrics.for_canvas(self.canvas).timed("button_click"):
+                self.command()
     
     def update_text(self, new_text: str):
         """Update button text"""
@@ -58,35 +75,53 @@ class NeonButton:
 class GameTitle:
     """Main title component with glow effects"""
     
-    def __init__(self, canvas: tk.Canvas, x: int, y: int):
+    def __init__(self, canvas: tk.Canvas, x: int, y: int, sprites: Optional[SpriteCache] = None,
+                 glow: bool = True):
         self.canvas = canvas
+        self.sprites = sprites if sprites is not None else SpriteCache.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
+        self.layout = Layout.for_canvas(canvas)
         self.x = x
         self.y = y
-        
-        # Title glow effects
-        self.title_glow1 = canvas.create_text(
-            x, y, text="HOUR TOWER",
-            font=("Permanent Marker", 36, "bold"),
-            fill=NeonColors.DEEP_PURPLE
-        )
-        self.title_glow2 = canvas.create_text(
-            x, y, text="HOUR TOWER",
-            font=("Permanent Marker", 36, "bold"),
-            fill=NeonColors.DEEP_PURPLE, stipple="gray50"
-        )
+        self.glow_image = None
+        self.title_glow = None
         
         # Main title
         self.title = canvas.create_text(
             x, y, text="HOUR TOWER",
-            font=("Permanent Marker", 36, "bold"),
+            font=self.fonts.get(36),
             fill=NeonColors.WHITE
         )
+        
+        # The glow is decoration, so callers in a hurry can add it after the first frame
+        if glow:
+            self.add_glow()
+    
+    def add_glow(self):
+        """Add the title glow, a soft pre-rendered halo behind the text"""
+        if self.title_glow is not None:
+            return
+        self.glow_image = self.sprite()
+        self.title_glow = self.canvas.create_image(*self.layout.to_screen(self.x, self.y), image=self.glow_image)
+        self.canvas.tag_lower(self.title_glow, self.title)
+    
+    def sprite(self):
+        """Get the title glow sprite"""
+        return self.sprites.get("halo", 340, 40, glow_color=NeonColors.DEEP_PURPLE, glow=14)
+    
+    def rescale(self):
+        """Redraw the glow after the layout scale changed"""
+        if self.title_glow is not None:
+            self.glow_image = self.sprite()
+            self.canvas.itemconfig(self.title_glow, image=self.glow_image)
 
 class ScoreDisplay:
     """Score display component"""
     
     def __init__(self, canvas: tk.Canvas, x: int, y: int):
         self.canvas = canvas
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
         self.x = x
         self.y = y
         self.score = 0
@@ -94,14 +129,14 @@ class ScoreDisplay:
         # Create score text
         self.score_text = canvas.create_text(
             x, y, text="Score: 0",
-            font=("Permanent Marker", 18, "bold"),
+            font=self.fonts.get(18),
             fill=NeonColors.GOLDEN_YELLOW
         )
     
     def update_score(self, new_score: int):
         """Update the displayed score"""
         self.score = new_score
-        self.canvas.itemconfig(self.score_text, text=f"Score: {self.score}")
+        self.updates.itemconfig(self.score_text, text=f"Score: {self.score}")
     
     def reset(self):
         """Reset score to 0"""
@@ -110,33 +145,46 @@ class ScoreDisplay:
 class MessageDisplay:
     """Temporary message display component"""
     
-    def __init__(self, canvas: tk.Canvas, x: int, y: int):
+    FADE_MS = 300  # The message fades out over the end of its duration
+    
+    def __init__(self, canvas: tk.Canvas, x: int, y: int, animator: Optional[Animator] = None):
         self.canvas = canvas
+        self.animator = animator if animator is not None else Animator.for_canvas(canvas)
+        self.updates = UpdateQueue.for_canvas(canvas)
+        self.layout = Layout.for_canvas(canvas)
+        self.fonts = FontBook.for_canvas(canvas)
         self.x = x
         self.y = y
         self.current_message = None
     
     def show_message(self, text: str, color: str = NeonColors.HOT_MAGENTA, duration: int = 2000):
         """Show a temporary message"""
-        # Remove any existing message
         if self.current_message:
-            self.canvas.delete(self.current_message)
+            # Reuse the existing message item
+            self.updates.itemconfig(self.current_message, text=text, fill=color, state=tk.NORMAL)
+            self.canvas.tag_raise(self.current_message)
+        else:
+            # Create new message
+            self.current_message = self.canvas.create_text(
+                *self.layout.to_screen(self.x, self.y), text=text,
+                font=self.fonts.get(24),
+                fill=color
+            )
         
-        # Create new message
-        self.current_message = self.canvas.create_text(
-            self.x, self.y, text=text,
-            font=("Permanent Marker", 24, "bold"),
-            fill=color
-        )
+        def fade_step(progress: float):
+            self.updates.itemconfig(self.current_message, fill=NeonColors.blend(color, NeonColors.BLACK, progress))
         
-        # Remove message after duration
-        self.canvas.after(duration, self.clear_message)
+        # Fade and remove the message after duration, replacing any pending
+        # fade so an older message can never clear this one
+        fade_ms = min(self.FADE_MS, duration)
+        self.animator.animate("message", fade_ms, fade_step, on_done=self.clear_message,
+                              delay_ms=duration - fade_ms)
     
     def clear_message(self):
         """Clear the current message"""
+        self.animator.cancel("message")
         if self.current_message:
-            self.canvas.delete(self.current_message)
-            self.current_message = None
+            self.updates.itemconfig(self.current_message, state=tk.HIDDEN)
     
     def show_error(self, text: str = "Try Again!"):
         """Show error message"""
@@ -148,4 +196,49 @@ class MessageDisplay:
     
     def show_victory(self, text: str = "AMAZING! Clock Complete!"):
         """Show victory message"""
-        self.show_message(text, NeonColors.LIME_GREEN, 3000) 
\ No newline at end of file
+        self.show_message(text, NeonColors.LIME_GREEN, 3000) 
+
+class MetricsOverlay:
+    """Toggleable corner overlay showing live runtime metrics"""
+    
+    TIMERS = ("frame", "frame_late", "on_drag", "on_release", "button_click")
+    
+    def __init__(self, canvas: tk.Canvas, x: int, y: int):
+        self.canvas = canvas
+        self.layout = Layout.for_canvas(canvas)
+        self.x = x
+        self.y = y
+        self.visible = False
+        self.text = None
+    
+    def toggle(self, snapshot: Optional[dict] = None):
+        """Show or hide the overlay"""
+        self.visible = not self.visible
+        if self.visible:
+            self.update(snapshot or {})
+        elif self.text is not None:
+            self.canvas.itemconfig(self.text, state=tk.HIDDEN)
+    
+    def update(self, snapshot: dict):
+        """Redraw the overlay from a metrics snapshot"""
+        timers = snapshot.get("timers", {})
+        lines = []
+        for name in self.TIMERS:
+            timer = timers.get(name)
+            if timer and timer.get("count"):
+                lines.append(f"{name:<13}p95 {timer['p95_ms']:7.2f} ms  max {timer['recent_max_ms']:7.2f} ms")
+        gauges = snapshot.get("gauges", {})
+        lines.append(f"canvas items {gauges.get('canvas_items', 0):>5}   pending after {gauges.get('pending_after', 0)}")
+        per_minute = snapshot.get("per_minute", {})
+        lines.append(f"placements   {per_minute.get('placements', 0):>5} per minute")
+        lines.append(f"dropped moves {per_minute.get('dropped_motion_events', 0):>4} per minute   "
+                     f"total {snapshot.get('counters', {}).get('dropped_motion_events', 0)}")
+        text = "\n".join(lines)
+        
+        if self.text is None:
+            self.text = self.canvas.create_text(*self.layout.to_screen(self.x, self.y),
+                                                text=text, anchor=tk.NW,
+                                                font="TkFixedFont", fill=NeonColors.LIME_GREEN)
+        else:
+            self.canvas.itemconfig(self.text, text=text, state=tk.NORMAL)
+        self.canvas.tag_raise(self.text)
@@ -0,0 +1,94 @@
+"""
+Per-frame queue of canvas writes for the Hour Tower canvas
+"""
+
+import tkinter as tk
+from typing import Dict, Tuple
+from .layout import Layout
+from .per_canvas import PerCanvas
+
+class UpdateQueue(PerCanvas):
+    """Collects coords and itemconfig writes and applies them once per frame
+
+    Components post the state they want an item to end up in instead of
+    writing it straight away. Repeated writes to the same item merge: a
+    later coords replaces the earlier one, and itemconfig options are
+    combined with the newest value winning. The queue is flushed by the
+    Animator at the end of each tick, or from an idle callback when nothing
+    is animating, so a burst of state changes costs one Tk call per item.
+
+    Coordinates are in design units and mapped to the window by the Layout
+    when they are applied.
+
+    Only item ids are queued. A write to a tag may match items created
+    after it was posted, so it flushes the queue and is applied at once,
+    unless it is posted with itemconfig_group.
+    """
+
+    def __init__(self, canvas: tk.Canvas):
+        self.canvas = canvas
+        self.layout = Layout.for_canvas(canvas)
+        self.pending: Dict[Tuple[int, str], object] = {}  # Insertion ordered, by item then kind
+        self.after_id = None
+        self.posted = 0
+        self.applied = 0
+
+    def coords(self, item, *coords):
+        """Move an item on the next flush"""
+        if isinstance(item, str):
+            self.flush()
+            self.canvas.coords(item, *self.layout.to_screen(*coords))
+            return
+        self.post((item, "coords"), coords)
+
+    def itemconfig(self, item, **options):
+        """Configure an item on the next flush"""
+        if isinstance(item, str):
+            self.flush()
+            self.canvas.itemconfig(item, **options)
+            return
+        self.post_config(item, options)
+
+    def itemconfig_group(self, tag: str, **options):
+        """Configure every item with a tag on the next flush, whichever items have it by then
+
+        Only for tags every member should follow from the moment it joins,
+        such as a pulse group, so the write can wait for the frame instead
+        of flushing the queue.
+        """
+        self.post_config(tag, options)
+
+    def post_config(self, item, options: Dict):
+        key = (item, "config")
+        merged = self.pending.pop(key, None)
+        if merged is not None:
+            merged.update(options)
+            options = merged
+        self.post(key, options)
+
+    def post(self, key: Tuple[int, str], value):
+        # Writes are applied in the order of their latest update
+        self.pending.pop(key, None)
+        self.pending[key] = value
+        self.posted += 1
+        if self.after_id is None:
+            self.after_id = self.canvas.after_idle(self.on_idle)
+
+    def on_idle(self):
+        self.after_id = None
+        self.flush()
+
+    def flush(self):
+        """Apply every pending write"""
+        if self.after_id is not None:
+            self.canvas.after_cancel(self.after_id)
+            self.after_id = None
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        for (item, kind), value in pending.items():
+            if kind == "coords":
+                self.canvas.coords(item, *self.layout.to_screen(*value))
+            else:
+                self.canvas.itemconfig(item, **value)
+        self.applied += len(pending)
@@ -0,0 +1,55 @@
+"""
+Hour Tower - Classroom session host
+Serves many independent game sessions from one process
+"""
+
+import argparse
+import asyncio
+import sys
+
+from components.event_log import EventLog, recover
+from components.session_host import SessionHost
+
+async def run(args):
+    """Start the host and serve until interrupted"""
+    event_log = None
+    recovered = None
+    if args.log:
+        recovered = recover(args.log)
+        event_log = EventLog(args.log)
+    host = SessionHost(max_sessions=args.max_sessions, event_log=event_log, recovered=recovered)
+    try:
+        await serve(host, args)
+    finally:
+        if event_log is not None:
+            event_log.close()
+
+async def serve(host, args):
+    """Listen on the requested socket and serve forever"""
+    if args.socket:
+        await host.start_unix(args.socket)
+        print(f"Hour Tower host listening on {args.socket}", flush=True)
+    else:
+        server = await host.start_tcp("127.0.0.1", args.port)
+        port = server.sockets[0].getsockname()[1]
+        print(f"Hour Tower host listening on 127.0.0.1:{port}", flush=True)
+    await host.serve_forever()
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Serve Hour Tower game sessions over JSON lines")
+    parser.add_argument("--socket", help="Unix socket path (default: local TCP)")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port when no socket is given")
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--log", help="Event log file to record progress in and resume games from")
+    args = parser.parse_args()
+
+    if args.socket and not hasattr(asyncio, "start_unix_server"):
+        sys.exit("Unix sockets are not available on this platform, use --port")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
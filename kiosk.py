@@ -0,0 +1,193 @@
+"""
+Hour Tower - Kiosk farm
+Runs a wall of game stations on one machine with a shared leaderboard
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import sys
+import time
+import tkinter as tk
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from components.colors import NeonColors
+from components.fonts import FontBook
+from components.leaderboard import Leaderboard
+from main import DATA_DIR, HourTowerGame
+
+DEFAULT_NAME = "hour_tower_leaderboard"
+
+def run_station(station: int, board_name: str, user: str, data_dir, tile=None) -> int:
+    """Play one station until the window is closed or the launcher asks it to quit
+
+    Runs in a worker process. tile is (columns, rows) to place the window
+    in its share of the screen.
+    """
+    leaderboard = Leaderboard.open(board_name)
+    log_path = metrics_path = None
+    if data_dir is not None:
+        station_dir = os.path.join(data_dir, f"station{station + 1}")
+        log_path = os.path.join(station_dir, "events.log")
+        metrics_path = os.path.join(station_dir, "metrics.jsonl")
+    game = HourTowerGame(user, log_path, metrics_path=metrics_path)
+    game.root.title(f"Hour Tower - Station {station + 1}")
+    if tile is not None:
+        columns, rows = tile
+        width = game.root.winfo_screenwidth() // columns
+        height = game.root.winfo_screenheight() // rows
+        game.root.minsize(1, 1)  # The layout scales the game down to fit a tile
+        game.root.geometry(f"{width}x{height}+{station % columns * width}+{station // columns * height}")
+    publisher = leaderboard.publish(station, game.game_logic.engine)
+
+    def check_closing():
+        if leaderboard.closing:
+            game.close()
+        else:
+            game.root.after(LeaderboardDisplay.POLL_MS, check_closing)
+
+    game.root.after(LeaderboardDisplay.POLL_MS, check_closing)
+    try:
+        game.run()
+    finally:
+        publisher.close()
+        leaderboard.close()
+    return station
+
+def format_time(seconds: float) -> str:
+    return f"{int(seconds // 60)}:{seconds % 60:04.1f}" if seconds else "-"
+
+class LeaderboardDisplay:
+    """A window ranking every station, polled from the shared leaderboard"""
+
+    POLL_MS = 250
+    ROW_HEIGHT = 40
+
+    def __init__(self, leaderboard: Leaderboard, on_close=None):
+        self.leaderboard = leaderboard
+        self.on_close = on_close
+        self.root = tk.Tk()
+        self.root.title("Hour Tower - Leaderboard")
+        self.root.configure(bg=NeonColors.BLACK)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        height = 110 + leaderboard.stations * self.ROW_HEIGHT
+        self.canvas = tk.Canvas(self.root, width=640, height=height, bg=NeonColors.BLACK, highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.fonts = FontBook.for_canvas(self.canvas)
+
+        self.canvas.create_text(320, 35, text="LEADERBOARD", font=self.fonts.get(28), fill=NeonColors.HOT_MAGENTA)
+        self.canvas.create_text(320, 75, text=self.row_text("#", "Player", "Score", "Games", "Best"),
+                                font=self.fonts.get(14), fill=NeonColors.ELECTRIC_BLUE)
+        self.rows = [
+            self.canvas.create_text(320, 110 + i * self.ROW_HEIGHT, text="", font=self.fonts.get(16),
+                                    fill=NeonColors.GOLDEN_YELLOW if i == 0 else NeonColors.WHITE)
+            for i in range(leaderboard.stations)
+        ]
+        self.shown = [""] * leaderboard.stations
+        self.after_id = None
+
+    @staticmethod
+    def row_text(rank, user, score, games, best) -> str:
+        return f"{rank:>3}  {user:<18.18} {score:>6} {games:>6} {best:>9}"
+
+    def refresh(self):
+        """Redraw the rows that changed since the last poll"""
+        standings = self.leaderboard.standings()
+        for i, row in enumerate(self.rows):
+            if i < len(standings):
+                standing = standings[i]
+                text = self.row_text(i + 1, standing.user, standing.score, standing.games,
+                                     format_time(standing.best_time))
+            else:
+                text = ""
+            if text != self.shown[i]:
+                self.shown[i] = text
+                self.canvas.itemconfig(row, text=text)
+        self.after_id = self.root.after(self.POLL_MS, self.refresh)
+
+    def close(self):
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+        if self.on_close is not None:
+            self.on_close()
+        self.root.destroy()
+
+    def run(self):
+        self.refresh()
+        self.root.mainloop()
+
+def print_standings(leaderboard: Leaderboard):
+    print(time.strftime("%H:%M:%S"), flush=True)
+    for rank, standing in enumerate(leaderboard.standings(), 1):
+        print("  " + LeaderboardDisplay.row_text(rank, standing.user, standing.score, standing.games,
+                                                 format_time(standing.best_time)), flush=True)
+
+def run_farm(args):
+    """Start the stations and show the leaderboard until they have all finished"""
+    users = args.users.split(",") if args.users else []
+    users += [f"station{i + 1}" for i in range(len(users), args.stations)]
+    columns = args.columns or math.ceil(math.sqrt(args.stations))
+    tile = None if args.no_tile else (columns, math.ceil(args.stations / columns))
+    data_dir = None if args.no_log else args.data_dir
+
+    leaderboard = Leaderboard.create(args.stations, args.name)
+    print(f"Leaderboard {leaderboard.name}: watch it from another process with "
+          f"python kiosk.py --watch {leaderboard.name}", flush=True)
+    try:
+        # Spawned, not forked, so no station inherits another process's Tk state
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=args.stations, mp_context=context) as pool:
+            stations = [pool.submit(run_station, i, leaderboard.name, users[i], data_dir, tile)
+                        for i in range(args.stations)]
+            try:
+                if args.no_display:
+                    while wait(stations, timeout=args.print_every)[1]:
+                        print_standings(leaderboard)
+                else:
+                    display = LeaderboardDisplay(leaderboard, on_close=leaderboard.request_close)
+
+                    def check_stations():
+                        if all(station.done() for station in stations):
+                            display.close()
+                        else:
+                            display.root.after(1000, check_stations)
+
+                    display.root.after(1000, check_stations)
+                    display.run()
+            except KeyboardInterrupt:
+                leaderboard.request_close()
+            # Leaving the pool waits for every station to have quit
+        for i, station in enumerate(stations):
+            if station.exception() is not None:
+                print(f"Station {i + 1} failed: {station.exception()}", file=sys.stderr)
+        print_standings(leaderboard)
+    finally:
+        leaderboard.close()
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Run several Hour Tower stations with a shared leaderboard")
+    parser.add_argument("--stations", type=int, default=4)
+    parser.add_argument("--users", help="Comma-separated player names, one per station")
+    parser.add_argument("--columns", type=int, help="Stations per row when tiling the screen")
+    parser.add_argument("--no-tile", action="store_true", help="Leave window placement to the window manager")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="Shared-memory name of the leaderboard")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Each station logs progress under here")
+    parser.add_argument("--no-log", action="store_true", help="Do not record or resume progress")
+    parser.add_argument("--no-display", action="store_true", help="Print the standings instead of a window")
+    parser.add_argument("--print-every", type=float, default=10.0, help="Seconds between printed standings")
+    parser.add_argument("--watch", metavar="NAME", help="Only show the leaderboard of a running farm")
+    args = parser.parse_args()
+
+    if args.watch:
+        leaderboard = Leaderboard.open(args.watch)
+        try:
+            LeaderboardDisplay(leaderboard).run()
+        finally:
+            leaderboard.close()
+        return
+    run_farm(args)
+
+if __name__ == "__main__":
+    main()
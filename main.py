@@ -3,53 +3,193 @@ Hour Tower - Clock Learning Game
 Main application file that brings together all components
 """
 
+import time
+STARTED_AT = time.perf_counter()  # Taken before the other imports so --profile-startup can time them
+
+import argparse
+import getpass
+import os
 import tkinter as tk
 from tkinter import messagebox
 
 # Import all components
+from components.animation import Animator
 from components.colors import NeonColors
+from components.event_log import EventLog, recover, restore_latest
+from components.layout import Layout
+from components.metrics import Metrics, MetricsMonitor
+from components.pulse import Pulser
+from components.replay import GameLogicTarget, InputRecorder, Replayer
 from components.sound import SoundEffects
+from components.sprites import SpriteCache
 from components.clock_face import ClockFace
 from components.tower import ClockTower
-from components.ui import NeonButton, GameTitle, ScoreDisplay, MessageDisplay
+from components.ui import NeonButton, GameTitle, ScoreDisplay, MessageDisplay, MetricsOverlay
 from components.game_logic import GameLogic
 
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".hour_tower")
+DEFAULT_LOG = os.path.join(DATA_DIR, "events.log")
+SPRITE_CACHE_DIR = os.path.join(DATA_DIR, "sprites")
+DEFAULT_METRICS = os.path.join(DATA_DIR, "metrics.jsonl")
+
+class StartupProfile:
+    """Wall-clock time spent in each startup phase"""
+    
+    def __init__(self, started_at: float):
+        self.phases = []
+        self.last = started_at
+    
+    def mark(self, phase: str):
+        """End a phase, timing it from the end of the previous one"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+    
+    def skip(self):
+        """Leave the time since the last phase out of the report"""
+        self.last = time.perf_counter()
+    
+    def report(self) -> str:
+        """Format the phases as a table"""
+        lines = [f"  {phase:<24}{seconds * 1000:9.1f} ms" for phase, seconds in self.phases]
+        total = sum(seconds for _, seconds in self.phases)
+        return "\n".join(["Startup profile:"] + lines + [f"  {'total':<24}{total * 1000:9.1f} ms"])
+
+class WindowReplayTarget(GameLogicTarget):
+    """Plays a replay through the window's own input handlers"""
+    
+    def __init__(self, game: "HourTowerGame"):
+        super().__init__(game.game_logic)
+        self.game = game
+    
+    def motion(self, x: float, y: float):
+        self.game.on_drag(self.pointer(x, y))
+    
+    def release(self, x: float, y: float, number: int, drop):
+        self.game.on_release(self.pointer(x, y))
+    
+    def command(self, name: str, args=None):
+        if name == "reset":
+            self.game.reset_game()
+            return
+        super().command(name, args)
+        self.game.score_display.update_score(self.game.game_logic.get_score())
+
 class HourTowerGame:
     """Main game application that orchestrates all components"""
     
-    def __init__(self):
+    DEFERRED_START_MS = 100  # Decoration and sound synthesis wait until after the first frame
+    
+    def __init__(self, user="player_name", log_path=DEFAULT_LOG, profile=None,
+                 sprite_cache_dir=SPRITE_CACHE_DIR, metrics_path=DEFAULT_METRICS,
+                 seed=None, record_path=None, replay=None, replay_speed=1.0):
+        self.user = user
+        self.replay = replay  # A Replayer to play back instead of taking the player's input
+        self.seed = replay.seed if replay is not None else seed
+        self.profile = profile  # Set by --profile-startup, reported once startup has finished
+        self.startup = profile if profile is not None else StartupProfile(time.perf_counter())
+        self.closed = False
+        
         # Initialize main window
         self.root = tk.Tk()
         self.root.title("Hour Tower - Clock Learning Game")
         self.root.configure(bg=NeonColors.BLACK)
         self.root.minsize(800, 600)
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
         
-        # Create main canvas
+        # Create main canvas, everything on it is laid out for 800x600 and scaled to fit
         self.canvas = tk.Canvas(
-            self.root, width=800, height=600,
+            self.root, width=Layout.DESIGN_WIDTH, height=Layout.DESIGN_HEIGHT,
             bg=NeonColors.BLACK, highlightthickness=0
         )
         self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.startup.mark("tk init")
+        
+        # One frame clock drives every animation and the drag updates
+        self.animator = Animator.for_canvas(self.canvas)
+        
+        # Handler and frame timings, sampled into the overlay and the metrics file
+        self.metrics = Metrics.for_canvas(self.canvas)
+        self.animator.metrics = self.metrics
+        
+        # Sprites rendered on an earlier run are loaded from disk instead of rasterized
+        SpriteCache.for_canvas(self.canvas).disk_dir = sprite_cache_dir
         
         # Initialize components
         self.initialize_components()
+        self.startup.mark("components")
+        
+        # Resizing the window scales the scene instead of rebuilding it
+        self.layout = Layout.for_canvas(self.canvas)
+        self.layout.watch(self.clock_face, self.tower, self.title, self.reset_button, self.undo_button,
+                          self.sound_button,
+                          self.game_logic)
+        self.canvas.bind("<Configure>", self.layout.on_configure)
+        
+        # Drag coalescing state
+        self.pending_drag_event = None
         
         # Bind mouse events
         self.canvas.bind("<B1-Motion>", self.on_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_release)
         
-        # Start the game
-        self.game_logic.start_new_game()
+        # Undo and redo correct placements
+        # Caps Lock turns Ctrl+Z into <Control-Z>, so only Shift makes it redo
+        for sequence in ("<Control-z>", "<Control-Z>"):
+            self.root.bind(sequence, self.undo)
+        for sequence in ("<Control-y>", "<Control-Y>", "<Control-Shift-z>", "<Control-Shift-Z>"):
+            self.root.bind(sequence, self.redo)
+        
+        # F2 shows live metrics, and snapshots are saved for later analysis
+        self.game_logic.engine.subscribe(self.metrics.on_engine_event)
+        self.metrics_overlay = MetricsOverlay(self.canvas, 10, 10)
+        self.metrics_monitor = MetricsMonitor(self.canvas, self.metrics, metrics_path, self.metrics_overlay)
+        self.root.bind("<F2>", self.toggle_metrics)
+        
+        # Glow pulses stop while the window is minimised
+        self.pulser = Pulser.for_canvas(self.canvas)
+        self.root.bind("<Unmap>", self.on_unmap)
+        self.root.bind("<Map>", self.on_map)
+        
+        # Record inputs for a replay file, for bug reports and performance traces
+        self.recorder = None
+        if record_path:
+            self.recorder = InputRecorder(record_path, self.game_logic.engine)
+            self.game_logic.recorder = self.recorder
+        
+        # Record progress, resuming the user's unfinished game if there is one
+        self.event_log = None
+        recovered = {}
+        if log_path and replay is None:
+            recovered = recover(log_path)
+            self.event_log = EventLog(log_path)
+            self.event_log.attach(self.game_logic.engine)
+        self.startup.mark("event log recovery")
+        if replay is not None:
+            # The replay starts its own game
+            replay.watch(self.game_logic.engine)
+            replay.schedule(self.root, WindowReplayTarget(self), replay_speed, self.replay_finished)
+        elif restore_latest(self.game_logic.engine, recovered):
+            self.score_display.update_score(self.game_logic.get_score())
+        else:
+            self.game_logic.start_new_game()
+        self.startup.mark("first start_new_game")
+        
+        if self.profile is not None:
+            # Draw now so the first frame can be timed on its own
+            self.root.update()
+            self.startup.mark("first frame")
+        self.root.after(self.DEFERRED_START_MS, self.finish_startup)
     
     def initialize_components(self):
         """Initialize all game components"""
         # Create UI components
-        self.title = GameTitle(self.canvas, 400, 40)
+        self.title = GameTitle(self.canvas, 400, 40, glow=False)
         self.score_display = ScoreDisplay(self.canvas, 325, 520)
         self.message_display = MessageDisplay(self.canvas, 325, 220)
         
-        # Create sound effects
-        self.sound_effects = SoundEffects()
+        # Create sound effects, synthesized once the first frame is up
+        self.sound_effects = SoundEffects(start=False)
         
         # Create game area components - Adjusted vertical positioning
         self.clock_face = ClockFace(self.canvas, 325, 325, 180)
@@ -58,7 +198,7 @@ class HourTowerGame:
         # Create control buttons, centered below the score
         button_width = 120
         button_padding = 20
-        total_button_width = (button_width * 2) + button_padding
+        total_button_width = (button_width * 3) + (button_padding * 2)
         start_x = 325 - (total_button_width // 2)
 
         self.reset_button = NeonButton(
@@ -66,48 +206,140 @@ class HourTowerGame:
             self.reset_game, NeonColors.ORANGE
         )
         
+        self.undo_button = NeonButton(
+            self.canvas, start_x + button_width + button_padding, 550, button_width, 40, "↶ UNDO",
+            self.undo, NeonColors.ELECTRIC_BLUE
+        )
+        
         self.sound_button = NeonButton(
-            self.canvas, start_x + button_width + button_padding, 550, button_width, 40, "🔊 SOUND ON",
+            self.canvas, start_x + (button_width + button_padding) * 2, 550, button_width, 40, "🔊 SOUND ON",
             self.toggle_sound, NeonColors.DEEP_PURPLE
         )
         
         # Create game logic
         self.game_logic = GameLogic(
             self.canvas, self.clock_face, self.tower, 
-            self.sound_effects, self.message_display
+            self.sound_effects, self.message_display, self.user, self.seed
         )
     
+    def finish_startup(self):
+        """Build what the first frame could do without"""
+        self.startup.skip()
+        self.title.add_glow()
+        self.sound_effects.start()
+        self.metrics_monitor.start()
+        self.startup.mark("deferred decoration")
+        
+        if self.profile is not None:
+            print(self.profile.report(), flush=True)
+            self.close()
+    
     def on_drag(self, event):
-        """Handle drag events"""
-        numbers = self.game_logic.get_numbers()
-        for number in numbers:
-            number.drag(event)
+        """Handle drag events, keeping only the latest motion for the next frame"""
+        with self.metrics.timed("on_drag"):
+            if self.game_logic.drag_target is None:
+                return
+            
+            if self.recorder is not None:
+                self.recorder.motion(*self.layout.to_design(event.x, event.y))
+            
+            if self.pending_drag_event is not None:
+                # Superseded before its frame came, shown in the F2 overlay and the metrics file
+                self.metrics.count("dropped_motion_events")
+            self.pending_drag_event = event
+            
+            # Applied on the next frame tick, at most once per frame
+            if not self.animator.is_active("drag"):
+                self.animator.animate("drag", 0, lambda progress: self.flush_drag())
+    
+    def flush_drag(self):
+        """Apply the most recent motion event to the dragged number"""
+        event = self.pending_drag_event
+        self.pending_drag_event = None
+        
+        target = self.game_logic.drag_target
+        if event is not None and target is not None:
+            target.drag(event)
     
     def on_release(self, event):
         """Handle mouse release events"""
-        numbers = self.game_logic.get_numbers()
-        for number in numbers:
-            if number.dragging:
-                number.stop_drag()
-                
-                # Handle number placement
-                success = self.game_logic.handle_number_placement(number, number.x, number.y)
-                
-                # Update score display
-                if success:
-                    self.score_display.update_score(self.game_logic.get_score())
-                break
+        with self.metrics.timed("on_release"):
+            number = self.game_logic.drag_target
+            if number is None:
+                return
+            
+            # Land the number where the pointer last was before checking placement
+            self.animator.cancel("drag")
+            self.flush_drag()
+            
+            number.stop_drag()
+            self.game_logic.drag_target = None
+            if self.recorder is not None:
+                self.recorder.release(*self.layout.to_design(event.x, event.y), number.number, (number.x, number.y))
+            
+            # Handle number placement
+            success = self.game_logic.handle_number_placement(number, number.x, number.y)
+            
+            # Update score display
+            if success:
+                self.score_display.update_score(self.game_logic.get_score())
     
     def reset_game(self):
         """Reset the game"""
         self.game_logic.reset_game()
         self.score_display.reset()
     
+    def undo(self, event=None):
+        """Take back the last correct placement"""
+        if self.game_logic.undo():
+            self.score_display.update_score(self.game_logic.get_score())
+    
+    def redo(self, event=None):
+        """Put back the last undone placement"""
+        if self.game_logic.redo():
+            self.score_display.update_score(self.game_logic.get_score())
+    
+    def replay_finished(self, summary):
+        """Report how a replay went once its last input has been played"""
+        print(f"Replay finished: {summary['inputs']} inputs, {summary['outcomes_checked']} outcomes checked, "
+              f"{summary['divergences']} divergences")
+        for divergence in self.replay.divergences[:5]:
+            print(f"  at {divergence['t']:.2f} s expected {divergence['expected']}, got {divergence['actual']}")
+    
+    def toggle_metrics(self, event=None):
+        """Show or hide the live metrics overlay"""
+        self.metrics.sample_canvas(self.canvas)
+        self.metrics_overlay.toggle(self.metrics.snapshot())
+
+    def on_unmap(self, event):
+        """Pause the glow pulses when the window is minimised"""
+        # Bindings on the root also see the events of every widget in it
+        if event.widget is self.root:
+            self.pulser.pause()
+
+    def on_map(self, event):
+        if event.widget is self.root:
+            self.pulser.resume()
+
     def toggle_sound(self):
         """Toggle sound effects on/off"""
         status = self.sound_effects.toggle()
         self.sound_button.update_text(f"🔊 SOUND {status}")
     
+    def close(self):
+        """Save outstanding progress, stop the sound mixer and close the window"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.event_log is not None:
+            self.event_log.close()
+        if self.recorder is not None:
+            self.recorder.close()
+        self.sound_effects.close()
+        # A --profile-startup run is not a session worth keeping metrics of
+        self.metrics_monitor.stop(dump=self.profile is None)
+        self.root.destroy()
+    
     def run(self):
         """Start the game"""
         try:
@@ -115,11 +347,42 @@ class HourTowerGame:
         except Exception as e:
             print(f"Error running Hour Tower: {e}")
             messagebox.showerror("Error", f"Failed to run Hour Tower: {e}")
+        finally:
+            # Already done if the window was closed, but not if the loop ended with an error
+            self.close()
+
+def default_user():
+    """The logged in user's name, so shared machines keep progress apart"""
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "player_name"
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Hour Tower - Clock Learning Game")
+    parser.add_argument("--user", default=default_user(), help="Player name to record progress under")
+    parser.add_argument("--log", default=DEFAULT_LOG, help="Event log file for progress")
+    parser.add_argument("--no-log", action="store_true", help="Do not record or resume progress")
+    parser.add_argument("--metrics", default=DEFAULT_METRICS, help="File to append metrics snapshots to")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print how long each startup phase took, then exit")
+    parser.add_argument("--seed", type=int, help="Seed for the spawn layouts, to reproduce a session")
+    parser.add_argument("--record", metavar="FILE", help="Record inputs to a replay file")
+    parser.add_argument("--replay", metavar="FILE", help="Play a replay file back in the window")
+    parser.add_argument("--replay-speed", type=float, default=1.0, help="Pace multiplier for --replay")
+    args = parser.parse_args()
+    
+    profile = None
+    if args.profile_startup:
+        profile = StartupProfile(STARTED_AT)
+        profile.mark("imports")
+    
     try:
-        game = HourTowerGame()
+        replay = Replayer(args.replay) if args.replay else None
+        game = HourTowerGame(args.user, None if args.no_log else args.log, profile,
+                             metrics_path=args.metrics, seed=args.seed, record_path=args.record,
+                             replay=replay, replay_speed=args.replay_speed)
         game.run()
     except Exception as e:
         print(f"Error starting Hour Tower: {e}")
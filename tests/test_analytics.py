@@ -0,0 +1,51 @@
+"""
+Aggregates of PlayAnalytics over hand-written event streams
+"""
+
+from components.analytics import PlayAnalytics
+from components.engine import GameEngine
+from components.event_log import BLOCK, COMPLETE, CORRECT, INCORRECT, NEW_GAME, SESSION, EventLog, EventRecord
+
+def test_error_rates_and_durations():
+    records = [
+        EventRecord(SESSION, 1, 0.0, ("ana",)),
+        EventRecord(NEW_GAME, 1, 10.0, ()),
+        EventRecord(INCORRECT, 1, 11.0, (3, 100.0, 100.0)),
+        EventRecord(CORRECT, 1, 12.0, (3, 10)),
+        EventRecord(CORRECT, 1, 15.0, (4, 20)),
+        EventRecord(BLOCK, 1, 15.0, (1,)),
+        EventRecord(COMPLETE, 1, 15.0, (20, 5.0)),
+    ]
+    analytics = PlayAnalytics()
+    analytics.add_records(records)
+    assert analytics.events == len(records)
+    assert analytics.users == {1: "ana"}
+    assert analytics.error_rates() == {3: 0.5, 4: 0.0}
+    assert (analytics.time_to_place.count, analytics.time_to_place.total) == (2, 5.0)
+    assert (analytics.block_times.count, analytics.block_times.total) == (1, 5.0)
+    assert (analytics.game_times.count, analytics.game_times.total) == (1, 5.0)
+
+def test_undo_keeps_counts_and_block_times(tmp_path):
+    path = str(tmp_path / "events.log")
+    now = [1000.0]
+    engine = GameEngine(seed=1, clock=lambda: now[0])
+    log = EventLog(path)
+    log.attach(engine)
+    engine.start_new_game()
+    for i, slot in enumerate(engine.board.slots):
+        now[0] += 2.0
+        engine.handle_number_placement(slot.number, slot.x, slot.y)
+        if i in (3, 7):
+            engine.undo()
+            engine.handle_number_placement(slot.number, slot.x, slot.y)
+        if i == 5:
+            engine.undo()
+            engine.redo()
+    log.close()
+
+    analytics = PlayAnalytics()
+    analytics.add_log(path)
+    assert list(analytics.attempts[1:]) == [1] * 12
+    assert analytics.time_to_place.count == 12
+    assert analytics.block_times.count == len(engine.tower.blocks) == 1
+    assert analytics.game_times.count == 1
@@ -0,0 +1,109 @@
+"""
+Engine state, pack_state and undo history on boards of every size
+"""
+
+import pytest
+
+from benchmarks.slot_index_bench import make_board
+from components.engine import GameEngine
+
+SLOT_COUNTS = (12, 60, 240)
+
+def make_engine(slot_count: int, seed: int) -> GameEngine:
+    """A stock engine on a board of slot_count positions, with a game started"""
+    engine = GameEngine(board=make_board(slot_count), seed=seed)
+    engine.start_new_game()
+    return engine
+
+def play_some(engine: GameEngine, placements: int):
+    """Place every other number until placements have been made"""
+    for slot in engine.board.slots[::2][:placements]:
+        assert engine.handle_number_placement(slot.number, slot.x, slot.y)
+
+def game_state(engine: GameEngine) -> tuple:
+    """Everything a move can change, to compare states"""
+    return (engine.board.occupied, engine.board.placed, engine.pieces.remaining, len(engine.pieces), engine.score,
+            engine.tower.progress, len(engine.tower.blocks),
+            tuple((piece.number, piece.x, piece.y) for piece in engine.pieces))
+
+def slot_numbers(engine: GameEngine, mask: int) -> set:
+    return {slot.number for slot in engine.board.slots if mask & slot.bit}
+
+def assert_consistent(engine: GameEngine):
+    """The board, the unplaced pieces and the score agree"""
+    board = engine.board
+    for slot in board.slots:
+        assert slot.occupied != (engine.get_piece(slot.number) is not None), slot.number
+    assert board.placed == bin(board.occupied).count("1")
+    assert len(engine.pieces) == bin(engine.pieces.remaining).count("1")
+    assert engine.score == 10 * board.placed
+
+@pytest.mark.parametrize("slot_count", SLOT_COUNTS)
+def test_placements_keep_state_consistent(slot_count):
+    engine = make_engine(slot_count, seed=slot_count)
+    for slot in engine.board.slots[::2][:slot_count // 3]:
+        engine.handle_number_placement(slot.number, slot.x, slot.y)
+        assert_consistent(engine)
+    piece = next(iter(engine.pieces))
+    assert not engine.handle_number_placement(piece.number, piece.x, piece.y)
+    assert_consistent(engine)
+
+@pytest.mark.parametrize("slot_count", SLOT_COUNTS)
+def test_pack_state_round_trip(slot_count):
+    engine = make_engine(slot_count, seed=slot_count)
+    play_some(engine, slot_count // 3)
+    restored = GameEngine(board=make_board(slot_count), seed=0)
+    restored.unpack_state(engine.pack_state())
+
+    assert restored.board.occupied == engine.board.occupied
+    assert restored.board.placed == engine.board.placed
+    assert restored.pieces.remaining == engine.pieces.remaining
+    pieces, restored_pieces = list(engine.pieces), list(restored.pieces)
+    assert [piece.number for piece in restored_pieces] == [piece.number for piece in pieces]
+    for piece, other in zip(pieces, restored_pieces):
+        assert other.home == pytest.approx(piece.home, abs=0.01)  # Homes are saved as 32-bit floats
+    assert restored.score == engine.score
+    assert (restored.tower.progress, len(restored.tower.blocks)) == (engine.tower.progress, len(engine.tower.blocks))
+    assert_consistent(restored)
+
+@pytest.mark.parametrize("slot_count", SLOT_COUNTS)
+def test_undo_and_redo_step_through_the_states_played(slot_count):
+    engine = make_engine(slot_count, seed=slot_count + 1)
+    events = []
+    engine.subscribe(lambda event, data: events.append((event, data)))
+    states = [game_state(engine)]
+    for slot in engine.board.slots[::2][:slot_count // 3]:
+        engine.handle_number_placement(slot.number, slot.x, slot.y)
+        states.append(game_state(engine))
+
+    # History keeps the last depth steps, on the big boards well past bit 64 of the masks
+    first = max(len(states) - 1 - engine.history.depth, 0)
+    for i in range(len(states) - 2, first - 1, -1):
+        assert engine.undo()
+        event, data = events[-1]
+        assert event == "undo"
+        assert game_state(engine) == states[i]
+        assert data["placed"] == []
+        assert set(data["returned"]) == slot_numbers(engine, states[i + 1][0] ^ states[i][0])
+        assert_consistent(engine)
+    assert not engine.undo()
+
+    for i in range(first + 1, len(states)):
+        assert engine.redo()
+        event, data = events[-1]
+        assert event == "redo"
+        assert game_state(engine) == states[i]
+        assert data["returned"] == []
+        assert set(data["placed"]) == slot_numbers(engine, states[i][0] ^ states[i - 1][0])
+        assert_consistent(engine)
+    assert not engine.redo()
+
+def test_new_placement_forgets_redo():
+    engine = make_engine(12, seed=5)
+    play_some(engine, 4)
+    engine.undo()
+    engine.undo()
+    slot = engine.board.slots[1]
+    assert engine.handle_number_placement(slot.number, slot.x, slot.y)
+    assert not engine.redo()
+    assert_consistent(engine)
@@ -0,0 +1,154 @@
+"""
+Recovering progress from the event log, after torn writes and from checkpoints
+"""
+
+import os
+import random
+
+import pytest
+
+from components import event_log
+from components.engine import GameEngine
+
+def write_log(path: str, games: int, seed: int) -> dict:
+    """Play games for two users into a log, with misses, undos and redos, and get each engine's final state"""
+    log = event_log.EventLog(path)
+    rng = random.Random(seed)
+    final = {}
+    for user in ("ana", "ben"):
+        engine = GameEngine(seed=rng.randrange(1 << 32), user=user)
+        recorder = log.attach(engine)
+        engine.start_new_game()
+        for game in range(games):
+            if game:
+                engine.reset_game()
+            for number in rng.sample(range(1, 13), rng.randrange(3, 13)):
+                slot = engine.board.get_slot(number)
+                engine.handle_number_placement(number, slot.x + rng.choice((0, 0, 80)), slot.y)
+                if rng.random() < 0.2:
+                    engine.undo()
+                if rng.random() < 0.1:
+                    engine.redo()
+        recorder.detach()
+        placed = sorted(slot.number for slot in engine.board.slots if slot.occupied)
+        final[user] = (engine.score, placed, engine.tower.progress, len(engine.tower.blocks), engine.game_complete)
+    log.close()
+    log.thread.join()  # Let the closing checkpoint finish before the test replaces files
+    return final
+
+def recovered(path: str, save: bool = False) -> dict:
+    return {user: state.as_dict() for user, state in event_log.recover(path, save=save).items()}
+
+def write_file(path: str, data: bytes):
+    """Replace the log, and drop its checkpoint"""
+    with open(path, "wb") as f:
+        f.write(data)
+    if os.path.exists(path + event_log.CHECKPOINT_SUFFIX):
+        os.remove(path + event_log.CHECKPOINT_SUFFIX)
+
+@pytest.fixture(scope="module")
+def played(tmp_path_factory):
+    """A log of a few games, its bytes, the offsets records end at and each engine's final state"""
+    path = str(tmp_path_factory.mktemp("log") / "events.log")
+    final = write_log(path, games=3, seed=7)
+    with open(path, "rb") as f:
+        data = f.read()
+    ends = [0] + [end for _, end in event_log.scan_records(path)]
+    return data, ends, final
+
+def cuts(ends: list):
+    """A byte torn in every record: just after its start, in the middle and just before its end"""
+    for i in range(len(ends) - 1):
+        start, end = ends[i], ends[i + 1]
+        for cut in sorted({start + 1, (start + end) // 2, end - 1}):
+            yield i, cut
+
+def test_recovery_matches_the_engines(played, tmp_path):
+    data, _, final = played
+    path = str(tmp_path / "events.log")
+    write_file(path, data)
+    states = event_log.recover(path, save=False)
+    assert set(states) == set(final)
+    for user, state in states.items():
+        assert (state.score, sorted(state.placed), state.tower_progress, state.tower_blocks,
+                state.completed) == final[user]
+
+def test_torn_tail_loses_only_the_torn_record(played, tmp_path):
+    data, ends, _ = played
+    path = str(tmp_path / "events.log")
+    expected = {}
+    for i in range(len(ends) - 1):
+        write_file(path, data[:ends[i]])
+        expected[i] = recovered(path)
+    for i, cut in cuts(ends):
+        write_file(path, data[:cut])
+        assert recovered(path) == expected[i], cut
+
+def test_records_after_a_torn_write_are_read(played, tmp_path):
+    data, ends, _ = played
+    path = str(tmp_path / "events.log")
+    write_file(path, data)
+    full = recovered(path)
+    for i, cut in cuts(ends):
+        write_file(path, data[:cut] + data[ends[i]:])
+        assert recovered(path) == full, cut
+
+def test_checkpoint_taken_at_a_torn_write(played, tmp_path):
+    data, ends, _ = played
+    path = str(tmp_path / "events.log")
+    write_file(path, data)
+    full = recovered(path)
+    for i in range(0, len(ends) - 1, 5):
+        start, end = ends[i], ends[i + 1]
+        write_file(path, data[:end - 1])
+        recovered(path, save=True)
+        with open(path, "ab") as f:
+            f.write(data[start:])
+        # Starts from the checkpoint, then again from the one at the end of the log
+        assert recovered(path, save=True) == full, end
+        assert recovered(path, save=True) == full, end
+
+def test_checkpoint_of_a_replaced_log_is_ignored(played, tmp_path):
+    data, _, _ = played
+    path = str(tmp_path / "events.log")
+    write_file(path, data)
+    recovered(path, save=True)
+    os.remove(path)
+    write_log(path, games=1, seed=8)
+    with open(path, "rb") as f:
+        replaced = f.read()
+    checkpointed = recovered(path, save=True)
+    write_file(path, replaced)
+    assert checkpointed == recovered(path)
+
+def append_records(path: str, *records):
+    with open(path, "ab") as f:
+        for record in records:
+            f.write(event_log.encode_record(*record))
+
+def test_idle_session_left_out_of_the_checkpoint_writes_again(tmp_path):
+    path = str(tmp_path / "events.log")
+    day = 24 * 3600.0
+    # ana plays at a station that then sits idle, and later at a second one
+    append_records(path, (event_log.SESSION, 1, 0.0, "ana"), (event_log.NEW_GAME, 1, 1.0),
+                   (event_log.CORRECT, 1, 2.0, 12, 10),
+                   (event_log.SESSION, 2, 3 * day, "ana"), (event_log.NEW_GAME, 2, 3 * day),
+                   (event_log.SESSION, 3, 3 * day, "ben"), (event_log.NEW_GAME, 3, 3 * day))
+    event_log.recover(path)
+    # The idle station's game goes on, after the checkpoint
+    append_records(path, (event_log.CORRECT, 1, 4 * day, 1, 20))
+    state = event_log.recover(path)["ana"]
+    assert (state.session, state.placed, state.score) == (1, [12, 1], 20)
+    assert recovered(path, save=True) == recovered(path)
+
+def test_close_leaves_the_checkpoint_to_the_writer_thread(tmp_path):
+    path = str(tmp_path / "events.log")
+    log = event_log.EventLog(path)
+    engine = GameEngine(seed=1, user="ana")
+    log.attach(engine)
+    engine.start_new_game()
+    log.close()
+    log.thread.join()
+    offset, sessions = event_log.load_checkpoint(path)
+    assert offset == os.path.getsize(path)
+    assert [state.user for state in sessions.values()] == ["ana"]
@@ -0,0 +1,50 @@
+"""
+Spawn layouts of the engine as the game builds it, on boards of every size
+"""
+
+import math
+
+import pytest
+
+from benchmarks.slot_index_bench import make_board
+from components.engine import Board, GameEngine
+from components.spawn_layout import SpawnLayout
+
+def spawned_homes(engine: GameEngine) -> list:
+    engine.start_new_game()
+    return [piece.home for piece in engine.pieces]
+
+def closest_pair(points: list) -> float:
+    return min(math.dist(a, b) for i, a in enumerate(points) for b in points[i + 1:])
+
+def test_classic_board_keeps_its_spawn_ring():
+    engine = GameEngine(seed=1)
+    layout = engine.spawn_layout
+    assert (layout.inner_radius, layout.outer_radius) == GameEngine.SPAWN_DISTANCE
+    assert engine.spawn_bounds == (30, 80, 570, 480)
+    homes = spawned_homes(engine)
+    assert len(homes) == 12
+    assert closest_pair(homes) >= GameEngine.SPAWN_SEPARATION
+
+@pytest.mark.parametrize("board", [
+    Board(325, 325, 180, rings=[list(range(1, 25))]),
+    Board(325, 325, 180, rings=[list(range(1, 61))]),
+    make_board(60),
+    make_board(240),
+], ids=["24 classic", "60 classic", "60 wide", "240 wide"])
+@pytest.mark.parametrize("seed", range(3))
+def test_stock_engine_spawns_every_piece_in_bounds(board, seed):
+    engine = GameEngine(board=board, seed=seed)
+    homes = spawned_homes(engine)
+    assert len(homes) == len(board.slots)
+    left, top, right, bottom = engine.spawn_bounds
+    assert all(left < x < right and top < y < bottom for x, y in homes)
+    assert closest_pair(homes) >= engine.spawn_layout.last_separation >= GameEngine.MIN_SPAWN_SEPARATION
+
+def test_layout_never_goes_below_min_separation():
+    layout = SpawnLayout(325, 325, 220, 260, (30, 80, 570, 480), seed=1)
+    with pytest.raises(ValueError):
+        layout.generate(40)
+    layout = SpawnLayout(325, 325, 220, 260, (30, 80, 570, 480), seed=1, min_separation=30)
+    points = layout.generate(40)
+    assert closest_pair(points) >= layout.last_separation >= 30
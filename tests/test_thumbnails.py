@@ -0,0 +1,77 @@
+"""
+Golden-image tests of the offscreen renderer
+
+Boards in fixed states are rendered with thumbnails.BoardScene and their
+pixels compared to the PNGs in tests/golden. After a deliberate change to
+the look of the game, rewrite the references with:
+    UPDATE_GOLDEN=1 python -m pytest tests/test_thumbnails.py
+and check the new images by eye before committing them.
+"""
+
+import os
+import struct
+import zlib
+
+import pytest
+
+from thumbnails import BoardScene
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+WIDTH, HEIGHT = 400, 300
+
+STATES = {
+    "half_placed": dict(score=60, placed=[12, 1, 2, 3, 4, 5], tower_progress=6),
+    "finished": dict(score=120, placed=list(range(1, 13)), tower_blocks=1),
+}
+
+def decode_png(data: bytes):
+    """Size and RGBA pixels of a PNG written by Raster.to_png: 8-bit RGBA with no row filters"""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    header = b""
+    compressed = b""
+    while position < len(data):
+        length, kind = struct.unpack_from(">I4s", data, position)
+        body = data[position + 8:position + 8 + length]
+        if kind == b"IHDR":
+            header = body
+        elif kind == b"IDAT":
+            compressed += body
+        position += 12 + length
+    width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", header)
+    assert (depth, color_type, interlace) == (8, 6, 0)
+    raw = zlib.decompress(compressed)
+    stride = width * 4 + 1
+    assert all(raw[y * stride] == 0 for y in range(height))
+    return width, height, b"".join(raw[y * stride + 1:(y + 1) * stride] for y in range(height))
+
+@pytest.fixture(scope="module")
+def scene():
+    return BoardScene(WIDTH, HEIGHT, seed=0)
+
+def render(scene: BoardScene, name: str):
+    scene.show(**STATES[name])
+    return scene.renderer.render()
+
+@pytest.mark.parametrize("name", sorted(STATES))
+def test_board_matches_golden_image(scene, name, tmp_path):
+    raster = render(scene, name)
+    path = os.path.join(GOLDEN_DIR, f"{name}.png")
+    if os.environ.get("UPDATE_GOLDEN"):
+        with open(path, "wb") as f:
+            f.write(raster.to_png())
+    with open(path, "rb") as f:
+        width, height, pixels = decode_png(f.read())
+    assert (width, height) == (raster.width, raster.height)
+    if pixels != bytes(raster.pixels):
+        actual = tmp_path / f"{name}.png"
+        actual.write_bytes(raster.to_png())
+        differing = sum(pixels[i:i + 4] != raster.pixels[i:i + 4] for i in range(0, len(pixels), 4))
+        pytest.fail(f"{differing} pixels differ from {path}, the render is in {actual}")
+
+def test_cached_stamps_render_the_same_board(scene):
+    first = bytes(render(scene, "half_placed").pixels)
+    render(scene, "finished")
+    hits = scene.renderer.hits
+    assert bytes(render(scene, "half_placed").pixels) == first
+    assert scene.renderer.hits > hits
@@ -0,0 +1,134 @@
+"""
+Hour Tower - Board thumbnails
+Renders game states to PNG images without a display
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from components.animation import Animator
+from components.colors import NeonColors
+from components.event_log import COMPLETE, SESSION, ProgressState, read_records, recover
+from components.layout import Layout
+from components.offscreen import OffscreenCanvas, SceneRenderer
+from components.sound import SoundEffects
+from components.clock_face import ClockFace
+from components.tower import ClockTower
+from components.ui import NeonButton, GameTitle, ScoreDisplay, MessageDisplay
+from components.game_logic import GameLogic
+
+class BoardScene:
+    """The game's scene on an offscreen canvas, drawn by the game's own components
+
+    Laid out as main.py lays out the window, then scaled to the image size.
+    show puts a game state on it the way resuming a game does, and png
+    renders it. One scene is meant to be reused for many images: items,
+    sprites and rendered stamps carry over from one to the next. Pieces
+    are spawned from seed on every show and glows are drawn as they are at
+    the start of a pulse, so the same state always makes the same image.
+    """
+
+    def __init__(self, width: int = Layout.DESIGN_WIDTH, height: int = Layout.DESIGN_HEIGHT, seed: int = 0):
+        canvas = self.canvas = OffscreenCanvas(width, height)
+        Animator.for_canvas(canvas).clock = lambda: 0.0
+        self.seed = seed
+        self.title = GameTitle(canvas, 400, 40)
+        self.score_display = ScoreDisplay(canvas, 325, 520)
+        message_display = MessageDisplay(canvas, 325, 220)
+        sound_effects = SoundEffects(start=False)
+        sound_effects.enabled = False
+        self.clock_face = ClockFace(canvas, 325, 325, 180)
+        self.tower = ClockTower(canvas, 620, 80, 160, 450)
+
+        # The control buttons, drawn but never pressed
+        button_width = 120
+        button_padding = 20
+        start_x = 325 - (button_width * 3 + button_padding * 2) // 2
+        labels = [("RESET GAME", NeonColors.ORANGE), ("↶ UNDO", NeonColors.ELECTRIC_BLUE),
+                  ("🔊 SOUND ON", NeonColors.DEEP_PURPLE)]
+        self.buttons = [
+            NeonButton(canvas, start_x + i * (button_width + button_padding), 550, button_width, 40, text, None, color)
+            for i, (text, color) in enumerate(labels)
+        ]
+        self.game_logic = GameLogic(canvas, self.clock_face, self.tower, sound_effects, message_display, seed=seed)
+
+        layout = Layout.for_canvas(canvas)
+        layout.watch(self.clock_face, self.tower, self.title, *self.buttons, self.game_logic)
+        layout.resize(width, height)
+        self.renderer = SceneRenderer(canvas)
+
+    def show(self, score: int, placed, tower_progress: int = 0, tower_blocks: int = 0):
+        """Put a game state on the board, with every animation finished"""
+        self.game_logic.engine.spawn_layout.seed(self.seed)
+        self.game_logic.engine.restore(score, placed, tower_progress, tower_blocks)
+        self.score_display.update_score(score)
+        Animator.for_canvas(self.canvas).finish_all()
+
+    def show_progress(self, state: ProgressState):
+        """Put a state recovered from an event log on the board"""
+        self.show(state.score, state.placed, state.tower_progress, state.tower_blocks)
+
+    def png(self) -> bytes:
+        """Render the board as it is now"""
+        return self.renderer.to_png()
+
+def finished_games(path: str):
+    """Every completed game in an event log, as (state, game number) in the order they were finished"""
+    sessions = {}
+    games = {}
+    for record in read_records(path):
+        if record.code == SESSION:
+            sessions[record.session] = ProgressState(record.values[0], record.session)
+            continue
+        state = sessions.get(record.session)
+        if state is None:
+            continue
+        state.apply(record)
+        if record.code == COMPLETE:
+            games[record.session] = games.get(record.session, 0) + 1
+            yield state, games[record.session]
+
+def file_name(state: ProgressState, game: int = 0) -> str:
+    user = re.sub(r"[^A-Za-z0-9_.-]+", "_", state.user) or "player"
+    return f"{user}_s{state.session}_g{game}.png" if game else f"{user}_latest.png"
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Render Hour Tower boards from an event log to PNG files")
+    parser.add_argument("log", help="Event log to read")
+    parser.add_argument("--out", default="thumbnails", help="Directory to write the images to")
+    parser.add_argument("--size", default="400x300", help="Image size, WIDTHxHEIGHT")
+    parser.add_argument("--latest", action="store_true",
+                        help="Render each user's latest state instead of every finished game")
+    parser.add_argument("--limit", type=int, help="Stop after this many images")
+    args = parser.parse_args()
+
+    try:
+        width, height = (int(value) for value in args.size.lower().split("x"))
+    except ValueError:
+        sys.exit(f"Bad --size {args.size!r}, expected WIDTHxHEIGHT")
+    if args.latest:
+        boards = ((state, 0) for state in recover(args.log, save=False).values())
+    else:
+        boards = finished_games(args.log)
+
+    os.makedirs(args.out, exist_ok=True)
+    scene = BoardScene(width, height)
+    started_at = time.perf_counter()
+    count = 0
+    for state, game in boards:
+        if args.limit is not None and count >= args.limit:
+            break
+        scene.show_progress(state)
+        with open(os.path.join(args.out, file_name(state, game)), "wb") as f:
+            f.write(scene.png())
+        count += 1
+    elapsed = time.perf_counter() - started_at
+    print(f"{count} images in {args.out} in {elapsed:.1f} s"
+          + (f", {elapsed / count * 1000:.1f} ms each" if count else ""))
+
+if __name__ == "__main__":
+    main()